@@ -1,16 +1,17 @@
 import sys
 import os
+import signal
 import time
-from multiprocessing import Process, Manager
-from src.logger import AppLogger
+from multiprocessing import Process, Queue
+from src.logger import AppLogger, start_log_writer, stop_log_writer
 from src.config_manager import ConfigManager
 from src.core_logic import CoreLogic
 from web import create_app
 
-def run_flask_app(shared_data):
+def run_flask_app(shared_data, log_queue):
     """Startet die Flask-Webanwendung in einem eigenen Prozess."""
-    # KORREKTUR: Erstelle eine eigene Instanz für diesen Prozess.
-    logger = shared_data["logger"]
+    # Einträge gehen über die Queue an den gemeinsamen Schreiber im Hauptprozess.
+    logger = AppLogger(queue=log_queue, settings=shared_data["log_settings"]).get_logger()
     config_manager = ConfigManager(logger)
     
     flask_app = create_app(
@@ -27,10 +28,9 @@ def run_flask_app(shared_data):
     except Exception as e:
         logger.error(f"Flask-Server unerwartet beendet: {e}", exc_info=True)
 
-def run_core_logic(shared_data):
+def run_core_logic(shared_data, log_queue):
     """Startet die Kernlogik in einem eigenen Prozess."""
-    logger = shared_data["logger"]
-    # KORREKTUR: Erstelle eine eigene Instanz für diesen Prozess.
+    logger = AppLogger(queue=log_queue, settings=shared_data["log_settings"]).get_logger()
     config_manager = ConfigManager(logger)
     
     logger.info("Starte Kernlogik...")
@@ -38,36 +38,42 @@ def run_core_logic(shared_data):
         log=logger,
         config_manager=config_manager
     )
+    # terminate() sendet SIGTERM; als SystemExit laufen die Aufräumarbeiten der Hauptschleife.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     core_logic.run_main_loop()
 
 if __name__ == '__main__':
-    # Logger wird einmalig erstellt und kann geteilt werden
-    logger = AppLogger(log_file="data/app.log").get_logger()
+    # Alle Prozesse loggen in diese Queue; nur der Hauptprozess schreibt die Datei.
+    log_queue = Queue(-1)
+    logger = AppLogger(queue=log_queue).get_logger()
     logger.info("Initialisiere Anwendung...")
 
-    # Der Manager wird nur noch für einfache Daten verwendet
-    manager = Manager()
-    shared_data = manager.dict()
-
     # Wir lesen die Konfig einmalig im Hauptprozess, um sie an die Subprozesse zu übergeben.
     # Die Subprozesse erstellen dann ihre eigenen Manager-Instanzen für das Neuladen.
     temp_config_manager = ConfigManager(logger)
-    config = temp_config_manager.get_full_config()
-    
-    # KORREKTUR: Teile nur "picklable" Objekte.
-    shared_data["logger"] = logger
-    shared_data["app_config"] = {
-        "bridge_ip": config.get("bridge_ip"),
-        "app_key": config.get("app_key")
+    config = temp_config_manager.get_full_config() or {}
+    global_settings = config.get("global_settings") or {}
+    log_settings = {key: value for key, value in global_settings.items() if key.startswith("log_")}
+
+    # Bis hierhin angefallene Einträge warten in der Queue und werden jetzt geschrieben.
+    log_writer = start_log_writer(log_queue, "data/app.log", log_settings)
+    logger = AppLogger(queue=log_queue, settings=log_settings).get_logger()
+
+    shared_data = {
+        "log_settings": log_settings,
+        "app_config": {
+            "bridge_ip": config.get("bridge_ip"),
+            "app_key": config.get("app_key")
+        },
     }
 
     logger.info("Initialisiere Webserver-Prozess...")
-    p_flask = Process(target=run_flask_app, args=(shared_data,))
+    p_flask = Process(target=run_flask_app, args=(shared_data, log_queue))
     p_flask.start()
     logger.info(f"Webserver-Prozess gestartet mit PID: {p_flask.pid}")
     
     logger.info("Initialisiere Kernlogik-Prozess...")
-    p_core = Process(target=run_core_logic, args=(shared_data,))
+    p_core = Process(target=run_core_logic, args=(shared_data, log_queue))
     p_core.start()
     logger.info(f"Kernlogik-Prozess gestartet mit PID: {p_core.pid}")
 
@@ -80,4 +86,6 @@ if __name__ == '__main__':
         p_core.terminate()
         p_flask.join()
         p_core.join()
-        logger.info("Prozesse erfolgreich beendet.")
\ No newline at end of file
+        logger.info("Prozesse erfolgreich beendet.")
+    finally:
+        stop_log_writer(log_writer)
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""
+Misst das Laden einer großen automation.yaml (standardmäßig 500 Automationen):
+reines Python-YAML, libyaml (CSafeLoader) und ConfigManager.get_full_config()
+mit kaltem und warmem Cache.
+
+Aufruf: python -m benchmarks.bench_config_load [--automations 500] [--repeat 20]
+"""
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+import yaml
+
+from src.config_manager import ConfigManager, YamlDumper, YamlLoader
+
+
+def _automation(index: int) -> dict:
+    period = {
+        "scene_name": "aus", "x_scene_name": "hell", "motion_check": True,
+        "wait_time": {"min": 1, "sec": 30}, "do_not_disturb": False, "bri_check": False,
+    }
+    return {
+        "id": f"aut-{index:04d}", "name": f"Routine {index}", "type": "routine", "enabled": True,
+        "room_name": f"Raum {index % 40}", "sensor_id": f"sensor-{index % 40}",
+        "daily_time": {"H1": 7, "M1": 0, "H2": 23, "M2": 0},
+        "morning": dict(period), "day": dict(period), "evening": dict(period), "night": dict(period),
+        "triggers": [{"type": "time", "name": "Abend", "time": "20:30", "scene_name": "gemuetlich"}],
+    }
+
+
+def _measure(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--automations", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = ConfigManager(logging.getLogger("bench"))
+        manager.settings_file = os.path.join(data_dir, "settings.yaml")
+        manager.automation_file = os.path.join(data_dir, "automation.yaml")
+        manager.home_file = os.path.join(data_dir, "home.yaml")
+
+        scenes = {f"szene_{i}": {"status": True, "bri": 200, "ct": 300} for i in range(50)}
+        with open(manager.automation_file, "w", encoding="utf-8") as f:
+            yaml.dump({"automations": [_automation(i) for i in range(args.automations)], "scenes": scenes},
+                      f, Dumper=YamlDumper, allow_unicode=True, default_flow_style=False)
+        with open(manager.settings_file, "w", encoding="utf-8") as f:
+            yaml.dump({"bridge_ip": "127.0.0.1", "global_settings": {"status_interval_s": 5}}, f, Dumper=YamlDumper)
+        with open(manager.home_file, "w", encoding="utf-8") as f:
+            yaml.dump({"rooms": []}, f, Dumper=YamlDumper)
+        size_kb = os.path.getsize(manager.automation_file) / 1024
+
+        def parse(loader):
+            with open(manager.automation_file, "r", encoding="utf-8") as f:
+                yaml.load(f, Loader=loader)
+
+        def cold():
+            manager._parsed_cache.clear()
+            manager.get_full_config()
+
+        pure = _measure(lambda: parse(yaml.SafeLoader), max(3, args.repeat // 4))
+        libyaml = _measure(lambda: parse(YamlLoader), args.repeat)
+        cold_ms = _measure(cold, args.repeat)
+        manager.get_full_config()
+        warm_ms = _measure(manager.get_full_config, args.repeat)
+
+        print(f"automation.yaml: {args.automations} Automationen, {size_kb:.0f} KiB")
+        print(f"yaml.safe_load (Python):        {pure:8.2f} ms")
+        print(f"yaml.load (CSafeLoader):        {libyaml:8.2f} ms  ({YamlLoader.__name__})")
+        print(f"get_full_config, kalter Cache:  {cold_ms:8.2f} ms")
+        print(f"get_full_config, warmer Cache:  {warm_ms:8.2f} ms  (Faktor {pure / warm_ms:.0f} ggü. safe_load)")
+
+
+if __name__ == "__main__":
+    main()
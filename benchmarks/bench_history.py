@@ -0,0 +1,65 @@
+"""
+Vergleicht die Abfrage eines mehrwöchigen Verlaufs über die Rohdaten (Fenster,
+die keiner Verdichtungsstufe entsprechen) mit der Abfrage über die
+Verdichtungstabellen.
+
+Aufruf: python -m benchmarks.bench_history [--days 28] [--sensors 10] [--interval-s 60]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from src.history import choose_resolution, query_history
+from src.telemetry import TelemetryRecorder, connect, init_schema
+
+
+def _fill(db: str, days: int, sensors: int, interval_s: int):
+    recorder = TelemetryRecorder(db, batch_size=20_000, flush_interval_s=0.5, max_buffer=1_000_000)
+    recorder.start()
+    start = datetime.now() - timedelta(days=days)
+    for step in range(days * 86400 // interval_s):
+        timestamp = (start + timedelta(seconds=step * interval_s)).isoformat(timespec="milliseconds")
+        recorder.record_many(
+            (timestamp, f"sensor-{s}", kind, float((step + s) % 500))
+            for s in range(sensors) for kind in ("brightness", "temperature")
+        )
+    recorder.stop(timeout_s=600)
+    return recorder.get_stats()["written"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=28)
+    parser.add_argument("--sensors", type=int, default=10)
+    parser.add_argument("--interval-s", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "history.db")
+        con = connect(db)
+        init_schema(con)
+        rows = _fill(db, args.days, args.sensors, args.interval_s)
+
+        end = datetime.now()
+        start = end - timedelta(days=args.days)
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            raw = query_history(con, ["sensor-0", "sensor-1"], start, end, bucket_s=7200 - 60, fill=True)
+        raw_ms = (time.perf_counter() - t0) / args.repeat * 1000
+
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            result = query_history(con, ["sensor-0", "sensor-1"], start, end, fill=True)
+        rollup_ms = (time.perf_counter() - t0) / args.repeat * 1000
+        con.close()
+
+    print(f"{rows} Rohzeilen, {args.days} Tage, Auflösung '{choose_resolution(start, end)}'")
+    print(f"2 Sensoren, Rohdaten ({raw['bucket_s']} s):  {raw_ms:8.2f} ms ({len(raw['labels'])} Punkte)")
+    print(f"2 Sensoren, {result['source']}: {rollup_ms:8.2f} ms ({len(result['labels'])} Punkte)")
+
+
+if __name__ == "__main__":
+    main()
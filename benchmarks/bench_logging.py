@@ -0,0 +1,70 @@
+"""
+Misst die Kosten eines logger.info()-Aufrufs im aufrufenden Thread: direkt
+schreibende Datei- und stdout-Handler (bisher; stdout als Pipe wie unter
+systemd, ausgelesen von einem Thread) gegen QueueHandler mit gemeinsamem Schreiber.
+
+Aufruf: python -m benchmarks.bench_logging [--calls 20000]
+"""
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+from multiprocessing import Queue
+
+from src.logger import TEXT_FORMAT, AppLogger, start_log_writer, stop_log_writer
+
+
+def _measure(logger: logging.Logger, calls: int):
+    samples = []
+    for i in range(calls):
+        start = time.perf_counter()
+        logger.info(f"Szene 'Abend' für Raum {i % 10} gesetzt")
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99)]
+
+
+def _drain(fd: int):
+    while os.read(fd, 65536):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        direct = logging.getLogger("bench-direct")
+        direct.propagate = False
+        handler = logging.FileHandler(os.path.join(tmp, "direct.log"), encoding="utf-8")
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        direct.addHandler(handler)
+        read_fd, write_fd = os.pipe()
+        threading.Thread(target=_drain, args=(read_fd,), daemon=True).start()
+        pipe = os.fdopen(write_fd, "w", encoding="utf-8")
+        console = logging.StreamHandler(pipe)
+        console.setFormatter(logging.Formatter(TEXT_FORMAT))
+        direct.addHandler(console)
+        direct.setLevel(logging.INFO)
+        direct_median, direct_p99 = _measure(direct, args.calls)
+        handler.close()
+        pipe.close()
+
+        queue = Queue(-1)
+        writer = start_log_writer(queue, os.path.join(tmp, "app.log"))
+        # Konsolenausgabe des Schreibers für die Messung abschalten.
+        writer.handlers = writer.handlers[:1]
+        queued = AppLogger(queue=queue).get_logger()
+        queued_median, queued_p99 = _measure(queued, args.calls)
+        stop_log_writer(writer)
+
+    print(f"Datei + stdout:     Median {direct_median:6.1f} µs, p99 {direct_p99:6.1f} µs")
+    print(f"QueueHandler:       Median {queued_median:6.1f} µs, p99 {queued_p99:6.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
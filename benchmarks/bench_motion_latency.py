@@ -0,0 +1,120 @@
+"""
+Misst gegen den Bridge-Simulator, wie lange es von einer Bewegung bis zum
+Schaltbefehl an die Bridge dauert und wie oft die Schleife dafür aufwacht.
+--mode interval führt alle Routinen im festen Takt aus, --mode deadline
+nutzt wie die Kernlogik den fristbasierten AutomationScheduler.
+
+Aufruf: python -m benchmarks.bench_motion_latency [--rooms 10] [--seconds 20] [--mode deadline]
+"""
+import argparse
+import logging
+import statistics
+import time
+from datetime import datetime
+
+from src.automation_scheduler import AutomationScheduler
+from src.bridge_simulator import BridgeSimulator
+from src.hue_wrapper import HueBridge
+from src.room import Room
+from src.routine import Routine
+from src.scene import Scene
+from src.sensor import Sensor
+
+
+def _routine_config(room_name: str, sensor_id: str) -> dict:
+    period = {"scene_name": "aus", "x_scene_name": "hell", "motion_check": True, "wait_time": {"min": 0, "sec": 2}}
+    return {
+        "name": f"Bewegung {room_name}", "room_name": room_name, "sensor_id": sensor_id,
+        "daily_time": {"H1": 0, "M1": 0, "H2": 23, "M2": 59},
+        "morning": period, "day": period, "evening": period, "night": period,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--loop-interval", type=float, default=1.0)
+    parser.add_argument("--mode", choices=("interval", "deadline"), default="deadline")
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--motion-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    log = logging.getLogger("bench")
+    logging.basicConfig(level=logging.WARNING)
+    with BridgeSimulator(
+        rooms=args.rooms, sensors=args.rooms, latency_ms=args.latency_ms, rate_limit=True,
+        motion_rate=args.motion_rate, motion_hold_s=1.0,
+    ) as sim:
+        bridge = HueBridge(sim.address, sim.app_key, logger=log)
+        bridge.start_event_stream()
+        bridge.start_command_scheduler()
+        bridge.refresh_topology()
+        topology = bridge.topology
+
+        scenes = {"hell": Scene(True, 254, ct=250), "aus": Scene(False, 0)}
+        routines, grouped_light_of_motion = [], {}
+        for name, group_id in topology.group_names().items():
+            group = topology.group(group_id)
+            if group["type"] != "room":
+                continue
+            sensor_ids = [c["rid"] for c in group["children"] if topology.service_id(c["rid"], "motion")]
+            if not sensor_ids:
+                continue
+            grouped_light_of_motion[topology.service_id(sensor_ids[0], "motion")] = topology.grouped_light_for_group(group_id)
+            routines.append(Routine(
+                name=name, room=Room(bridge, log, name, group_id), sensor=Sensor(bridge, sensor_ids[0], log),
+                config=_routine_config(name, sensor_ids[0]), scenes=scenes, sun_times=None, log=log, global_settings={},
+            ))
+
+        ticks, tick_times = 0, []
+        end = time.monotonic() + args.seconds
+        if args.mode == "interval":
+            while time.monotonic() < end:
+                start = time.perf_counter()
+                now = datetime.now().astimezone()
+                for routine in routines:
+                    routine.run(now)
+                tick_times.append(time.perf_counter() - start)
+                ticks += 1
+                time.sleep(args.loop_interval)
+        else:
+            scheduler = AutomationScheduler(max_sleep_s=1.0)
+            watchers = {}
+            for index, routine in enumerate(routines):
+                scheduler.schedule(index, datetime.now().astimezone())
+                for resource_id in routine.watched_resources():
+                    watchers.setdefault(resource_id, []).append(index)
+            bridge.add_change_listener(
+                lambda rtype, resource, deleted: [scheduler.wake(i) for i in watchers.get(resource.get("id"), ())]
+            )
+            while time.monotonic() < end:
+                due = scheduler.wait_for_due()
+                if not due:
+                    continue
+                start = time.perf_counter()
+                now = datetime.now().astimezone()
+                for index in sorted(due):
+                    routines[index].run(now)
+                    scheduler.schedule(index, routines[index].next_deadline(now))
+                tick_times.append(time.perf_counter() - start)
+                ticks += 1
+        bridge.close()
+
+        latencies = []
+        for motion in (m for m in sim.motion_log if m["motion"]):
+            target = grouped_light_of_motion.get(motion["motion_id"])
+            sent = next((c["t"] for c in sim.command_log if c["id"] == target and c["t"] >= motion["t"]), None)
+            if sent is not None:
+                latencies.append((sent - motion["t"]) * 1000)
+
+        print(f"Modus: {args.mode}, Routinen: {len(routines)}, Durchläufe: {ticks}, Tick-Dauer Median: {statistics.median(tick_times) * 1000:.2f} ms")
+        if latencies:
+            latencies.sort()
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            print(f"Bewegung -> Befehl: n={len(latencies)}, Median {statistics.median(latencies):.0f} ms, p95 {p95:.0f} ms")
+        print(f"Simulator: {sim.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
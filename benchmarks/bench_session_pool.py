@@ -0,0 +1,100 @@
+"""
+Mikro-Benchmark: Anfragen pro Sekunde gegen einen lokalen HTTPS-Platzhalter
+der Bridge, einmal mit einer neuen Verbindung pro Anfrage (wie python_hue_v2)
+und einmal über die Keep-Alive-Session von HueBridge.
+
+Aufruf: python -m benchmarks.bench_session_pool [--requests 300]
+"""
+import argparse
+import json
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from src.hue_wrapper import HueBridge
+
+
+class _BridgeStandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _reply(self):
+        body = json.dumps({"errors": [], "data": [{"id": "bench", "type": "bridge"}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply()
+
+    def do_PUT(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply()
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_server(cert_dir: str) -> ThreadingHTTPServer:
+    cert, key = os.path.join(cert_dir, "cert.pem"), os.path.join(cert_dir, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-keyout", key, "-out", cert],
+        check=True, capture_output=True,
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BridgeStandIn)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _measure(label: str, call, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        call()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed
+    print(f"{label:<32} {rate:8.1f} req/s  ({elapsed * 1000 / count:.2f} ms/req)")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cert_dir:
+        server = _start_server(cert_dir)
+        host = f"127.0.0.1:{server.server_port}"
+        url = f"https://{host}/clip/v2/resource/light/bench"
+
+        bridge = HueBridge(ip=host, app_key="bench")
+        if not bridge.is_connected():
+            raise SystemExit("HTTPS-Platzhalter nicht erreichbar.")
+        new_conn = _measure(
+            "Neue Verbindung pro Anfrage",
+            lambda: requests.get(url, headers={"hue-application-key": "bench"}, verify=False, timeout=5),
+            args.requests,
+        )
+        pooled = _measure(
+            "HueBridge Keep-Alive-Session",
+            lambda: bridge.get_resource_by_id("light", "bench"),
+            args.requests,
+        )
+        print(f"Faktor: {pooled / new_conn:.1f}x")
+        bridge.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
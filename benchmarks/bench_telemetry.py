@@ -0,0 +1,74 @@
+"""
+Misst den Durchsatz des TelemetryRecorder gegen eine temporäre SQLite-Datenbank
+und vergleicht ihn mit dem Schreiben einzelner Zeilen mit Commit je Zeile.
+
+Aufruf: python -m benchmarks.bench_telemetry [--rows 200000] [--sensors 20]
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from src.telemetry import INSERT_SQL, SCHEMA, TelemetryRecorder, connect, init_schema
+
+
+def _rows(count: int, sensors: int):
+    start = datetime(2026, 1, 1)
+    types = ("brightness", "temperature", "motion")
+    for i in range(count):
+        sample = i // (sensors * len(types))
+        yield (
+            (start + timedelta(milliseconds=sample * 100)).isoformat(timespec="milliseconds"),
+            f"sensor-{(i // len(types)) % sensors}", types[i % len(types)], float(i % 1000),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--sensors", type=int, default=20)
+    parser.add_argument("--single-rows", type=int, default=2_000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        naive_db = os.path.join(tmp, "naive.db")
+        with sqlite3.connect(naive_db) as con:
+            con.execute(SCHEMA[0])
+        con = sqlite3.connect(naive_db)
+        start = time.perf_counter()
+        for row in _rows(args.single_rows, args.sensors):
+            con.execute(INSERT_SQL, row)
+            con.commit()
+        naive_rate = args.single_rows / (time.perf_counter() - start)
+        con.close()
+
+        db = os.path.join(tmp, "telemetry.db")
+        con = connect(db)
+        init_schema(con)
+        con.close()
+        recorder = TelemetryRecorder(db, batch_size=5000, flush_interval_s=0.5)
+        recorder.start()
+        start = time.perf_counter()
+        record_start = time.perf_counter()
+        for row in _rows(args.rows, args.sensors):
+            recorder.record_many((row,))
+        record_s = time.perf_counter() - record_start
+        recorder.stop(timeout_s=60)
+        total_s = time.perf_counter() - start
+        stats = recorder.get_stats()
+
+        with sqlite3.connect(db) as con:
+            stored = con.execute("SELECT COUNT(*) FROM measurements").fetchone()[0]
+
+    print(f"Einzelzeilen mit Commit:  {naive_rate:10.0f} Zeilen/s ({args.single_rows} Zeilen)")
+    print(f"TelemetryRecorder:        {args.rows / total_s:10.0f} Zeilen/s ({stats['flushes']} Transaktionen)")
+    print(f"record() im Aufrufer:     {record_s / args.rows * 1e6:10.2f} µs/Zeile")
+    print(f"Gespeichert: {stored}, verworfen: {stats['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
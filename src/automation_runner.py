@@ -0,0 +1,161 @@
+"""
+Führt fällige Automationen parallel auf einem begrenzten Thread-Pool aus.
+Automationen desselben Raums laufen nacheinander in einer Aufgabe, damit ihre
+Schaltbefehle in der gewohnten Reihenfolge bei der Bridge ankommen.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from functools import partial
+from typing import List, Tuple
+import logging
+
+from src.automation_scheduler import AutomationScheduler
+from src.metrics import MetricsRegistry
+
+
+def ordering_key(key: str, automation) -> str:
+    """Raum, dessen Befehle eine Automation sendet; ohne Raum die Automation selbst."""
+    room = getattr(automation, "room", None)
+    if room is not None and getattr(room, "name", None):
+        return f"room:{room.name}"
+    config = getattr(automation, "config", {}) or {}
+    target_room = config.get("target_room") or (config.get("action") or {}).get("target_room")
+    return f"room:{target_room}" if target_room else f"automation:{key}"
+
+
+class AutomationRunner:
+    """
+    Jede Automation darf höchstens budget_s laufen. Überschreitet die gerade
+    laufende Automation einer Raumgruppe ihr Budget, wird das protokolliert und
+    die Gruppe nicht weiter abgewartet; bis sie fertig ist, werden ihre
+    Automationen in folgenden Durchläufen übersprungen.
+    Jede Automation plant ihre nächste Frist selbst nach ihrem Lauf, auch wenn
+    sie einen Fehler wirft oder ihre Gruppe übersprungen wurde.
+    """
+
+    # Frist, wenn next_deadline() selbst fehlschlägt.
+    RETRY_DELAY_S = 60
+
+    def __init__(
+        self,
+        scheduler: AutomationScheduler,
+        metrics: MetricsRegistry,
+        logger: logging.Logger,
+        max_workers: int = 4,
+        budget_s: float = 2.0,
+    ):
+        self.scheduler = scheduler
+        self.metrics = metrics
+        self.logger = logger
+        self.budget_s = budget_s
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="automation")
+        self._lock = threading.Lock()
+        self._in_flight = set()
+        self._missed = set()
+        self._abandoned = set()
+        self.overruns = 0
+
+    def run(self, due_automations: List[Tuple[str, object]], now: datetime):
+        groups = OrderedDict()
+        with self._lock:
+            for key, automation in due_automations:
+                if key in self._in_flight:
+                    # Läuft noch aus einem früheren Durchlauf; wird danach erneut geweckt.
+                    self._missed.add(key)
+                    continue
+                groups.setdefault(ordering_key(key, automation), []).append((key, automation))
+            for group in groups.values():
+                self._in_flight.update(key for key, _ in group)
+        if not groups:
+            return
+
+        tasks = {}
+        for group in groups.values():
+            progress = {}
+            future = self._executor.submit(self._run_group, group, now, progress)
+            future.add_done_callback(partial(self._finished, group))
+            tasks[future] = (group, progress)
+
+        pending, finished = set(tasks), []
+        # Noch nicht gestartete Gruppen zählen ab dem Zeitpunkt, an dem zuletzt ein Worker frei wurde.
+        worker_freed = time.monotonic()
+        while pending:
+            starts = [tasks[future][1]["current"][1] for future in pending if "current" in tasks[future][1]]
+            deadline = min(starts, default=worker_freed) + self.budget_s
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if done:
+                finished.extend(done)
+                worker_freed = time.monotonic()
+            # Wartende Gruppen kommen dran, solange ein Worker noch im Budget arbeitet.
+            workers_busy = any(
+                "current" in tasks[future][1] and time.monotonic() - tasks[future][1]["current"][1] < self.budget_s
+                for future in pending
+            )
+            for future in list(pending):
+                group, progress = tasks[future]
+                automation, started = progress.get("current", (None, worker_freed))
+                if time.monotonic() - started < self.budget_s or (automation is None and workers_busy):
+                    continue
+                pending.discard(future)
+                with self._lock:
+                    if future.done():
+                        # Gerade noch fertig geworden.
+                        finished.append(future)
+                        continue
+                    self._abandoned.add(future)
+                self.overruns += 1
+                if automation is not None:
+                    self.logger.warning(
+                        f"Automation '{automation.name}' überschreitet das Zeitbudget von {self.budget_s}s; "
+                        f"ihre Raumgruppe wird bis zum Ende übersprungen."
+                    )
+                else:
+                    names = ", ".join(automation.name for _, automation in group)
+                    self.logger.warning(f"Automation(en) '{names}' finden keinen freien Worker und werden übersprungen.")
+        for future in finished:
+            # Fehler abgewarteter Automationen wie bei serieller Ausführung weiterreichen.
+            future.result()
+
+    def _run_group(self, group: List[Tuple[str, object]], now: datetime, progress: dict):
+        errors = []
+        for key, automation in group:
+            progress["current"] = (automation, time.monotonic())
+            try:
+                with self.metrics.measure("automation", key, label=automation.name):
+                    automation.run(now)
+            except Exception as e:
+                # Die übrigen Automationen des Raums laufen trotzdem; gemeldet wird danach.
+                errors.append(e)
+            finally:
+                self._reschedule(key, automation, now)
+        if errors:
+            raise errors[0]
+
+    def _reschedule(self, key: str, automation, now: datetime):
+        try:
+            deadline = automation.next_deadline(now)
+        except Exception as e:
+            self.logger.error(f"Nächste Frist von '{automation.name}' nicht bestimmbar: {e}", exc_info=True)
+            deadline = now + timedelta(seconds=self.RETRY_DELAY_S)
+        self.scheduler.schedule(key, deadline)
+
+    def _finished(self, group: List[Tuple[str, object]], future):
+        keys = {key for key, _ in group}
+        with self._lock:
+            self._in_flight.difference_update(keys)
+            missed = keys & self._missed
+            self._missed.difference_update(keys)
+            abandoned = future in self._abandoned
+            self._abandoned.discard(future)
+        for key in missed:
+            self.scheduler.wake(key)
+        # Fehler abgewarteter Aufgaben meldet run(); hier nur die der übersprungenen.
+        error = future.exception() if abandoned and not future.cancelled() else None
+        if error is not None:
+            self.logger.error(f"Fehler in übersprungener Automation: {error}", exc_info=error)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
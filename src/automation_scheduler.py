@@ -0,0 +1,89 @@
+"""
+Fristbasierte Ablaufsteuerung für die Automationen der Kernlogik.
+Statt alle Automationen in festen Abständen auszuführen, meldet jede ihre
+nächste Frist; die Hauptschleife schläft bis zur frühesten Frist oder bis ein
+Ereignis (z.B. Bewegung aus dem Eventstream) eine Automation aufweckt.
+"""
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime
+from typing import Hashable, List, Optional, Set
+
+
+class AutomationScheduler:
+    """
+    Min-Heap aus (Frist, Sequenz, Schlüssel). Neu geplante Fristen ersetzen die
+    alte eines Schlüssels; veraltete Heap-Einträge werden beim Entnehmen verworfen.
+    """
+
+    def __init__(self, max_sleep_s: float = 60.0):
+        self.max_sleep_s = max_sleep_s
+        self._heap: List = []
+        self._current = {}
+        self._woken: Set[Hashable] = set()
+        self._wake_loop = False
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self.wakeups = 0
+
+    def schedule(self, key: Hashable, when: Optional[datetime]):
+        """Plant key für den Zeitpunkt when ein; None entfernt eine bestehende Frist."""
+        with self._condition:
+            if when is None:
+                self._current.pop(key, None)
+                return
+            deadline = when.timestamp()
+            sequence = next(self._sequence)
+            self._current[key] = sequence
+            heapq.heappush(self._heap, (deadline, sequence, key))
+            if self._heap[0][1] == sequence:
+                self._condition.notify()
+
+    def wake(self, key: Optional[Hashable] = None):
+        """Weckt die Schleife auf; mit key wird diese Automation sofort fällig. Threadsicher."""
+        with self._condition:
+            if key is None:
+                self._wake_loop = True
+            else:
+                self._woken.add(key)
+            self._condition.notify()
+
+    def next_deadline(self) -> Optional[float]:
+        with self._condition:
+            self._discard_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def wait_for_due(self) -> Set[Hashable]:
+        """
+        Blockiert bis zur frühesten Frist, einem Aufwecken oder max_sleep_s und
+        gibt alle dann fälligen Schlüssel zurück (kann leer sein).
+        """
+        with self._condition:
+            due = self._collect_due()
+            if not due and not self._wake_loop:
+                self._discard_stale()
+                timeout = self.max_sleep_s
+                if self._heap:
+                    timeout = min(timeout, max(0.0, self._heap[0][0] - time.time()))
+                self._condition.wait(timeout)
+                due = self._collect_due()
+            self._wake_loop = False
+            self.wakeups += 1
+            return due
+
+    def _collect_due(self) -> Set[Hashable]:
+        due = self._woken
+        self._woken = set()
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            _, sequence, key = heapq.heappop(self._heap)
+            if self._current.get(key) == sequence:
+                del self._current[key]
+                due.add(key)
+        return due
+
+    def _discard_stale(self):
+        while self._heap and self._current.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
@@ -0,0 +1,343 @@
+"""
+Gemeinsamer Zugang zur Hue Bridge für Kernlogik und Webserver. Die Kernlogik
+besitzt die einzige HueBridge (Verbindungspool, Spiegel, Befehlswarteschlange)
+und stellt sie über einen Unix-Socket bereit; der Webserver nutzt BridgeClient,
+das dieselben Methoden anbietet. Dadurch laufen UI-Befehle durch dieselbe
+ratenbegrenzte Warteschlange wie die Automationen, und Lesezugriffe der UI
+kommen aus dem bereits warmen Spiegel.
+
+Protokoll: je Zeile ein kompaktes JSON-Objekt.
+Anfrage  {"i": <Nr>, "op": <Methode>, "a": [Argumente], "k": {Schlüsselwortargumente}}
+Antwort  {"i": <Nr>, "g": <Generation>, "r": <Ergebnis>}
+         oder {"i": <Nr>, "g": <Generation>, "e": <Meldung>, "t": <Fehlerart>}
+
+Die Generation ändert sich bei jedem Neustart der Kernlogik, jedem Wechsel der
+Bridge und jeder strukturellen Änderung (Räume, Zonen, Geräte). Der Client
+verwirft daran seinen lokalen Strukturindex.
+"""
+import json
+import os
+import socket
+import threading
+import logging
+import uuid
+from typing import Dict, List, Optional
+
+from src.connection_health import BridgeUnavailableError
+from src.metrics import MetricsRegistry
+from src.topology import BridgeTopology
+
+# Methoden der HueBridge, die über den Socket aufgerufen werden dürfen.
+BRIDGE_METHODS = (
+    "is_connected", "get_full_api_data", "get_grouped_lights", "get_resource_by_id",
+    "set_light_state", "set_group_state", "recall_scene", "create_scene", "delete_scene",
+    "update_resource_metadata", "move_device_to_group", "get_command_stats",
+)
+# Zusätzliche Abfragen ohne direkte Entsprechung als Methode.
+SNAPSHOT_OPS = {
+    "health": lambda bridge: bridge.health.snapshot(),
+    "metrics": lambda bridge: bridge.metrics.snapshot(),
+}
+
+
+class _ClosedBeforeReply(ConnectionResetError):
+    """Das Gateway hat die Verbindung geschlossen, ohne ein Byte der Antwort zu senden."""
+
+
+def _encode(message: Dict) -> bytes:
+    return (json.dumps(message, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+
+class BridgeGateway:
+    """Seite der Kernlogik: führt Anfragen gegen die jeweils aktuelle HueBridge aus."""
+
+    def __init__(self, socket_path: str, logger: Optional[logging.Logger] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.socket_path = socket_path
+        self.logger = logger or logging.getLogger(__name__)
+        self.metrics = metrics
+        self._bridge = None
+        self._server: Optional[socket.socket] = None
+        self._instance = uuid.uuid4().hex[:8]
+        self._bridge_epoch = 0
+
+    def set_bridge(self, bridge):
+        """Wechselt die bediente Bridge (None, solange keine verbunden ist)."""
+        if bridge is not self._bridge:
+            self._bridge_epoch += 1
+        self._bridge = bridge
+
+    def generation(self, bridge=None) -> str:
+        """Kennung aus Prozessinstanz, Bridge-Wechsel und Strukturversion."""
+        version = bridge.topology_version if bridge is not None else 0
+        return f"{self._instance}.{self._bridge_epoch}.{version}"
+
+    def start(self):
+        if self._server is not None:
+            return
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+        try:
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(self.socket_path)
+            server.listen(16)
+        except OSError as e:
+            self.logger.error(f"Bridge-Socket konnte nicht geöffnet werden: {e}")
+            return
+        self._server = server
+        threading.Thread(target=self._accept_loop, name="bridge-gateway", daemon=True).start()
+
+    def stop(self):
+        server, self._server = self._server, None
+        if server:
+            server.close()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+    def _accept_loop(self):
+        while self._server is not None:
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(client,), name="bridge-gateway-client", daemon=True).start()
+
+    def _serve(self, client: socket.socket):
+        with client, client.makefile("rb") as stream:
+            for line in stream:
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    return
+                try:
+                    client.sendall(_encode(self.handle(request)))
+                except OSError:
+                    return
+
+    def handle(self, request: Dict) -> Dict:
+        bridge = self._bridge
+        # Vor dem Aufruf ermitteln: ändert sich die Struktur währenddessen,
+        # sieht der Client die neue Generation spätestens bei der nächsten Anfrage.
+        generation = self.generation(bridge)
+        response = self._dispatch(bridge, request)
+        response["g"] = generation
+        return response
+
+    def _dispatch(self, bridge, request: Dict) -> Dict:
+        request_id, op = request.get("i"), request.get("op")
+        if bridge is None:
+            return {"i": request_id, "e": "Keine Bridge verbunden.", "t": "unavailable"}
+        if op not in BRIDGE_METHODS and op not in SNAPSHOT_OPS:
+            return {"i": request_id, "e": f"Unbekannte Operation: {op}", "t": "ValueError"}
+        try:
+            if self.metrics:
+                with self.metrics.measure("gateway", op):
+                    result = self._call(bridge, op, request)
+            else:
+                result = self._call(bridge, op, request)
+        except BridgeUnavailableError as e:
+            return {"i": request_id, "e": str(e), "t": "unavailable"}
+        except Exception as e:
+            self.logger.error(f"Fehler bei Bridge-Anfrage '{op}' aus dem Webserver: {e}", exc_info=True)
+            return {"i": request_id, "e": str(e), "t": type(e).__name__}
+        return {"i": request_id, "r": result}
+
+    @staticmethod
+    def _call(bridge, op: str, request: Dict):
+        if op in SNAPSHOT_OPS:
+            return SNAPSHOT_OPS[op](bridge)
+        return getattr(bridge, op)(*request.get("a", ()), **request.get("k", {}))
+
+
+class _RemoteSnapshot:
+    """Stellt bridge.health.snapshot() o.ä. als Aufruf an das Gateway bereit."""
+
+    def __init__(self, client: "BridgeClient", op: str):
+        self._client = client
+        self._op = op
+
+    def snapshot(self) -> Dict:
+        return self._client._call(self._op)
+
+
+class BridgeClient:
+    """
+    Seite des Webservers mit der Schnittstelle der HueBridge. Verbindungen zum
+    Gateway werden in einem kleinen Pool wiederverwendet. Ist das Gateway oder
+    die Bridge nicht erreichbar, wird BridgeUnavailableError geworfen bzw.
+    is_connected() liefert False.
+    """
+
+    def __init__(self, socket_path: str, logger: Optional[logging.Logger] = None,
+                 timeout_s: float = 15.0, pool_size: int = 4):
+        self.socket_path = socket_path
+        self.logger = logger or logging.getLogger(__name__)
+        self.timeout_s = timeout_s
+        self.pool_size = pool_size
+        self.metrics = MetricsRegistry()
+        self.health = _RemoteSnapshot(self, "health")
+        self._idle: List[socket.socket] = []
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._topology = BridgeTopology()
+        self._generation: Optional[str] = None
+
+    def _acquire(self, pooled: bool = True):
+        with self._lock:
+            self._next_id += 1
+            if pooled and self._idle:
+                return self._idle.pop(), self._next_id, True
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout_s)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock, self._next_id, False
+
+    def _release(self, sock: socket.socket):
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(sock)
+                return
+        sock.close()
+
+    def _call(self, op: str, *args, **kwargs):
+        try:
+            with self.metrics.measure("gateway", op):
+                response = self._exchange(op, args, kwargs)
+        except BridgeUnavailableError:
+            # Was das Gateway nach der Unterbrechung meldet, ist unbekannt.
+            self._topology.invalidate()
+            raise
+        self._observe_generation(response.get("g"))
+        if "e" not in response:
+            return response.get("r")
+        if response.get("t") == "unavailable":
+            raise BridgeUnavailableError(response["e"])
+        if response.get("t") == "ValueError":
+            raise ValueError(response["e"])
+        raise ConnectionError(response["e"])
+
+    def _exchange(self, op: str, args: tuple, kwargs: Dict, pooled: bool = True) -> Dict:
+        try:
+            sock, request_id, reused = self._acquire(pooled)
+        except OSError as e:
+            raise BridgeUnavailableError(f"Bridge-Gateway nicht erreichbar: {e}") from e
+        try:
+            sock.sendall(_encode({"i": request_id, "op": op, "a": args, "k": kwargs}))
+        except OSError as e:
+            sock.close()
+            if reused:
+                # Nach einem Neustart der Kernlogik sind gepoolte Verbindungen tot;
+                # die Anfrage hat das Gateway dann nie erreicht.
+                return self._exchange(op, args, kwargs, pooled=False)
+            raise BridgeUnavailableError(f"Bridge-Gateway nicht erreichbar: {e}") from e
+        try:
+            response = self._read_line(sock)
+        except _ClosedBeforeReply as e:
+            sock.close()
+            if reused:
+                # Die Kernlogik wurde neu gestartet, bevor sie die gepoolte
+                # Verbindung geschlossen hatte: sendall gelang noch, gelesen
+                # wird nur das Verbindungsende. Einmal neu verbinden.
+                return self._exchange(op, args, kwargs, pooled=False)
+            raise BridgeUnavailableError(f"Bridge-Gateway nicht erreichbar: {e}") from e
+        except (OSError, ValueError) as e:
+            # Teilantwort oder Zeitüberschreitung: Die Anfrage kann bereits
+            # ausgeführt sein, also nicht wiederholen (z.B. create_scene).
+            sock.close()
+            raise BridgeUnavailableError(f"Bridge-Gateway nicht erreichbar: {e}") from e
+        if response.get("i") != request_id:
+            sock.close()
+            raise BridgeUnavailableError("Ungültige Antwort des Bridge-Gateways.")
+        self._release(sock)
+        return response
+
+    def _observe_generation(self, generation: Optional[str]):
+        with self._lock:
+            changed = generation != self._generation
+            self._generation = generation
+        if changed:
+            self._topology.invalidate()
+
+    @staticmethod
+    def _read_line(sock: socket.socket) -> Dict:
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                if not chunks:
+                    raise _ClosedBeforeReply("Verbindung vom Gateway geschlossen.")
+                raise ConnectionResetError("Verbindung vom Gateway während der Antwort geschlossen.")
+            chunks.append(chunk)
+            if chunk.endswith(b"\n"):
+                return json.loads(b"".join(chunks))
+
+    def is_connected(self) -> bool:
+        try:
+            return bool(self._call("is_connected"))
+        except (BridgeUnavailableError, ConnectionError):
+            return False
+
+    @property
+    def topology(self) -> BridgeTopology:
+        """
+        Lokaler Strukturindex, aufgebaut aus den Daten des Gateways. Er wird
+        verworfen, sobald das Gateway eine neue Generation meldet oder nicht
+        erreichbar war, und beim nächsten Zugriff neu geladen.
+        """
+        if not self._topology.is_built and self.is_connected():
+            self.refresh_topology()
+        return self._topology
+
+    def refresh_topology(self, api_data: Optional[Dict] = None):
+        if api_data is None:
+            api_data = self.get_full_api_data()
+        if api_data:
+            self._topology.rebuild(api_data)
+
+    def get_full_api_data(self, resource_types=None, allow_partial: bool = False) -> Dict:
+        types = list(resource_types) if resource_types is not None else None
+        return self._call("get_full_api_data", types, allow_partial)
+
+    def get_grouped_lights(self) -> List[Dict]:
+        return self._call("get_grouped_lights")
+
+    def get_resource_by_id(self, resource_type: str, resource_id: str) -> Optional[Dict]:
+        return self._call("get_resource_by_id", resource_type, resource_id)
+
+    def set_light_state(self, light_id: str, state: dict):
+        return self._call("set_light_state", light_id, state)
+
+    def set_group_state(self, group_id: str, state: dict):
+        return self._call("set_group_state", group_id, state)
+
+    def recall_scene(self, scene_id: str):
+        return self._call("recall_scene", scene_id)
+
+    def create_scene(self, name: str, group_id: str, group_type: str, actions: List[Dict]) -> Optional[Dict]:
+        return self._call("create_scene", name, group_id, group_type, actions)
+
+    def delete_scene(self, scene_id: str):
+        return self._call("delete_scene", scene_id)
+
+    def update_resource_metadata(self, resource_type: str, resource_id: str, new_name: str):
+        return self._call("update_resource_metadata", resource_type, resource_id, new_name)
+
+    def move_device_to_group(self, device_id: str, new_group_id: str):
+        return self._call("move_device_to_group", device_id, new_group_id)
+
+    def get_command_stats(self) -> Optional[Dict]:
+        return self._call("get_command_stats")
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for sock in idle:
+            sock.close()
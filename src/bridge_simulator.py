@@ -0,0 +1,597 @@
+"""
+Simuliert eine Hue Bridge (v2 API) lokal, um HueBridge, CoreLogic und die
+Web-UI ohne echte Hardware zu betreiben, zu vermessen und zu belasten.
+
+Unterstützt wird die Teilmenge der CLIP-v2-API, die HueBridge nutzt:
+GET/PUT unter /clip/v2/resource, der Eventstream unter /eventstream/clip/v2
+und die Erzeugung eines App-Keys über POST /api.
+
+Aufruf: python -m src.bridge_simulator --rooms 6 --sensors 20 --latency-ms 20
+"""
+import argparse
+import json
+import os
+import queue
+import random
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+import logging
+
+DEFAULT_APP_KEY = "simulator-app-key"
+
+
+def _new_id() -> str:
+    return str(uuid.uuid4())
+
+
+def _ref(resource: Dict) -> Dict:
+    return {"rid": resource["id"], "rtype": resource["type"]}
+
+
+class _TokenBucket:
+    """Einfacher Token-Bucket für die Ratenbegrenzung des Simulators."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class SimulatedBridgeState:
+    """Ressourcen der simulierten Bridge und die Logik für Schaltbefehle."""
+
+    def __init__(self, rooms: int = 4, lights_per_room: int = 3, zones: int = 1, sensors: int = 4, seed: int = 1):
+        self._lock = threading.RLock()
+        self.resources: Dict[str, Dict[str, Dict]] = {}
+        self._rng = random.Random(seed)
+        self._build(rooms, lights_per_room, zones, sensors)
+
+    def _add(self, resource: Dict) -> Dict:
+        self.resources.setdefault(resource["type"], {})[resource["id"]] = resource
+        return resource
+
+    def _build(self, room_count: int, lights_per_room: int, zone_count: int, sensor_count: int):
+        self._add({"id": _new_id(), "type": "bridge", "bridge_id": "simulator0001", "time_zone": {"time_zone": "Europe/Berlin"}})
+        rooms = []
+        for r in range(room_count):
+            room = self._add({
+                "id": _new_id(), "type": "room", "children": [], "services": [],
+                "metadata": {"name": f"Raum {r + 1}", "archetype": "living_room"},
+            })
+            for l in range(lights_per_room):
+                device = self._add({
+                    "id": _new_id(), "type": "device", "services": [],
+                    "metadata": {"name": f"Lampe {r + 1}.{l + 1}", "archetype": "sultan_bulb"},
+                    "product_data": {"product_name": "Hue color lamp", "model_id": "SIM-LCT"},
+                })
+                light = self._add({
+                    "id": _new_id(), "type": "light", "owner": _ref(device),
+                    "metadata": {"name": device["metadata"]["name"], "archetype": "sultan_bulb"},
+                    "on": {"on": False}, "dimming": {"brightness": 100.0},
+                    "color_temperature": {"mirek": 366, "mirek_valid": True},
+                })
+                device["services"].append(_ref(light))
+                room["children"].append(_ref(device))
+            self._add_grouped_light(room)
+            self._add({
+                "id": _new_id(), "type": "scene", "group": _ref(room), "actions": [],
+                "metadata": {"name": f"Hell {r + 1}"},
+            })
+            rooms.append(room)
+
+        all_lights = list(self.resources.get("light", {}).values())
+        for z in range(zone_count):
+            zone = self._add({
+                "id": _new_id(), "type": "zone", "services": [],
+                "metadata": {"name": f"Zone {z + 1}", "archetype": "home"},
+                "children": [_ref(light) for light in all_lights[z::zone_count + 1]],
+            })
+            self._add_grouped_light(zone)
+
+        for s in range(sensor_count):
+            device = self._add({
+                "id": _new_id(), "type": "device", "services": [],
+                "metadata": {"name": f"Bewegungsmelder {s + 1}", "archetype": "unknown_archetype"},
+                "product_data": {"product_name": "Hue motion sensor", "model_id": "SIM-SML"},
+            })
+            services = [
+                {"type": "motion", "enabled": True, "motion": {"motion": False, "motion_valid": True}},
+                {"type": "light_level", "enabled": True, "light": {"light_level": 10000 + s * 100, "light_level_valid": True}},
+                {"type": "temperature", "enabled": True, "temperature": {"temperature": 21.0, "temperature_valid": True}},
+            ]
+            for service in services:
+                service.update({"id": _new_id(), "owner": _ref(device)})
+                device["services"].append(_ref(self._add(service)))
+            if rooms:
+                rooms[s % len(rooms)]["children"].append(_ref(device))
+
+    def _add_grouped_light(self, group: Dict):
+        grouped_light = self._add({
+            "id": _new_id(), "type": "grouped_light", "owner": _ref(group),
+            "on": {"on": False}, "dimming": {"brightness": 100.0},
+        })
+        group["services"].append(_ref(grouped_light))
+
+    # --- Lesen ---
+
+    def get_all(self, resource_type: Optional[str] = None) -> List[Dict]:
+        with self._lock:
+            if resource_type:
+                return json.loads(json.dumps(list(self.resources.get(resource_type, {}).values())))
+            return json.loads(json.dumps([r for bucket in self.resources.values() for r in bucket.values()]))
+
+    def get(self, resource_type: str, resource_id: str) -> Optional[Dict]:
+        with self._lock:
+            resource = self.resources.get(resource_type, {}).get(resource_id)
+            return json.loads(json.dumps(resource)) if resource else None
+
+    def ids(self, resource_type: str) -> List[str]:
+        with self._lock:
+            return list(self.resources.get(resource_type, {}))
+
+    # --- Schreiben (liefert die Liste der geänderten Teilressourcen für Events) ---
+
+    def put(self, resource_type: str, resource_id: str, body: Dict) -> Optional[List[Dict]]:
+        with self._lock:
+            resource = self.resources.get(resource_type, {}).get(resource_id)
+            if resource is None:
+                return None
+            if resource_type == "light":
+                changes = [self._apply_light(resource, body)]
+                changes += self._refresh_groups()
+            elif resource_type == "grouped_light":
+                changes = self._apply_group(resource, body)
+            elif resource_type == "scene":
+                changes = self._recall_scene(resource) if "recall" in body else []
+            elif resource_type in ("room", "zone", "device"):
+                for key in ("children", "metadata"):
+                    if key in body:
+                        resource[key] = body[key] if key == "children" else {**resource.get(key, {}), **body[key]}
+                changes = [{"id": resource_id, "type": resource_type, **{k: body[k] for k in ("children", "metadata") if k in body}}]
+            else:
+                changes = []
+            return changes
+
+    def set_motion(self, motion_id: str, motion: bool) -> List[Dict]:
+        with self._lock:
+            resource = self.resources.get("motion", {}).get(motion_id)
+            if resource is None or resource["motion"]["motion"] == motion:
+                return []
+            resource["motion"]["motion"] = motion
+            return [{"id": motion_id, "type": "motion", "owner": resource["owner"], "motion": {"motion": motion, "motion_valid": True}}]
+
+    def _apply_light(self, light: Dict, body: Dict) -> Dict:
+        change = {"id": light["id"], "type": "light", "owner": light["owner"]}
+        for key in ("on", "dimming", "color_temperature", "color"):
+            if isinstance(body.get(key), dict):
+                light.setdefault(key, {}).update(body[key])
+                change[key] = dict(body[key])
+        return change
+
+    def _group_lights(self, group_ref: Dict) -> List[Dict]:
+        group = self.resources.get(group_ref["rtype"], {}).get(group_ref["rid"])
+        if not group:
+            return []
+        lights = []
+        for child in group.get("children", []):
+            if child["rtype"] == "light":
+                lights.append(self.resources["light"].get(child["rid"]))
+            elif child["rtype"] == "device":
+                device = self.resources["device"].get(child["rid"], {})
+                lights += [self.resources["light"].get(s["rid"]) for s in device.get("services", []) if s["rtype"] == "light"]
+        return [light for light in lights if light]
+
+    def _apply_group(self, grouped_light: Dict, body: Dict) -> List[Dict]:
+        changes = [self._apply_light(light, body) for light in self._group_lights(grouped_light["owner"])]
+        return changes + self._refresh_groups()
+
+    def _recall_scene(self, scene: Dict) -> List[Dict]:
+        body = {"on": {"on": True}, "dimming": {"brightness": 100.0}}
+        changes = [self._apply_light(light, body) for light in self._group_lights(scene["group"])]
+        return changes + self._refresh_groups()
+
+    def _refresh_groups(self) -> List[Dict]:
+        """Leitet den Zustand aller Lichtgruppen aus ihren Lampen ab und meldet Änderungen."""
+        changes = []
+        for grouped_light in self.resources.get("grouped_light", {}).values():
+            lights = self._group_lights(grouped_light["owner"])
+            if not lights:
+                continue
+            on = any(light["on"]["on"] for light in lights)
+            lit = [light for light in lights if light["on"]["on"]] or lights
+            brightness = round(sum(light["dimming"]["brightness"] for light in lit) / len(lit), 2)
+            if grouped_light["on"]["on"] != on or grouped_light["dimming"]["brightness"] != brightness:
+                grouped_light["on"]["on"] = on
+                grouped_light["dimming"]["brightness"] = brightness
+                changes.append({
+                    "id": grouped_light["id"], "type": "grouped_light", "owner": grouped_light["owner"],
+                    "on": {"on": on}, "dimming": {"brightness": brightness},
+                })
+        return changes
+
+
+class BridgeSimulator:
+    """
+    Startet einen HTTPS-Server, der sich wie eine Hue Bridge verhält.
+
+    latency_ms/jitter_ms verzögern jede REST-Antwort, rate_limit aktiviert
+    429-Antworten oberhalb von light_rate bzw. group_rate PUTs pro Sekunde.
+    motion_script ist eine Liste von {"at_s", "sensor", "motion"}-Einträgen
+    (sensor = Index des Bewegungsmelders), motion_rate die Wahrscheinlichkeit
+    pro Sensor und Sekunde für eine zufällige Bewegung von motion_hold_s Dauer.
+    """
+
+    def __init__(
+        self,
+        rooms: int = 4,
+        lights_per_room: int = 3,
+        zones: int = 1,
+        sensors: int = 4,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        app_key: Optional[str] = DEFAULT_APP_KEY,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        rate_limit: bool = False,
+        light_rate: float = 10.0,
+        group_rate: float = 1.0,
+        motion_script: Optional[List[Dict]] = None,
+        motion_rate: float = 0.0,
+        motion_hold_s: float = 10.0,
+        heartbeat_s: float = 10.0,
+        certfile: Optional[str] = None,
+        keyfile: Optional[str] = None,
+        seed: int = 1,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self.state = SimulatedBridgeState(rooms, lights_per_room, zones, sensors, seed)
+        self.host = host
+        self.port = port
+        self.app_key = app_key
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit
+        # Etwas Spielraum wie bei der echten Bridge, damit Netzwerk-Jitter nicht sofort zu 429 führt.
+        self._buckets = {
+            "light": _TokenBucket(light_rate, max(2.0, light_rate)),
+            "grouped_light": _TokenBucket(group_rate, max(2.0, group_rate)),
+        }
+        self.motion_script = sorted(motion_script or [], key=lambda e: e.get("at_s", 0))
+        self.motion_rate = motion_rate
+        self.motion_hold_s = motion_hold_s
+        self.heartbeat_s = heartbeat_s
+        self.certfile = certfile
+        self.keyfile = keyfile
+        self.logger = logger or logging.getLogger(__name__)
+        self._rng = random.Random(seed)
+
+        self._subscribers: List[queue.Queue] = []
+        self._subscribers_lock = threading.Lock()
+        self._event_counter = 0
+        self._stop_event = threading.Event()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._threads: List[threading.Thread] = []
+        self._cert_dir: Optional[str] = None
+
+        self.stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "puts": 0, "rate_limited": 0, "events": 0}
+        self.command_log: List[Dict] = []
+        self.motion_log: List[Dict] = []
+
+    @property
+    def address(self) -> str:
+        """Adresse im Format host:port, direkt als 'ip' für HueBridge verwendbar."""
+        return f"{self.host}:{self.port}"
+
+    def start(self) -> "BridgeSimulator":
+        handler = type("SimulatorHandler", (_SimulatorRequestHandler,), {"simulator": self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(*self._ensure_certificate())
+        self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+        self.port = self._server.server_port
+
+        self._stop_event.clear()
+        self._spawn(self._server.serve_forever, "sim-http")
+        if self.motion_script or self.motion_rate > 0:
+            self._spawn(self._run_motion, "sim-motion")
+        self.logger.info(f"Bridge-Simulator läuft unter https://{self.address} (App-Key: {self.app_key}).")
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        with self._subscribers_lock:
+            for subscriber in self._subscribers:
+                subscriber.put(None)
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads = []
+        if self._cert_dir:
+            shutil.rmtree(self._cert_dir, ignore_errors=True)
+            self._cert_dir = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _spawn(self, target, name: str):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _ensure_certificate(self):
+        if self.certfile and self.keyfile:
+            return self.certfile, self.keyfile
+        self._cert_dir = tempfile.mkdtemp(prefix="hue-sim-")
+        cert, key = os.path.join(self._cert_dir, "cert.pem"), os.path.join(self._cert_dir, "key.pem")
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "7",
+             "-subj", "/CN=hue-simulator", "-keyout", key, "-out", cert],
+            check=True, capture_output=True,
+        )
+        return cert, key
+
+    # --- Bewegung ---
+
+    def trigger_motion(self, sensor: int, motion: bool = True):
+        """Setzt den Bewegungsstatus des n-ten Bewegungsmelders und sendet ein Event."""
+        motion_ids = self.state.ids("motion")
+        if not motion_ids:
+            return
+        motion_id = motion_ids[sensor % len(motion_ids)]
+        changes = self.state.set_motion(motion_id, motion)
+        if changes:
+            with self.stats_lock:
+                self.motion_log.append({"t": time.monotonic(), "motion_id": motion_id, "motion": motion})
+        self.publish("update", changes)
+
+    def _run_motion(self):
+        start = time.monotonic()
+        script = list(self.motion_script)
+        clear_at: Dict[int, float] = {}
+        sensor_count = len(self.state.ids("motion"))
+        while not self._stop_event.wait(0.1):
+            elapsed = time.monotonic() - start
+            while script and script[0].get("at_s", 0) <= elapsed:
+                entry = script.pop(0)
+                self.trigger_motion(entry.get("sensor", 0), entry.get("motion", True))
+            if self.motion_rate > 0:
+                for sensor in range(sensor_count):
+                    if sensor not in clear_at and self._rng.random() < self.motion_rate * 0.1:
+                        self.trigger_motion(sensor, True)
+                        clear_at[sensor] = elapsed + self.motion_hold_s
+                for sensor, when in list(clear_at.items()):
+                    if when <= elapsed:
+                        self.trigger_motion(sensor, False)
+                        del clear_at[sensor]
+
+    # --- Eventstream ---
+
+    def publish(self, event_type: str, data: List[Dict]):
+        if not data:
+            return
+        with self._subscribers_lock:
+            self._event_counter += 1
+            event_id = f"{int(time.time())}:{self._event_counter}"
+            container = [{
+                "creationtime": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "id": _new_id(), "type": event_type, "data": data,
+            }]
+            payload = f"id: {event_id}\ndata: {json.dumps(container)}\n\n".encode()
+            for subscriber in self._subscribers:
+                subscriber.put(payload)
+        with self.stats_lock:
+            self.stats["events"] += 1
+
+    def _subscribe(self) -> queue.Queue:
+        subscriber: queue.Queue = queue.Queue()
+        with self._subscribers_lock:
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def _unsubscribe(self, subscriber: queue.Queue):
+        with self._subscribers_lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    # --- Hilfen für den Request-Handler ---
+
+    def _delay(self):
+        if self.latency_ms or self.jitter_ms:
+            time.sleep(max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000)
+
+    def _allow_put(self, resource_type: str) -> bool:
+        bucket = self._buckets.get(resource_type)
+        return not self.rate_limit or bucket is None or bucket.take()
+
+    def get_stats(self) -> Dict:
+        with self.stats_lock:
+            return {**self.stats, "subscribers": len(self._subscribers)}
+
+
+class _SimulatorRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    simulator: BridgeSimulator = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status: int, body):
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _authorized(self) -> bool:
+        sim = self.simulator
+        if sim.app_key and self.headers.get("hue-application-key") != sim.app_key:
+            self._send_json(403, {"errors": [{"description": "unauthorized user"}], "data": []})
+            return False
+        return True
+
+    def _resource_path(self):
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+        if parts[:3] != ["clip", "v2", "resource"]:
+            return None
+        return parts[3:]
+
+    def _count(self, key: str):
+        with self.simulator.stats_lock:
+            self.simulator.stats[key] += 1
+
+    def do_GET(self):
+        self._count("requests")
+        if self.path.startswith("/eventstream/clip/v2"):
+            if self._authorized():
+                self._stream_events()
+            return
+        path = self._resource_path()
+        if path is None:
+            return self._send_json(404, {"errors": [{"description": "not found"}], "data": []})
+        if not self._authorized():
+            return
+        self.simulator._delay()
+        state = self.simulator.state
+        if not path:
+            return self._send_json(200, {"errors": [], "data": state.get_all()})
+        if len(path) == 1:
+            return self._send_json(200, {"errors": [], "data": state.get_all(path[0])})
+        resource = state.get(path[0], path[1])
+        if resource is None:
+            return self._send_json(404, {"errors": [{"description": "Not Found"}], "data": []})
+        self._send_json(200, {"errors": [], "data": [resource]})
+
+    def do_PUT(self):
+        self._count("requests")
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b"{}"
+        path = self._resource_path()
+        if not path or len(path) != 2:
+            return self._send_json(404, {"errors": [{"description": "not found"}], "data": []})
+        if not self._authorized():
+            return
+        sim = self.simulator
+        sim._delay()
+        if not sim._allow_put(path[0]):
+            self._count("rate_limited")
+            return self._send_json(429, {"errors": [{"description": "Too many requests"}], "data": []})
+        try:
+            body = json.loads(raw or b"{}")
+        except ValueError:
+            return self._send_json(400, {"errors": [{"description": "body contains invalid json"}], "data": []})
+
+        changes = sim.state.put(path[0], path[1], body)
+        if changes is None:
+            return self._send_json(404, {"errors": [{"description": "Not Found"}], "data": []})
+        self._count("puts")
+        with sim.stats_lock:
+            sim.command_log.append({"t": time.monotonic(), "type": path[0], "id": path[1], "body": body})
+        sim.publish("update", changes)
+        self._send_json(200, {"errors": [], "data": [{"rid": path[1], "rtype": path[0]}]})
+
+    def do_POST(self):
+        self._count("requests")
+        length = int(self.headers.get("Content-Length", 0))
+        if length:
+            self.rfile.read(length)
+        if self.path.rstrip("/") == "/api":
+            key = self.simulator.app_key or DEFAULT_APP_KEY
+            return self._send_json(200, [{"success": {"username": key, "clientkey": "0" * 32}}])
+        self._send_json(404, {"errors": [{"description": "not found"}], "data": []})
+
+    def _stream_events(self):
+        sim = self.simulator
+        subscriber = sim._subscribe()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            self.wfile.write(b": hi\n\n")
+            self.wfile.flush()
+            while not sim._stop_event.is_set():
+                try:
+                    payload = subscriber.get(timeout=sim.heartbeat_s)
+                except queue.Empty:
+                    payload = b": hi\n\n"
+                if payload is None:
+                    break
+                self.wfile.write(payload)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, ssl.SSLError, OSError):
+            pass
+        finally:
+            sim._unsubscribe(subscriber)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokaler Simulator einer Hue Bridge (v2 API).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8443)
+    parser.add_argument("--rooms", type=int, default=4)
+    parser.add_argument("--lights-per-room", type=int, default=3)
+    parser.add_argument("--zones", type=int, default=1)
+    parser.add_argument("--sensors", type=int, default=4)
+    parser.add_argument("--app-key", default=DEFAULT_APP_KEY)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--rate-limit", action="store_true", help="429 oberhalb der Hue-Limits senden")
+    parser.add_argument("--motion-script", help="JSON-Datei mit [{at_s, sensor, motion}, ...]")
+    parser.add_argument("--motion-rate", type=float, default=0.0, help="Bewegungen pro Sensor und Sekunde")
+    parser.add_argument("--motion-hold-s", type=float, default=10.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    script = None
+    if args.motion_script:
+        with open(args.motion_script, "r", encoding="utf-8") as f:
+            script = json.load(f)
+
+    simulator = BridgeSimulator(
+        rooms=args.rooms, lights_per_room=args.lights_per_room, zones=args.zones, sensors=args.sensors,
+        host=args.host, port=args.port, app_key=args.app_key,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, rate_limit=args.rate_limit,
+        motion_script=script, motion_rate=args.motion_rate, motion_hold_s=args.motion_hold_s,
+    ).start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
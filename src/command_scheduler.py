@@ -0,0 +1,198 @@
+"""
+Zentrale Warteschlange für Schaltbefehle an die Hue Bridge.
+Hält die Ratenlimits der Bridge ein und fasst wartende Befehle für dasselbe
+Ziel zusammen; spätere Felder überschreiben frühere, der Rest bleibt erhalten.
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Optional, Tuple
+import logging
+
+
+# Schließen sich gegenseitig aus: Ein neuer Wert verdrängt die wartenden Gegenstücke.
+_EXCLUSIVE_FIELDS = {"ct": ("hue", "sat"), "hue": ("ct",), "sat": ("ct",)}
+
+
+def merge_states(older: Dict, newer: Dict) -> Dict:
+    """Führt zwei Teilzustände für dasselbe Ziel zusammen; Felder aus newer gewinnen."""
+    merged = dict(older)
+    for field in newer:
+        for other in _EXCLUSIVE_FIELDS.get(field, ()):
+            if other not in newer:
+                merged.pop(other, None)
+    merged.update(newer)
+    return merged
+
+
+class _Command:
+    __slots__ = ("kind", "target_id", "state", "enqueued_at", "attempts")
+
+    def __init__(self, kind: str, target_id: str, state: Dict):
+        self.kind = kind
+        self.target_id = target_id
+        self.state = state
+        self.enqueued_at = time.monotonic()
+        self.attempts = 0
+
+
+class CommandScheduler:
+    """
+    Sendet Befehle in einem eigenen Thread unter Einhaltung der Hue-Limits
+    (ca. 10 Lichtbefehle/s und 1 Gruppenbefehl/s).
+
+    Die Sendefunktion erhält (kind, target_id, state) und gibt True zurück,
+    wenn der Befehl angenommen wurde. Fehlgeschlagene Befehle werden erneut
+    eingereiht, sofern inzwischen kein neuerer Zustand für das Ziel vorliegt.
+    """
+
+    MAX_ATTEMPTS = 3
+    RETRY_DELAY_S = 1.0
+
+    def __init__(
+        self,
+        send: Callable[[str, str, Dict], bool],
+        logger: Optional[logging.Logger] = None,
+        light_rate: float = 10.0,
+        group_rate: float = 1.0,
+        wait_window: int = 256,
+    ):
+        self._send = send
+        self.logger = logger or logging.getLogger(__name__)
+        self._intervals = {"light": 1.0 / light_rate, "group": 1.0 / group_rate}
+        self._next_slot = {"light": 0.0, "group": 0.0}
+        self._pending: "OrderedDict[Tuple[str, str], _Command]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+        self._wait_times = deque(maxlen=wait_window)
+        self._sent = 0
+        self._coalesced = 0
+        self._failed = 0
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="hue-command-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, drain_timeout_s: float = 5.0):
+        """Sendet noch wartende Befehle (bis zum Timeout) und beendet den Thread."""
+        deadline = time.monotonic() + drain_timeout_s
+        with self._cond:
+            while self._pending and self._thread and self._thread.is_alive():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.logger.warning(f"{len(self._pending)} Befehle beim Beenden nicht mehr gesendet.")
+                    break
+                self._cond.wait(remaining)
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def submit(self, kind: str, target_id: str, state: Dict):
+        """
+        Reiht einen Befehl ein. Wartet bereits ein Befehl für dasselbe Ziel, wird
+        der neue Zustand in ihn eingemischt (z.B. bleibt 'bri' erhalten, wenn
+        danach nur 'ct' kommt).
+        """
+        if kind not in self._intervals:
+            raise ValueError(f"Unbekannte Befehlsart: {kind}")
+        key = (kind, target_id)
+        with self._cond:
+            existing = self._pending.get(key)
+            if existing is not None:
+                # Position und Einreihungszeit bleiben erhalten, nur der Zielzustand wird ergänzt.
+                existing.state = merge_states(existing.state, state)
+                existing.attempts = 0
+                self._coalesced += 1
+            else:
+                self._pending[key] = _Command(kind, target_id, state)
+            self._cond.notify_all()
+
+    def has_pending(self, kind: str, target_id: str) -> bool:
+        with self._cond:
+            return (kind, target_id) in self._pending
+
+    def queue_depth(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def get_stats(self) -> Dict:
+        """Kennzahlen zur Auslastung der Warteschlange."""
+        with self._cond:
+            waits = sorted(self._wait_times)
+            depth = {"light": 0, "group": 0}
+            for kind, _ in self._pending:
+                depth[kind] += 1
+            oldest = min((c.enqueued_at for c in self._pending.values()), default=None)
+        return {
+            "queue_depth": depth["light"] + depth["group"],
+            "light_queue_depth": depth["light"],
+            "group_queue_depth": depth["group"],
+            "oldest_pending_ms": round((time.monotonic() - oldest) * 1000, 1) if oldest else 0.0,
+            "wait_ms_avg": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+            "wait_ms_max": round(waits[-1] * 1000, 1) if waits else 0.0,
+            "wait_ms_p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1) if waits else 0.0,
+            "sent": self._sent,
+            "coalesced": self._coalesced,
+            "failed": self._failed,
+        }
+
+    def _next_ready(self, now: float) -> Tuple[Optional[_Command], Optional[float]]:
+        """Liefert den ältesten sendebereiten Befehl oder die Wartezeit bis zum nächsten."""
+        wait = None
+        for key, command in self._pending.items():
+            slot = self._next_slot[command.kind]
+            if slot <= now:
+                del self._pending[key]
+                self._next_slot[command.kind] = max(slot, now) + self._intervals[command.kind]
+                return command, None
+            wait = slot - now if wait is None else min(wait, slot - now)
+        return None, wait
+
+    def _run(self):
+        while True:
+            with self._cond:
+                command = None
+                while command is None:
+                    if self._stopping:
+                        return
+                    command, wait = self._next_ready(time.monotonic())
+                    if command is None:
+                        self._cond.wait(wait)
+
+            ok = False
+            try:
+                ok = self._send(command.kind, command.target_id, command.state)
+            except Exception as e:
+                self.logger.error(f"Fehler beim Senden an {command.kind} {command.target_id}: {e}", exc_info=True)
+
+            with self._cond:
+                if ok is not False:
+                    self._sent += 1
+                    self._wait_times.append(time.monotonic() - command.enqueued_at)
+                else:
+                    self._requeue(command)
+                self._cond.notify_all()
+
+    def _requeue(self, command: _Command):
+        key = (command.kind, command.target_id)
+        command.attempts += 1
+        pending = self._pending.get(key)
+        if pending is not None:
+            # Ein neuerer Zustand wartet bereits; nicht überschriebene Felder des fehlgeschlagenen bleiben erhalten.
+            pending.state = merge_states(command.state, pending.state)
+            return
+        if command.attempts >= self.MAX_ATTEMPTS:
+            self._failed += 1
+            self.logger.error(
+                f"Befehl für {command.kind} {command.target_id} nach {command.attempts} Versuchen verworfen."
+            )
+            return
+        self._pending[key] = command
+        self._next_slot[command.kind] = max(self._next_slot[command.kind], time.monotonic() + self.RETRY_DELAY_S)
@@ -2,10 +2,17 @@
 Verwaltet das Laden und Speichern der zentralen YAML-Konfigurationsdateien.
 """
 
+import copy
 import os
 import threading
 import yaml
 from .logger import AppLogger
+from .config_watcher import ConfigWatcher
+
+# Die C-Implementierung von libyaml ist um ein Vielfaches schneller; ohne sie
+# wird auf die reinen Python-Klassen zurückgegriffen.
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
 
 class ConfigManager:
@@ -19,8 +26,15 @@ class ConfigManager:
         self.automation_file = os.path.join(self.data_dir, "automation.yaml")
         self.home_file = os.path.join(self.data_dir, "home.yaml")
         self._lock = threading.Lock()
+        self._watcher = None
+        # Pro Datei: ((mtime_ns, Größe, Inode), geparster Inhalt)
+        self._parsed_cache = {}
         self._ensure_config_files()
 
+    @property
+    def config_files(self) -> list:
+        return [self.settings_file, self.automation_file, self.home_file]
+
     def _ensure_config_files(self):
         """Stellt sicher, dass die Konfigurationsdateien existieren."""
         for file_path in [self.settings_file, self.automation_file, self.home_file]:
@@ -37,9 +51,11 @@ class ConfigManager:
             with self._lock:
                 with open(temp_file, "w", encoding="utf-8") as f:
                     yaml.dump(
-                        data, f, indent=2, allow_unicode=True, default_flow_style=False
+                        data, f, Dumper=YamlDumper, indent=2, allow_unicode=True, default_flow_style=False
                     )
                 os.replace(temp_file, file_path)
+                # Der geschriebene Inhalt ist bekannt und muss nicht neu geparst werden.
+                self._parsed_cache[file_path] = (self._file_key(file_path), copy.deepcopy(data))
             return True
         except (IOError, yaml.YAMLError) as e:
             self.logger.error(f"Fehler beim Schreiben der Konfiguration: {e}")
@@ -48,28 +64,55 @@ class ConfigManager:
             return False
 
     def get_full_config(self) -> dict:
-        """Lädt die gesamte Konfiguration aus den YAML-Dateien und führt sie zusammen."""
+        """
+        Lädt die gesamte Konfiguration aus den YAML-Dateien und führt sie zusammen.
+        Unveränderte Dateien werden aus dem Cache bedient; Aufrufer erhalten
+        immer eine eigene Kopie und können sie gefahrlos verändern.
+        """
         config = {}
         for file_path in [self.settings_file, self.automation_file, self.home_file]:
             try:
-                with self._lock:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        content = yaml.safe_load(f)
-                        if content:
-                            config.update(content)
+                content = self._load_file(file_path)
+                if content:
+                    config.update(content)
             except (FileNotFoundError, yaml.YAMLError) as e:
                 self.logger.error(
                     f"Konfiguration konnte nicht geladen werden: {e}. Erstelle eine leere Konfiguration."
                 )
                 self._ensure_config_files()
-        return config
+        return copy.deepcopy(config)
 
-    def get_last_modified_time(self) -> float:
-        """Gibt den Zeitstempel der letzten Änderung der Konfigurationsdateien zurück."""
-        latest_time = 0
-        for file_path in [self.settings_file, self.automation_file, self.home_file]:
-            try:
-                latest_time = max(latest_time, os.path.getmtime(file_path))
-            except FileNotFoundError:
-                pass
-        return latest_time
\ No newline at end of file
+    @staticmethod
+    def _file_key(file_path: str) -> tuple:
+        st = os.stat(file_path)
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _load_file(self, file_path: str):
+        """Geparster Inhalt einer Datei; neu geparst wird nur, wenn sich (mtime, Größe, Inode) ändern."""
+        with self._lock:
+            key = self._file_key(file_path)
+            cached = self._parsed_cache.get(file_path)
+            if cached and cached[0] == key:
+                return cached[1]
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = yaml.load(f, Loader=YamlLoader)
+            self._parsed_cache[file_path] = (key, content)
+            return content
+
+    def start_watching(self, on_change, debounce_s: float = 0.5, poll_interval_s: float = 2.0):
+        """
+        Meldet Änderungen an den Konfigurationsdateien gebündelt an
+        on_change(geänderte_Dateien), ohne dass Aufrufer selbst stat() ausführen müssen.
+        """
+        self.stop_watching()
+        self._watcher = ConfigWatcher(
+            self.config_files, on_change, logger=self.logger,
+            debounce_s=debounce_s, poll_interval_s=poll_interval_s,
+        )
+        self._watcher.start()
+        self.logger.info(f"Konfigurationsdateien werden überwacht ({self._watcher.mode}).")
+
+    def stop_watching(self):
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
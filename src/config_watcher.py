@@ -0,0 +1,165 @@
+"""
+Beobachtet die Konfigurationsdateien und meldet Änderungen gebündelt.
+Unter Linux wird inotify über ctypes genutzt, sonst werden die Dateien in
+festen Abständen per stat() verglichen.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+import logging
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _open_inotify(directories: Iterable[str]) -> Optional[int]:
+    """Öffnet einen inotify-Deskriptor für die Verzeichnisse oder None, falls nicht verfügbar."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        init, add_watch = libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    fd = init(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        return None
+    for directory in directories:
+        if add_watch(fd, os.fsencode(directory), WATCH_MASK) < 0:
+            os.close(fd)
+            return None
+    return fd
+
+
+class ConfigWatcher:
+    """
+    Ruft on_change(geänderte_Dateien) auf, sobald nach der letzten Änderung
+    debounce_s lang Ruhe herrscht. Mehrere Schreibvorgänge kurz hintereinander
+    (z.B. die drei Dateien beim Speichern aus der Oberfläche) ergeben so eine
+    einzige Meldung; spätestens nach max_delay_s wird trotzdem gemeldet.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[str],
+        on_change: Callable[[Set[str]], None],
+        logger: Optional[logging.Logger] = None,
+        debounce_s: float = 0.5,
+        max_delay_s: float = 3.0,
+        poll_interval_s: float = 2.0,
+        use_inotify: bool = True,
+    ):
+        self.paths = {os.path.abspath(p) for p in paths}
+        self.on_change = on_change
+        self.logger = logger or logging.getLogger(__name__)
+        self.debounce_s = debounce_s
+        self.max_delay_s = max_delay_s
+        self.poll_interval_s = poll_interval_s
+        self.use_inotify = use_inotify
+        self.mode: Optional[str] = None
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pending: Set[str] = set()
+        self._first_change = 0.0
+        self._last_change = 0.0
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        fd = _open_inotify({os.path.dirname(p) for p in self.paths}) if self.use_inotify else None
+        self.mode = "inotify" if fd is not None else "polling"
+        # Ausgangsstand vor dem Thread-Start erfassen, sonst gehen Änderungen
+        # direkt nach start() im Polling-Modus verloren.
+        signatures = self._signatures()
+        self._thread = threading.Thread(target=self._run, args=(fd, signatures), name="config-watcher", daemon=True)
+        self._thread.start()
+        self.logger.debug(f"Konfigurationsüberwachung gestartet ({self.mode}).")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def _run(self, fd: Optional[int], signatures: Dict[str, Optional[Tuple[int, int, int]]]):
+        try:
+            while not self._stop_event.is_set():
+                timeout = self._flush_timeout()
+                if fd is not None:
+                    readable, _, _ = select.select([fd], [], [], min(timeout, 1.0))
+                    if readable:
+                        self._read_inotify(fd)
+                else:
+                    self._stop_event.wait(min(timeout, self.poll_interval_s))
+                    current = self._signatures()
+                    changed = {p for p in self.paths if current.get(p) != signatures.get(p)}
+                    signatures = current
+                    if changed:
+                        self._mark(changed)
+                self._flush_if_quiet()
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+    def _read_inotify(self, fd: int):
+        try:
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        changed, offset = set(), 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + _EVENT_HEADER.size: offset + _EVENT_HEADER.size + name_len].rstrip(b"\0")
+            offset += _EVENT_HEADER.size + name_len
+            if mask & IN_Q_OVERFLOW:
+                changed.update(self.paths)
+                continue
+            for path in self.paths:
+                if os.path.basename(path) == os.fsdecode(name):
+                    changed.add(path)
+        if changed:
+            self._mark(changed)
+
+    def _signatures(self) -> Dict[str, Optional[Tuple[int, int, int]]]:
+        signatures = {}
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+                signatures[path] = (st.st_mtime_ns, st.st_size, st.st_ino)
+            except FileNotFoundError:
+                signatures[path] = None
+        return signatures
+
+    def _mark(self, changed: Set[str]):
+        now = time.monotonic()
+        if not self._pending:
+            self._first_change = now
+        self._pending.update(changed)
+        self._last_change = now
+
+    def _flush_timeout(self) -> float:
+        if not self._pending:
+            return self.poll_interval_s
+        now = time.monotonic()
+        due = min(self._last_change + self.debounce_s, self._first_change + self.max_delay_s)
+        return max(0.0, due - now)
+
+    def _flush_if_quiet(self):
+        if not self._pending or self._flush_timeout() > 0:
+            return
+        changed, self._pending = self._pending, set()
+        try:
+            self.on_change(changed)
+        except Exception as e:
+            self.logger.error(f"Fehler bei der Verarbeitung einer Konfigurationsänderung: {e}", exc_info=True)
@@ -0,0 +1,190 @@
+"""
+Überwacht die Erreichbarkeit der Hue Bridge mit einem Circuit Breaker.
+Nach wiederholten Netzwerkfehlern schlagen Aufrufe sofort fehl, während ein
+Hintergrund-Thread die Verbindung mit exponentiellem Backoff neu aufbaut.
+"""
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+import logging
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class BridgeUnavailableError(ConnectionError):
+    """Wird geworfen, solange der Circuit Breaker offen ist."""
+
+
+class ConnectionHealth:
+    """
+    Zustände: 'closed' (Bridge erreichbar), 'open' (Aufrufe schlagen sofort fehl,
+    Wiederverbindung läuft im Hintergrund) und 'half_open' (Testverbindung läuft).
+    Die Wartezeit zwischen Versuchen wächst exponentiell bis max_delay_s und wird
+    zufällig gestreut (Full Jitter), damit mehrere Prozesse nicht gleichzeitig anfragen.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[], None],
+        logger: Optional[logging.Logger] = None,
+        failure_threshold: int = 3,
+        base_delay_s: float = 1.0,
+        max_delay_s: float = 300.0,
+        history_size: int = 50,
+    ):
+        self._probe = probe
+        self.logger = logger or logging.getLogger(__name__)
+        self.failure_threshold = failure_threshold
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._available = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.state = OPEN
+        self.consecutive_failures = 0
+        self.reconnect_attempts = 0
+        self.last_error: Optional[str] = None
+        self.last_success: Optional[str] = None
+        self._next_attempt = 0.0
+        # Absoluter Zeitpunkt für die Anzeige; ein Countdown würde sich bei jeder Abfrage ändern.
+        self.next_attempt_at: Optional[str] = None
+        self.transitions = deque(maxlen=history_size)
+
+    # --- Abfragen ---
+
+    def is_available(self) -> bool:
+        return self.state == CLOSED
+
+    def wait_until_available(self, timeout: Optional[float] = None) -> bool:
+        return self._available.wait(timeout)
+
+    def snapshot(self) -> Dict:
+        """Aktueller Zustand und die letzten Zustandswechsel für die API."""
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "reconnect_attempts": self.reconnect_attempts,
+                "next_attempt_at": self.next_attempt_at if self.state == OPEN else None,
+                "last_error": self.last_error,
+                "last_success": self.last_success,
+                "transitions": list(self.transitions),
+            }
+
+    # --- Rückmeldungen der Aufrufer ---
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self.last_success = datetime.now().isoformat(timespec="seconds")
+            if self.state != CLOSED:
+                self._transition(CLOSED, "Anfrage erfolgreich")
+
+    def record_failure(self, error: Exception):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_error = str(error)
+            if self.state == CLOSED and self.consecutive_failures >= self.failure_threshold:
+                self._open(f"{self.consecutive_failures} Fehler in Folge: {error}")
+
+    # --- Verbindungsaufbau ---
+
+    def connect_now(self) -> bool:
+        """Führt sofort einen Verbindungstest aus (blockierend)."""
+        return self._attempt()
+
+    def connect_in_background(self):
+        """Plant einen sofortigen Verbindungsversuch im Hintergrund ein."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state != OPEN:
+                self._transition(OPEN, "Verbindungsaufbau angefordert")
+            self._schedule_attempt(0.0)
+            self._ensure_thread()
+        self._wakeup.set()
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def _attempt(self) -> bool:
+        with self._lock:
+            self.reconnect_attempts += 1
+            self._transition(HALF_OPEN, "Verbindungstest")
+        try:
+            self._probe()
+        except Exception as e:
+            with self._lock:
+                self.consecutive_failures += 1
+                self.last_error = str(e)
+                self._open(f"Verbindungstest fehlgeschlagen: {e}")
+            return False
+        with self._lock:
+            self.consecutive_failures = 0
+            self.reconnect_attempts = 0
+            self.last_success = datetime.now().isoformat(timespec="seconds")
+            self._transition(CLOSED, "Verbindungstest erfolgreich")
+        return True
+
+    def _open(self, reason: str):
+        """Öffnet den Breaker und plant den nächsten Versuch (Lock muss gehalten werden)."""
+        delay = min(self.max_delay_s, self.base_delay_s * (2 ** min(self.reconnect_attempts, 16)))
+        delay = random.uniform(self.base_delay_s, max(self.base_delay_s, delay))
+        self._schedule_attempt(delay)
+        self._transition(OPEN, f"{reason} (nächster Versuch in {delay:.1f}s)")
+        self._ensure_thread()
+        self._wakeup.set()
+
+    def _schedule_attempt(self, delay: float):
+        self._next_attempt = time.monotonic() + delay
+        self.next_attempt_at = (datetime.now() + timedelta(seconds=delay)).isoformat(timespec="seconds")
+
+    def _transition(self, new_state: str, reason: str):
+        old_state = self.state
+        self.state = new_state
+        if new_state == CLOSED:
+            self._available.set()
+        else:
+            self._available.clear()
+        if old_state == new_state and new_state != OPEN:
+            return
+        self.transitions.append({
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "from": old_state, "to": new_state, "reason": reason,
+        })
+        if new_state == OPEN:
+            self.logger.warning(f"Bridge nicht erreichbar: {reason}")
+        elif new_state == CLOSED and old_state != CLOSED:
+            self.logger.info(f"Bridge wieder erreichbar ({reason}).")
+
+    def _ensure_thread(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._reconnect_loop, name="hue-reconnect", daemon=True)
+        self._thread.start()
+
+    def _reconnect_loop(self):
+        while not self._stopped.is_set():
+            with self._lock:
+                if self.state == CLOSED:
+                    return
+                wait = self._next_attempt - time.monotonic()
+            if wait > 0:
+                self._wakeup.wait(wait)
+                self._wakeup.clear()
+                continue
+            self._attempt()
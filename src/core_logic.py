@@ -2,12 +2,14 @@
 Kapselt die gesamte Kernlogik der Hue-Steuerung, inklusive der Hauptschleife.
 """
 import os
+import io
 import json
 import time
+import cProfile
+import pstats
 import sqlite3
-from datetime import datetime, date
-from astral import LocationInfo
-from astral.sun import sun
+import threading
+from datetime import datetime, date, timedelta
 
 from src.hue_wrapper import HueBridge
 from src.scene import Scene
@@ -18,49 +20,126 @@ from src.timer import Timer
 from src.state_machine import StateMachine
 from src.logger import AppLogger
 from src.config_manager import ConfigManager
+from src.config_watcher import ConfigWatcher
+from src.automation_scheduler import AutomationScheduler
+from src.automation_runner import AutomationRunner
+from src.metrics import MetricsRegistry
+from src.sun_table import SunTable, DailySunTimes
+from src.status_channel import StatusPublisher
+from src.bridge_gateway import BridgeGateway
+from src.telemetry import TelemetryRecorder, SensorSampler, connect as connect_database, init_schema
+from src.runtime_cache import RuntimeCache, get_automation_id, config_fingerprint
 
 BASE_DIR = os.path.dirname(os.path.abspath(os.path.join(__file__, "..")))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 DB_FILE = os.path.join(BASE_DIR, "sensor_data.db")
-STATUS_FILE = os.path.join(DATA_DIR, "status.json")
+STATUS_SOCKET = os.path.join(DATA_DIR, "status.sock")
+BRIDGE_SOCKET = os.path.join(DATA_DIR, "bridge.sock")
+RUNTIME_CACHE_FILE = os.path.join(DATA_DIR, "runtime_cache.json")
+METRICS_FILE = os.path.join(DATA_DIR, "metrics.json")
+PROFILE_REQUEST_FILE = os.path.join(DATA_DIR, "profile.request")
+PROFILE_FILE = os.path.join(DATA_DIR, "profile.txt")
+SUN_TABLE_FILE = os.path.join(DATA_DIR, "sun_table.json")
+HOUSEKEEPING = object()
+# Änderungen an diesen Einstellungen erfordern einen vollständigen Neuaufbau der Sitzung.
+SESSION_CONFIG_KEYS = ("bridge_ip", "app_key", "location", "global_settings")
 
 class CoreLogic:
     def __init__(self, log: AppLogger, config_manager: ConfigManager):
         self.log = log
         self.config_manager = config_manager
+        self.runtime_cache = RuntimeCache(RUNTIME_CACHE_FILE, log)
+        if self.runtime_cache.load():
+            self.log.info("Laufzeit-Cache geladen (Warmstart).")
+        self._topology_changed = threading.Event()
+        self._config_lock = threading.Lock()
+        self._config_changed = threading.Event()
+        self._changed_config_files = set()
+        self._session_scheduler = None
+        self.metrics = MetricsRegistry()
+        self.status_publisher = StatusPublisher(STATUS_SOCKET, log)
+        # Der Webserver nutzt die Bridge dieses Prozesses über den Socket mit.
+        self.bridge_gateway = BridgeGateway(BRIDGE_SOCKET, log, self.metrics)
+        self.telemetry = TelemetryRecorder(DB_FILE, log)
+        self._profiler = None
+        self._profile_ticks_left = 0
+        # Die Weboberfläche fordert Profiling über PROFILE_REQUEST_FILE an; gemeldet
+        # wird das vom Watcher statt durch stat() in jedem Verwaltungsdurchlauf.
+        self._profile_requested = threading.Event()
+        self._profile_watcher = ConfigWatcher([PROFILE_REQUEST_FILE], self._on_profile_request_changed, logger=log)
+        self._metrics_written_at = float("-inf")
+        self._last_written_metrics = None
+        self._stats_extras = {}
+        self._stats_published_at = float("-inf")
         self._init_database()
 
     def _init_database(self):
         try:
-            with sqlite3.connect(DB_FILE) as con:
-                cur = con.cursor()
-                cur.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS measurements (
-                        timestamp TEXT NOT NULL, sensor_id TEXT NOT NULL,
-                        measurement_type TEXT NOT NULL, value REAL NOT NULL,
-                        PRIMARY KEY (timestamp, sensor_id, measurement_type)
-                    )
-                    """
-                )
+            con = connect_database(DB_FILE)
+            try:
+                init_schema(con, self.log)
+            finally:
+                con.close()
             self.log.info("Datenbank initialisiert.")
         except sqlite3.Error as e:
             self.log.error(f"Datenbankfehler bei Initialisierung: {e}", exc_info=True)
 
     def run_main_loop(self):
-        while True:
-            config = self.config_manager.get_full_config()
-            if not config or not config.get("bridge_ip"):
-                self.log.warning("Konfiguration unvollständig. Warte 15s.")
-                time.sleep(15)
-                continue
+        bridge = None
+        self.config_manager.start_watching(self._on_config_files_changed)
+        self._profile_watcher.start()
+        if os.path.exists(PROFILE_REQUEST_FILE):
+            # Anforderung, die vor dem Start der Kernlogik gestellt wurde.
+            self._profile_requested.set()
+        self.status_publisher.start()
+        self.bridge_gateway.start()
+        self.telemetry.start()
+        try:
+            while True:
+                self._take_config_changes()
+                config = self.config_manager.get_full_config()
+                if not config or not config.get("bridge_ip"):
+                    self.log.warning("Konfiguration unvollständig. Warte auf Änderung (max. 15s).")
+                    self._config_changed.wait(15)
+                    continue
 
-            bridge = self._connect_to_bridge(config)
-            if not bridge:
-                time.sleep(30)
-                continue
+                if bridge is None or (bridge.ip, bridge.app_key) != (config.get("bridge_ip"), config.get("app_key")):
+                    if bridge:
+                        self.bridge_gateway.set_bridge(None)
+                        bridge.close()
+                    bridge = self._connect_to_bridge(config)
+                    if not bridge:
+                        time.sleep(15)
+                        continue
+                    self.bridge_gateway.set_bridge(bridge)
+
+                if not bridge.is_connected():
+                    # Die Wiederverbindung läuft mit Backoff im Hintergrund; hier nur auf das Ergebnis warten.
+                    bridge.health.wait_until_available(timeout=15)
+                    continue
 
-            self._execute_automation_session(bridge)
+                global_settings = config.get("global_settings", {})
+                if global_settings.get("event_stream", True):
+                    # Mit gültigem Cache startet die Session sofort; der Spiegel synchronisiert im Hintergrund.
+                    warm_start = self.runtime_cache.get_bridge_data(bridge.ip) is not None
+                    bridge.start_event_stream(
+                        resync_interval_s=global_settings.get("resync_interval_s", 300),
+                        blocking=not warm_start,
+                    )
+                bridge.start_command_scheduler(
+                    light_rate=global_settings.get("light_commands_per_s", 10.0),
+                    group_rate=global_settings.get("group_commands_per_s", 1.0),
+                )
+                self._execute_automation_session(bridge)
+        finally:
+            # Gepufferte Messwerte schreiben, auch bei SIGTERM oder Strg+C.
+            self.bridge_gateway.set_bridge(None)
+            self.bridge_gateway.stop()
+            if bridge:
+                bridge.close()
+            self._profile_watcher.stop()
+            self.status_publisher.stop()
+            self.telemetry.stop()
 
     def _connect_to_bridge(self, config: dict) -> HueBridge | None:
         bridge_ip = config.get("bridge_ip")
@@ -68,12 +147,15 @@ class CoreLogic:
         if not bridge_ip or not app_key:
             return None
         
-        bridge = HueBridge(ip=bridge_ip, app_key=app_key, logger=self.log)
-        if bridge.is_connected():
-            return bridge
-        else:
-            self.log.error("Netzwerkfehler zur Bridge: Verbindung konnte nicht hergestellt werden.")
-            return None
+        global_settings = config.get("global_settings", {})
+        bridge = HueBridge(
+            ip=bridge_ip, app_key=app_key, logger=self.log,
+            pool_size=global_settings.get("bridge_pool_size", 4),
+            timeout_s=global_settings.get("bridge_timeout_s", 5.0),
+        )
+        if not bridge.is_connected():
+            self.log.error("Netzwerkfehler zur Bridge: Verbindung wird im Hintergrund erneut versucht.")
+        return bridge
 
     def _execute_automation_session(self, bridge: HueBridge):
         config = self.config_manager.get_full_config()
@@ -81,88 +163,432 @@ class CoreLogic:
         sun_times = self._get_sun_times(config.get("location"))
         scenes = {name: Scene(**params) for name, params in config.get("scenes", {}).items()}
         
-        bridge_data = bridge.get_full_api_data()
-        
-        all_rooms_and_zones = bridge_data.get("rooms", []) + bridge_data.get("zones", [])
+        bridge_data = self._load_bridge_data(bridge)
 
-        rooms = {}
-        for group in all_rooms_and_zones:
-            if 'metadata' in group and 'name' in group['metadata']:
-                rooms[group['metadata']['name']] = Room(bridge, self.log, name=group['metadata']['name'], group_id=group["id"])
+        rooms = {
+            name: Room(bridge, self.log, name=name, group_id=group_id)
+            for name, group_id in bridge.topology.group_names().items()
+        }
 
         sensors = {s['id']: Sensor(bridge, s['id'], self.log) for s in bridge_data.get("devices", []) if s.get('product_data', {}).get('product_name') == 'Hue motion sensor'}
-        
-        automations = []
-        automation_configs = config.get("automations", [])
-
-        for aut_conf in automation_configs:
-            aut_type = aut_conf.get("type", "routine")
-            name = aut_conf.get("name")
-            room_name = aut_conf.get("room_name") if aut_type == "routine" else aut_conf.get("target_room")
-            room = rooms.get(room_name)
-            
-            sensor = None
-            if 'sensor_id' in aut_conf and aut_conf['sensor_id']:
-                sensor = sensors.get(aut_conf['sensor_id'])
-            
-            common_args = {
-                "name": name, "config": aut_conf, "log": self.log,
-                "bridge": bridge, "scenes": scenes, "rooms": rooms,
-                "sensors": sensors, "sun_times": sun_times,
-                "global_settings": global_settings
-            }
 
-            if aut_type == "routine":
-                if room:
-                    automations.append(Routine(room=room, sensor=sensor, **common_args))
-            elif aut_type == "timer":
-                 automations.append(Timer(**common_args))
-            elif aut_type == "state_machine":
-                 automations.append(StateMachine(**common_args))
+        session_args = {
+            "log": self.log, "bridge": bridge, "scenes": scenes, "rooms": rooms,
+            "sensors": sensors, "sun_times": sun_times, "global_settings": global_settings,
+        }
+        automations = {}
+        for key, aut_conf in self._keyed_automation_configs(config):
+            automation = self._build_automation(key, aut_conf, session_args)
+            if automation:
+                automations[key] = automation
 
-        last_mod_time = self.config_manager.get_last_modified_time()
-        last_status_write = 0
+        restored = 0
+        for automation in automations.values():
+            cached_state = self.runtime_cache.get_automation_state(automation.automation_id, automation.config_fingerprint)
+            if cached_state:
+                automation.restore_state(cached_state)
+                restored += 1
+        if restored:
+            self.log.info(f"Laufzeitzustand von {restored} Automationen aus dem Cache übernommen.")
 
-        self.log.info(f"{len(automations)} Automationen werden jetzt ausgeführt...")
-        while True:
-            try:
-                if self.config_manager.get_last_modified_time() > last_mod_time:
-                    self.log.info("Änderung in der Konfiguration erkannt. Lade Logik neu.")
-                    return
+        cache_interval = global_settings.get("runtime_cache_interval_s", 30)
+        status_interval = global_settings.get("status_interval_s", 5)
+        metrics_interval = global_settings.get("metrics_interval_s", 60)
+        stats_interval = global_settings.get("status_stats_interval_s", 30)
+        self._stats_published_at = float("-inf")
+        # Messreihen von Automationen, die es in dieser Sitzung nicht mehr gibt, verwerfen.
+        self.metrics.retain("automation", automations)
+
+        # Jede Automation wird einmal sofort ausgeführt und meldet danach ihre nächste Frist.
+        scheduler = AutomationScheduler()
+        self._session_scheduler = scheduler
+        runner = None
+        if global_settings.get("execution_mode", "parallel") == "parallel":
+            runner = AutomationRunner(
+                scheduler, self.metrics, self.log,
+                max_workers=global_settings.get("automation_workers", 4),
+                budget_s=global_settings.get("automation_budget_s", 2.0),
+            )
+        watchers = {}
+
+        def activate(key, automation):
+            scheduler.schedule(key, datetime.now().astimezone())
+            for resource_id in automation.watched_resources():
+                watchers.setdefault(resource_id, set()).add(key)
+
+        def deactivate(key):
+            scheduler.schedule(key, None)
+            self.metrics.remove("automation", key)
+            for keys in watchers.values():
+                keys.discard(key)
+
+        for key, automation in automations.items():
+            activate(key, automation)
+        scheduler.schedule(HOUSEKEEPING, datetime.now().astimezone())
 
+        def on_bridge_change(resource_type, resource, deleted):
+            for key in tuple(watchers.get(resource.get("id"), ())):
+                scheduler.wake(key)
+
+        bridge.add_change_listener(on_bridge_change)
+        live_events = bridge.has_live_events()
+
+        self.telemetry.set_retention({
+            "measurements": global_settings.get("telemetry_retention_days", 30),
+            "measurements_5min": global_settings.get("telemetry_5min_retention_days", 180),
+            "measurements_hourly": global_settings.get("telemetry_hourly_retention_days", 730),
+        })
+        sampler = None
+        telemetry_interval = global_settings.get("telemetry_interval_s", 60)
+        if telemetry_interval and sensors:
+            sampler = SensorSampler(sensors, self.telemetry, interval_s=telemetry_interval, logger=self.log)
+            sampler.start()
+
+        self.log.info(f"{len(automations)} Automationen werden jetzt ausgeführt...")
+        try:
+            while True:
+                due = scheduler.wait_for_due()
                 now = datetime.now().astimezone()
-                for automation in automations:
-                    automation.run(now)
 
-                if time.time() - last_status_write > global_settings.get("status_interval_s", 5):
-                    self._write_status(automations, sun_times)
-                    last_status_write = time.time()
+                if self._config_changed.is_set():
+                    changed_files = self._take_config_changes()
+                    self.log.info(f"Änderung in der Konfiguration erkannt: {', '.join(sorted(changed_files))}.")
+                    new_config = self.config_manager.get_full_config()
+                    if not self._reload_config(config, new_config, automations, session_args, activate, deactivate):
+                        self.log.info("Änderung der Sitzungseinstellungen erkannt. Lade Logik neu.")
+                        self.runtime_cache.save(automations.values(), force=True)
+                        return
+                    config = new_config
+
+                if HOUSEKEEPING in due:
+                    due.discard(HOUSEKEEPING)
+                    if self._topology_changed.is_set():
+                        self.log.info("Bridge-Struktur weicht vom Cache ab. Lade Logik neu.")
+                        self.runtime_cache.save(automations.values(), force=True)
+                        return
+
+                    # Wechselt der Eventstream, müssen beobachtende Automationen ihre Fristen neu berechnen.
+                    if bridge.has_live_events() != live_events:
+                        live_events = not live_events
+                        due.update(key for keys in watchers.values() for key in keys)
 
-                time.sleep(global_settings.get("loop_interval_s", 1))
+                    self._publish_status(automations, sun_times, bridge, stats_interval_s=stats_interval)
+                    self._check_profile_request()
+                    self._write_metrics(bridge, min_interval_s=metrics_interval)
+                    self.runtime_cache.save(automations.values(), min_interval_s=cache_interval)
+                    scheduler.schedule(HOUSEKEEPING, now + timedelta(seconds=status_interval))
 
-            except Exception as e:
-                self.log.error(f"Unerwarteter Fehler in der Hauptschleife: {e}. Starte Logik neu...", exc_info=True)
-                time.sleep(5)
+                due_automations = [(key, automation) for key, automation in automations.items() if key in due]
+                if due_automations:
+                    self._run_tick(due_automations, now, scheduler, runner)
+                    # Zustandswechsel sofort melden; publish() sendet nur tatsächliche Änderungen.
+                    self._publish_status(automations, sun_times, bridge, stats_interval_s=stats_interval)
+
+        except Exception as e:
+            self.log.error(f"Unerwarteter Fehler in der Hauptschleife: {e}. Starte Logik neu...", exc_info=True)
+            time.sleep(5)
+            return
+        finally:
+            self._session_scheduler = None
+            if sampler:
+                sampler.stop()
+            if runner:
+                runner.shutdown()
+            bridge.remove_change_listener(on_bridge_change)
+
+    def _run_tick(self, due_automations: list, now: datetime, scheduler: AutomationScheduler,
+                  runner: AutomationRunner | None = None):
+        """
+        Führt die fälligen Automationen aus und misst jede einzelne sowie den ganzen
+        Durchlauf. Während einer Profiling-Aufnahme wird seriell ausgeführt, da
+        cProfile nur den aufrufenden Thread erfasst.
+        """
+        tick_start = time.perf_counter()
+        profiler = self._profiler
+        if profiler:
+            profiler.enable()
+        try:
+            if runner and not profiler:
+                runner.run(due_automations, now)
                 return
+            for key, automation in due_automations:
+                with self.metrics.measure("automation", key, label=automation.name):
+                    automation.run(now)
+                scheduler.schedule(key, automation.next_deadline(now))
+        finally:
+            if profiler:
+                profiler.disable()
+                self._profile_ticks_left -= 1
+                if self._profile_ticks_left <= 0:
+                    self._finish_profile()
+            self.metrics.record("loop", "tick", (time.perf_counter() - tick_start) * 1000)
+
+    def _on_profile_request_changed(self, changed_files: set):
+        """Wird vom Watcher für PROFILE_REQUEST_FILE aufgerufen (eigener Thread)."""
+        self._profile_requested.set()
+
+    def _check_profile_request(self):
+        """Startet eine cProfile-Aufnahme, wenn die Weboberfläche sie über PROFILE_REQUEST_FILE anfordert."""
+        if self._profiler or not self._profile_requested.is_set():
+            return
+        self._profile_requested.clear()
+        try:
+            with open(PROFILE_REQUEST_FILE, "r", encoding="utf-8") as f:
+                ticks = int(json.load(f).get("ticks", 50))
+        except FileNotFoundError:
+            # Auch das Entfernen der Datei (hier unten) wird vom Watcher gemeldet.
+            return
+        except (IOError, ValueError, AttributeError):
+            ticks = 50
+        try:
+            os.remove(PROFILE_REQUEST_FILE)
+        except OSError:
+            pass
+        self._profile_ticks_left = max(1, min(ticks, 10000))
+        self._profiler = cProfile.Profile()
+        self._metrics_written_at = float("-inf")  # Profiling-Status sofort melden.
+        self.log.info(f"Profiling der nächsten {self._profile_ticks_left} Durchläufe gestartet.")
+
+    def _finish_profile(self):
+        profiler, self._profiler = self._profiler, None
+        self._metrics_written_at = float("-inf")
+        output = io.StringIO()
+        stats = pstats.Stats(profiler, stream=output)
+        stats.sort_stats("cumulative").print_stats(40)
+        try:
+            with open(PROFILE_FILE + ".tmp", "w", encoding="utf-8") as f:
+                f.write(f"Aufgenommen: {datetime.now().isoformat(timespec='seconds')}\n")
+                f.write(output.getvalue())
+            os.replace(PROFILE_FILE + ".tmp", PROFILE_FILE)
+            self.log.info("Profiling abgeschlossen.")
+        except IOError as e:
+            self.log.error(f"Fehler beim Schreiben des Profils: {e}")
+
+    def _write_metrics(self, bridge: HueBridge | None = None, min_interval_s: float = 0):
+        """
+        Schreibt die Metriken für die Weboberfläche, höchstens alle min_interval_s
+        und nur bei geänderten Werten (SD-Karten schonen).
+        """
+        if time.monotonic() - self._metrics_written_at < min_interval_s:
+            return
+        snapshot = self.metrics.snapshot()
+        metrics_data = {
+            "loop": snapshot.get("loop", {}).get("tick"),
+            "automations": snapshot.get("automation", {}),
+            "bridge": bridge.metrics.snapshot().get("bridge", {}) if bridge else {},
+            "gateway": snapshot.get("gateway", {}),
+            "profile": {"active": self._profiler is not None, "ticks_left": self._profile_ticks_left if self._profiler else 0},
+        }
+        serialized = json.dumps(metrics_data, sort_keys=True)
+        if serialized == self._last_written_metrics:
+            return
+        try:
+            with open(METRICS_FILE + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"updated_at": datetime.now().isoformat(timespec="seconds"), **metrics_data}, f, separators=(",", ":"))
+            os.replace(METRICS_FILE + ".tmp", METRICS_FILE)
+        except (IOError, TypeError) as e:
+            self.log.error(f"Fehler beim Schreiben der Metriken: {e}")
+            return
+        self._last_written_metrics = serialized
+        self._metrics_written_at = time.monotonic()
+
+    def _on_config_files_changed(self, changed_files: set):
+        """Wird vom Konfigurations-Watcher aufgerufen (eigener Thread)."""
+        with self._config_lock:
+            self._changed_config_files.update(os.path.basename(f) for f in changed_files)
+            self._config_changed.set()
+            scheduler = self._session_scheduler
+        if scheduler:
+            scheduler.wake()
+
+    def _take_config_changes(self) -> set:
+        with self._config_lock:
+            changed_files, self._changed_config_files = self._changed_config_files, set()
+            self._config_changed.clear()
+        return changed_files
+
+    @staticmethod
+    def _keyed_automation_configs(config: dict):
+        """Liefert (Schlüssel, Konfiguration) je Automation; doppelte IDs werden durchnummeriert."""
+        seen = {}
+        for aut_conf in config.get("automations") or []:
+            aut_id = get_automation_id(aut_conf)
+            seen[aut_id] = seen.get(aut_id, 0) + 1
+            yield (aut_id if seen[aut_id] == 1 else f"{aut_id}#{seen[aut_id]}"), aut_conf
+
+    def _build_automation(self, key: str, aut_conf: dict, session_args: dict):
+        aut_type = aut_conf.get("type", "routine")
+        room_name = aut_conf.get("room_name") if aut_type == "routine" else aut_conf.get("target_room")
+        room = session_args["rooms"].get(room_name)
+
+        sensor = None
+        if 'sensor_id' in aut_conf and aut_conf['sensor_id']:
+            sensor = session_args["sensors"].get(aut_conf['sensor_id'])
+
+        common_args = {"name": aut_conf.get("name"), "config": aut_conf, **session_args}
+
+        automation = None
+        if aut_type == "routine":
+            if room:
+                automation = Routine(room=room, sensor=sensor, **common_args)
+        elif aut_type == "timer":
+            automation = Timer(**common_args)
+        elif aut_type == "state_machine":
+            automation = StateMachine(**common_args)
+        if automation:
+            automation.automation_id = key
+        return automation
+
+    def _reload_config(self, old_config: dict, new_config: dict, automations: dict, session_args: dict,
+                       activate, deactivate) -> bool:
+        """
+        Übernimmt eine geänderte Konfiguration in die laufende Sitzung. Nur geänderte
+        Szenen und Automationen werden neu aufgebaut; unveränderte Automationen
+        behalten ihren Laufzeitzustand. Gibt False zurück, wenn sich Einstellungen
+        geändert haben, die einen vollständigen Neuaufbau erfordern.
+        """
+        if any(old_config.get(key) != new_config.get(key) for key in SESSION_CONFIG_KEYS):
+            return False
+
+        scenes = session_args["scenes"]
+        old_scenes, new_scenes = old_config.get("scenes") or {}, new_config.get("scenes") or {}
+        changed_scenes = [name for name, params in new_scenes.items() if old_scenes.get(name) != params]
+        removed_scenes = [name for name in old_scenes if name not in new_scenes]
+        for name in changed_scenes:
+            scenes[name] = Scene(**new_scenes[name])
+        for name in removed_scenes:
+            scenes.pop(name, None)
+
+        new_confs = dict(self._keyed_automation_configs(new_config))
+        removed = [key for key in automations if key not in new_confs]
+        for key in removed:
+            deactivate(key)
+            del automations[key]
+
+        added, changed = 0, 0
+        for key, aut_conf in new_confs.items():
+            current = automations.get(key)
+            if current is not None and current.config_fingerprint == config_fingerprint(aut_conf):
+                continue
+            if current is not None:
+                deactivate(key)
+                del automations[key]
+            automation = self._build_automation(key, aut_conf, session_args)
+            if automation is None:
+                continue
+            automations[key] = automation
+            activate(key, automation)
+            if current is not None:
+                changed += 1
+            else:
+                added += 1
+
+        # Reihenfolge der Konfiguration beibehalten.
+        ordered = {key: automations[key] for key in new_confs if key in automations}
+        automations.clear()
+        automations.update(ordered)
+
+        self.log.info(
+            f"Konfiguration neu geladen: {changed} Automationen geändert, {added} neu, {len(removed)} entfernt, "
+            f"{len(changed_scenes) + len(removed_scenes)} Szenen aktualisiert."
+        )
+        return True
+
+    def _load_bridge_data(self, bridge: HueBridge) -> dict:
+        """
+        Liefert die Bridge-Daten für den Aufbau der Session. Liegt ein Cache für
+        diese Bridge vor, wird er sofort verwendet und im Hintergrund gegen die
+        Bridge geprüft; weicht die Struktur ab, wird die Session neu aufgebaut.
+        """
+        self._topology_changed.clear()
+        cached_data = self.runtime_cache.get_bridge_data(bridge.ip)
+        if cached_data:
+            bridge.refresh_topology(cached_data)
+            threading.Thread(
+                target=self._revalidate_bridge_data, args=(bridge, cached_data),
+                name="bridge-cache-revalidate", daemon=True,
+            ).start()
+            return cached_data
+
+        bridge_data = bridge.get_full_api_data()
+        bridge.refresh_topology(bridge_data)
+        if bridge_data:
+            self.runtime_cache.set_bridge_data(bridge.ip, bridge_data)
+        return bridge_data
+
+    def _revalidate_bridge_data(self, bridge: HueBridge, cached_data: dict):
+        try:
+            bridge_data = bridge.get_full_api_data()
+        except Exception as e:
+            self.log.warning(f"Prüfung des Bridge-Caches fehlgeschlagen: {e}")
+            return
+        if not bridge_data:
+            return
+        bridge.refresh_topology(bridge_data)
+        self.runtime_cache.set_bridge_data(bridge.ip, bridge_data)
+        if self._topology_signature(bridge_data) != self._topology_signature(cached_data):
+            self._topology_changed.set()
+        else:
+            self.log.debug("Bridge-Cache ist aktuell.")
+
+    @staticmethod
+    def _topology_signature(api_data: dict) -> tuple:
+        """Was die Session aus den Bridge-Daten ableitet: Gruppen und Bewegungsmelder."""
+        groups = sorted(
+            (g.get("id"), g.get("metadata", {}).get("name"))
+            for g in api_data.get("rooms", []) + api_data.get("zones", [])
+        )
+        motion_sensors = sorted(
+            d.get("id") for d in api_data.get("devices", [])
+            if d.get("product_data", {}).get("product_name") == "Hue motion sensor"
+        )
+        return tuple(groups), tuple(motion_sensors)
 
     def _get_sun_times(self, location_config):
+        """
+        Sonnenzeiten des jeweils aktuellen Tages aus einer vorberechneten Jahrestabelle.
+        Das Ergebnis wechselt um Mitternacht selbst auf den neuen Tag.
+        """
         if not (location_config and location_config.get("latitude") and location_config.get("longitude")):
             return None
         try:
-            loc = LocationInfo("Home", "Germany", "Europe/Berlin", float(location_config["latitude"]), float(location_config["longitude"]))
-            sun_info = sun(loc.observer, date=date.today(), tzinfo=loc.timezone)
-            return {"sunrise": sun_info["sunrise"], "sunset": sun_info["sunset"]}
+            table = SunTable(
+                float(location_config["latitude"]), float(location_config["longitude"]),
+                timezone=location_config.get("timezone"), cache_file=SUN_TABLE_FILE, logger=self.log,
+            )
+            sun_times = DailySunTimes(table)
+            sun_times.for_date(date.today())
+            return sun_times
         except (ValueError, TypeError) as e:
             self.log.error(f"Fehler bei der Berechnung der Sonnenzeiten: {e}")
             return None
 
-    def _write_status(self, automations, sun_times):
-        status_data = {"automations": [aut.get_status() for aut in automations], "sun_times": {}}
+    def _publish_status(self, automations: dict, sun_times, bridge: HueBridge | None = None,
+                        stats_interval_s: float = 0):
+        """
+        Gibt den Status an den Webserver weiter; gesendet werden nur Änderungen.
+        Zähler (Warteschlange, Telemetrie, Verbindungsstatistik) ändern sich fast
+        ständig und werden daher höchstens alle stats_interval_s Sekunden
+        aktualisiert; ein Wechsel des Verbindungszustands wird sofort gemeldet.
+        """
+        now = time.monotonic()
+        health_state = bridge.health.state if bridge else None
+        published_state = (self._stats_extras.get("bridge_health") or {}).get("state")
+        if now - self._stats_published_at >= stats_interval_s or health_state != published_state:
+            stats = {}
+            command_stats = bridge.get_command_stats() if bridge else None
+            if command_stats:
+                stats["command_queue"] = command_stats
+            if bridge:
+                stats["bridge_health"] = bridge.health.snapshot()
+            stats["telemetry"] = self.telemetry.get_stats()
+            self._stats_extras = stats
+            self._stats_published_at = now
+        extras = {"sun_times": {}, **self._stats_extras}
         if sun_times:
-            status_data["sun_times"] = {"sunrise": sun_times["sunrise"].isoformat(), "sunset": sun_times["sunset"].isoformat()}
-        try:
-            with open(STATUS_FILE + ".tmp", "w", encoding="utf-8") as f:
-                json.dump(status_data, f, indent=2)
-            os.replace(STATUS_FILE + ".tmp", STATUS_FILE)
-        except (IOError, TypeError) as e:
-            self.log.error(f"Fehler beim Schreiben der Status-Datei: {e}")
\ No newline at end of file
+            extras["sun_times"] = {
+                event: sun_times[event].isoformat()
+                for event in ("sunrise", "sunset", "dawn", "dusk") if event in sun_times
+            }
+        statuses = {key: automation.get_status() for key, automation in automations.items()}
+        self.status_publisher.publish(statuses, extras)
\ No newline at end of file
@@ -1,5 +1,5 @@
 # src/daily_time_span.py
-from datetime import time, datetime
+from datetime import date, time, datetime, timedelta, timezone
 
 
 class DailyTimeSpan:
@@ -13,13 +13,20 @@ class DailyTimeSpan:
         self.evening_end = end_time
         self.log = log
 
+        self.sun_times = sun_times
+
         # Fallback-Zeiten, falls keine Sonnenzeiten verfügbar sind
         self.sunrise_t = time(6, 30)
         self.sunset_t = time(21, 0)
 
-        if sun_times and sun_times.get("sunrise") and sun_times.get("sunset"):
-            self.sunrise_t = sun_times["sunrise"].time()
-            self.sunset_t = sun_times["sunset"].time()
+    def _sun_window(self, day: date) -> tuple:
+        """Sonnenauf- und -untergang eines Tages; mit DailySunTimes immer die Werte dieses Tages."""
+        times = self.sun_times
+        if times is not None and hasattr(times, "for_date"):
+            times = times.for_date(day)
+        if times and times.get("sunrise") and times.get("sunset"):
+            return times["sunrise"].time(), times["sunset"].time()
+        return self.sunrise_t, self.sunset_t
 
     def is_active(self, now: datetime) -> bool:
         """Prüft, ob die aktuelle Uhrzeit im aktiven Gesamtzeitraum liegt."""
@@ -37,13 +44,36 @@ class DailyTimeSpan:
             return "night"
 
         current_time = now.time()
+        sunrise_t, sunset_t = self._sun_window(now.date())
 
-        if self.morning_start <= current_time < self.sunrise_t:
+        if self.morning_start <= current_time < sunrise_t:
             return "morning"
-        if self.sunrise_t <= current_time < self.sunset_t:
+        if sunrise_t <= current_time < sunset_t:
             return "day"
-        if self.sunset_t <= current_time < self.evening_end:
+        if sunset_t <= current_time < self.evening_end:
             return "evening"
 
         # Fallback, falls die Logik oben nicht greift (z.B. bei Zeiten über Mitternacht)
-        return "night"
\ No newline at end of file
+        return "night"
+
+    def next_change(self, now: datetime) -> datetime:
+        """Gibt den nächsten Zeitpunkt zurück, an dem sich der Zeitraum ändern kann."""
+        candidates = []
+        for offset in (0, 1):
+            day = now.date() + timedelta(days=offset)
+            for boundary in (self.morning_start, *self._sun_window(day), self.evening_end):
+                candidates.append(self._localize(datetime.combine(day, boundary), now.tzinfo))
+        return min(c for c in candidates if c > now)
+
+    @staticmethod
+    def _localize(moment: datetime, tzinfo) -> datetime:
+        """
+        Versieht eine lokale Uhrzeit mit der UTC-Verschiebung ihres eigenen Tages.
+        Eine feste Verschiebung (aus datetime.now().astimezone()) gilt nur für heute;
+        über einen Sommerzeitwechsel hinweg wird deshalb die Systemzone befragt.
+        """
+        if tzinfo is None:
+            return moment
+        if isinstance(tzinfo, timezone):
+            return moment.astimezone()
+        return moment.replace(tzinfo=tzinfo)
@@ -0,0 +1,131 @@
+"""
+Verteilt Ereignisse (Status-Deltas, neue Log-Zeilen) des Webservers an beliebig
+viele Server-Sent-Events-Verbindungen. Jedes Ereignis wird genau einmal
+serialisiert und in einem Ringpuffer gehalten; Verbindungen warten nur auf die
+Bedingung des Hubs und lesen daraus, sodass die Last nicht mit der Zahl der
+offenen Browser-Tabs wächst. Über die Ereignis-ID (Last-Event-ID) kann eine
+Verbindung lückenlos fortgesetzt werden, solange das Ereignis noch im Puffer liegt.
+"""
+import json
+import os
+import threading
+import uuid
+import logging
+from collections import deque
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from src.log_reader import read_since
+
+
+class EventHub:
+    def __init__(self, capacity: int = 1000, heartbeat_s: float = 15.0):
+        # Unterscheidet IDs verschiedener Prozessläufe.
+        self.epoch = uuid.uuid4().hex[:8]
+        self.heartbeat_s = heartbeat_s
+        self._events = deque(maxlen=capacity)
+        self._last_id = 0
+        self._cond = threading.Condition()
+
+    def publish(self, event: str, data) -> int:
+        with self._cond:
+            self._last_id += 1
+            payload = json.dumps(data, separators=(",", ":"), default=str)
+            self._events.append((self._last_id, f"id: {self.epoch}-{self._last_id}\nevent: {event}\ndata: {payload}\n\n"))
+            self._cond.notify_all()
+            return self._last_id
+
+    def _parse_id(self, last_event_id: Optional[str]) -> Optional[int]:
+        epoch, _, number = (last_event_id or "").partition("-")
+        if epoch != self.epoch or not number.isdigit():
+            return None
+        number = int(number)
+        # Ereignisse nach dieser ID müssen noch vollständig im Puffer liegen.
+        oldest = self._events[0][0] if self._events else self._last_id + 1
+        if number > self._last_id or number < oldest - 1:
+            return None
+        return number
+
+    def stream(self, last_event_id: Optional[str], snapshot: Callable[[], Tuple[str, object]]) -> Iterator[str]:
+        """
+        Erzeugt den SSE-Datenstrom einer Verbindung. Ist die Last-Event-ID unbekannt
+        oder zu alt, beginnt der Strom mit einem Schnappschuss (snapshot() liefert
+        (Ereignisname, Daten)); danach folgen alle neuen Ereignisse und in Ruhephasen
+        Heartbeat-Kommentare.
+        """
+        with self._cond:
+            position = self._parse_id(last_event_id)
+            if position is None:
+                position, first = self._snapshot_text(snapshot)
+            else:
+                first = ""
+        yield "retry: 3000\n\n" + first
+        while True:
+            with self._cond:
+                if self._last_id == position:
+                    self._cond.wait(self.heartbeat_s)
+                if self._events and self._events[0][0] > position + 1:
+                    # Verbindung war zu langsam, Ereignisse sind bereits verdrängt.
+                    position, text = self._snapshot_text(snapshot)
+                    pending = [text]
+                else:
+                    pending = [text for event_id, text in self._events if event_id > position]
+                    position = self._last_id
+            if pending:
+                yield "".join(pending)
+            else:
+                yield ": heartbeat\n\n"
+
+    def _snapshot_text(self, snapshot: Callable[[], Tuple[str, object]]) -> Tuple[int, str]:
+        """Schnappschuss als Ereignis mit der aktuellen ID (Lock muss gehalten werden)."""
+        event, data = snapshot()
+        payload = json.dumps(data, separators=(",", ":"), default=str)
+        return self._last_id, f"id: {self.epoch}-{self._last_id}\nevent: {event}\ndata: {payload}\n\n"
+
+
+class LogFollower:
+    """
+    Beobachtet eine Log-Datei in einem einzigen Thread und meldet neu angehängte
+    Einträge (mehrzeilige als ein Eintrag). Wird die Datei kürzer (Rotation),
+    wird wieder am Anfang begonnen.
+    """
+
+    def __init__(self, log_file: str, on_lines: Callable[[List[str], int], None],
+                 interval_s: float = 1.0, logger: Optional[logging.Logger] = None):
+        self.log_file = log_file
+        self.on_lines = on_lines
+        self.interval_s = interval_s
+        self.logger = logger or logging.getLogger(__name__)
+        self._offset = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "LogFollower":
+        if not (self._thread and self._thread.is_alive()):
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="log-follower", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+
+    def poll(self):
+        try:
+            if self._offset is None:
+                # Beim Start nur künftige Zeilen melden.
+                self._offset = os.path.getsize(self.log_file)
+                return
+            if os.path.getsize(self.log_file) == self._offset:
+                return
+            entries, self._offset, _ = read_since(self.log_file, self._offset)
+        except OSError:
+            return
+        if entries:
+            self.on_lines(entries, self._offset)
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_s):
+            try:
+                self.poll()
+            except Exception as e:
+                self.logger.error(f"Fehler beim Verfolgen der Log-Datei: {e}", exc_info=True)
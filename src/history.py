@@ -0,0 +1,170 @@
+"""
+Abfragen historischer Sensordaten für Diagramme. Die Werte werden in SQL per
+GROUP BY auf Zeitfenster beliebiger Größe verdichtet; ist die Fenstergröße ein
+Vielfaches einer Verdichtungsstufe, wird statt der Rohdaten die gröbste
+passende Verdichtungstabelle gelesen. Fenster ohne Daten sind None und
+können optional linear aufgefüllt werden. Für Exporte werden Rohdaten blockweise gestreamt.
+"""
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from src.telemetry import ROLLUPS
+
+# Benannte Auflösungen -> Fenstergröße in Sekunden.
+RESOLUTIONS = {
+    "5min": 300,
+    "hour": 3600,
+    "day": 86400,
+}
+
+# Größter Zeitraum je Auflösung, wenn keine Fenstergröße angegeben ist.
+RESOLUTION_LIMITS = (
+    (timedelta(days=2), "5min"),
+    (timedelta(days=45), "hour"),
+)
+
+CHART_TYPES = ("brightness", "temperature")
+MAX_POINTS = 5000
+
+# Zeitstempel sind lokale Zeit ohne Zonenangabe; SQLite und die Umrechnung hier
+# behandeln sie einheitlich wie UTC, damit Fenstergrenzen auf volle Stunden/Tage fallen.
+_EPOCH = datetime(1970, 1, 1)
+
+
+def choose_resolution(start: datetime, end: datetime) -> str:
+    span = end - start
+    for limit, resolution in RESOLUTION_LIMITS:
+        if span <= limit:
+            return resolution
+    return "day"
+
+
+def _naive(value: datetime) -> datetime:
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+
+def _to_slot(value: datetime) -> int:
+    return int((value - _EPOCH).total_seconds())
+
+
+def _label(slot: int) -> str:
+    return (_EPOCH + timedelta(seconds=slot)).isoformat()
+
+
+def _source(bucket_s: int):
+    """Gröbste Tabelle, deren Fenster die angefragte Fenstergröße ohne Rest teilen."""
+    for table, seconds in sorted(ROLLUPS.items(), key=lambda item: -item[1]):
+        if bucket_s % seconds == 0:
+            return table, "bucket", "sum(sum) / sum(count)"
+    return "measurements", "timestamp", "avg(value)"
+
+
+def fill_gaps(values: List[Optional[float]]) -> List[Optional[float]]:
+    """Interpoliert fehlende Werte zwischen zwei bekannten linear; Ränder bleiben None."""
+    filled = list(values)
+    previous = None
+    for index, value in enumerate(values):
+        if value is None:
+            continue
+        if previous is not None and index - previous > 1:
+            start_value = values[previous]
+            step = (value - start_value) / (index - previous)
+            for gap in range(previous + 1, index):
+                filled[gap] = round(start_value + step * (gap - previous), 2)
+        previous = index
+    return filled
+
+
+def query_history(
+    con: sqlite3.Connection,
+    sensor_ids: Sequence[str],
+    start: datetime,
+    end: datetime,
+    bucket_s: Optional[int] = None,
+    measurement_types: Sequence[str] = CHART_TYPES,
+    fill: bool = False,
+) -> Dict:
+    """
+    Mittelwerte je Zeitfenster im Bereich [start, end) für mehrere Sensoren:
+    {'labels': [...], 'bucket_s': ..., 'series': {Sensor: {Messart: [...]}}}.
+    Die Labels bilden das vollständige Raster; Fenster ohne Daten sind None,
+    mit fill werden sie zwischen bekannten Werten linear aufgefüllt.
+    """
+    start, end = _naive(start), _naive(end)
+    bucket_s = int(bucket_s or RESOLUTIONS[choose_resolution(start, end)])
+    if bucket_s <= 0:
+        raise ValueError("Fenstergröße muss positiv sein.")
+    first_slot = _to_slot(start) // bucket_s * bucket_s
+    if (_to_slot(end) - first_slot) / bucket_s > MAX_POINTS:
+        raise ValueError(f"Zu viele Datenpunkte (max. {MAX_POINTS}); größere Fenster wählen.")
+
+    table, column, aggregate = _source(bucket_s)
+    sensor_marks = ",".join("?" * len(sensor_ids))
+    type_marks = ",".join("?" * len(measurement_types))
+    rows = con.execute(
+        f"""
+        SELECT CAST(strftime('%s', {column}) AS INTEGER) / ? * ? AS slot, sensor_id, measurement_type, {aggregate}
+        FROM {table}
+        WHERE sensor_id IN ({sensor_marks}) AND measurement_type IN ({type_marks})
+          AND {column} >= ? AND {column} < ?
+        GROUP BY slot, sensor_id, measurement_type
+        """,
+        (bucket_s, bucket_s, *sensor_ids, *measurement_types, start.isoformat(), end.isoformat()),
+    ).fetchall()
+
+    values: Dict[tuple, float] = {(sensor_id, kind, slot): value for slot, sensor_id, kind, value in rows}
+    slots = range(first_slot, _to_slot(end), bucket_s)
+    series = {}
+    for sensor_id in sensor_ids:
+        series[sensor_id] = {}
+        for kind in measurement_types:
+            column_values = [values.get((sensor_id, kind, slot)) for slot in slots]
+            column_values = [round(v, 2) if v is not None else None for v in column_values]
+            series[sensor_id][kind] = fill_gaps(column_values) if fill else column_values
+    return {"labels": [_label(slot) for slot in slots], "bucket_s": bucket_s, "source": table, "series": series}
+
+
+def iter_measurements(
+    db_file: str,
+    sensor_ids: Sequence[str] = (),
+    measurement_types: Sequence[str] = (),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    chunk_size: int = 2000,
+):
+    """
+    Liefert Rohzeilen (timestamp, sensor_id, measurement_type, value) blockweise
+    per fetchmany, sodass der Speicherbedarf unabhängig von der Ergebnisgröße ist.
+    Die Reihenfolge folgt dem jeweils nutzbaren Index (ohne Sortierung im Speicher):
+    nach Zeit, bei Sensorfilter nach Sensor, Messart und Zeit.
+    """
+    conditions, params = [], []
+    if sensor_ids:
+        conditions.append(f"sensor_id IN ({','.join('?' * len(sensor_ids))})")
+        params.extend(sensor_ids)
+    if measurement_types:
+        conditions.append(f"measurement_type IN ({','.join('?' * len(measurement_types))})")
+        params.extend(measurement_types)
+    if start:
+        conditions.append("timestamp >= ?")
+        params.append(_naive(start).isoformat())
+    if end:
+        conditions.append("timestamp < ?")
+        params.append(_naive(end).isoformat())
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    order = "sensor_id, measurement_type, timestamp" if sensor_ids else "timestamp"
+
+    con = sqlite3.connect(db_file, timeout=5)
+    try:
+        cursor = con.execute(
+            f"SELECT timestamp, sensor_id, measurement_type, value FROM measurements {where} ORDER BY {order}",
+            params,
+        )
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
+    finally:
+        con.close()
@@ -2,35 +2,578 @@
 Ein erweiterter Wrapper für die python-hue-v2 Bibliothek, um die v2 API
 umfassend zu kapseln und eine einfache, high-level Steuerung zu ermöglichen.
 """
-from typing import Optional, Dict, List, Literal
+from typing import Optional, Dict, List, Literal, Callable, Iterable, Iterator, Tuple
+import colorsys
+import copy
+import json
 import logging
+import os
+import socket
+import threading
+import time
+import ssl
+from concurrent.futures import ThreadPoolExecutor
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
 from python_hue_v2.hue import Hue
-from python_hue_v2.scene import Scene as HueScene
+from src.command_scheduler import CommandScheduler
+from src.connection_health import ConnectionHealth, BridgeUnavailableError
+from src.shadow_state import ShadowState
+from src.topology import BridgeTopology
+from src.metrics import MetricsRegistry
+
+# Die Bridge nutzt ein selbstsigniertes Zertifikat.
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Schlüssel in get_full_api_data() -> Ressourcentyp der v2 API
+API_DATA_TYPES = {
+    "lights": "light",
+    "scenes": "scene",
+    "devices": "device",
+    "rooms": "room",
+    "zones": "zone",
+    "grouped_lights": "grouped_light",
+}
+
+
+def _iter_sse_events(lines: Iterable[str]) -> Iterator[Tuple[Optional[str], str]]:
+    """
+    Zerlegt einen Server-Sent-Events-Zeilenstrom in (id, data)-Paare.
+    Mehrzeilige 'data:'-Felder werden gemäß SSE-Spezifikation mit '\n' verbunden.
+    """
+    event_id, data_lines = None, []
+    for line in lines:
+        if line is None:
+            continue
+        if line == "":
+            if data_lines:
+                yield event_id, "\n".join(data_lines)
+            event_id, data_lines = None, []
+            continue
+        if line.startswith(":"):
+            continue  # Kommentar bzw. Keep-Alive der Bridge
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "data":
+            data_lines.append(value)
+        elif field == "id":
+            event_id = value
+    if data_lines:
+        yield event_id, "\n".join(data_lines)
+
+
+def _deep_merge(target: Dict, update: Dict):
+    """Führt ein partielles Ressourcen-Update rekursiv in den bestehenden Zustand ein."""
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _deep_merge(target[key], value)
+        else:
+            target[key] = copy.deepcopy(value)
+
+
+class BridgeStateMirror:
+    """
+    Hält eine In-Memory-Kopie aller Ressourcen der Bridge und aktualisiert sie
+    inkrementell über den v2-Eventstream (/eventstream/clip/v2).
+    Bei Verbindungsabbrüchen und in festen Intervallen wird vollständig neu synchronisiert.
+    """
+
+    def __init__(
+        self,
+        fetch_all: Callable[[], List[Dict]],
+        stream_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        logger: Optional[logging.Logger] = None,
+        resync_interval_s: float = 300,
+        read_timeout_s: float = 60,
+        retry_delay_s: float = 5,
+        verify: bool = False,
+        session: Optional[requests.Session] = None,
+        wait_available: Optional[Callable[[float], bool]] = None,
+    ):
+        self._fetch_all = fetch_all
+        self._session = session or requests.Session()
+        self._wait_available = wait_available
+        self.stream_url = stream_url
+        self.headers = dict(headers or {})
+        self.headers.setdefault("Accept", "text/event-stream")
+        self.logger = logger or logging.getLogger(__name__)
+        self.resync_interval_s = resync_interval_s
+        self.read_timeout_s = read_timeout_s
+        self.retry_delay_s = retry_delay_s
+        self.verify = verify
+
+        self._resources: Dict[str, Dict[str, Dict]] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._response = None
+        self._synced = False
+        self._stream_connected = False
+        self._last_resync = 0.0
+        self._listeners: List[Callable[[str, Dict, bool], None]] = []
+        self.last_event_id: Optional[str] = None
+
+    def add_listener(self, listener: Callable[[str, Dict, bool], None]):
+        """
+        Registriert einen Beobachter, der nach jeder Änderung mit
+        (resource_type, resource, deleted) aufgerufen wird.
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, changes: List[Tuple[str, Dict, bool]]):
+        for listener in self._listeners:
+            for resource_type, resource, deleted in changes:
+                try:
+                    listener(resource_type, resource, deleted)
+                except Exception as e:
+                    self.logger.error(f"Fehler in einem Beobachter des Bridge-Spiegels: {e}", exc_info=True)
+
+    def start(self, blocking: bool = True):
+        """
+        Startet den Stream-Thread. Mit blocking=True wird die erste Synchronisierung
+        vorher ausgeführt, sonst übernimmt sie der Thread.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        if blocking:
+            self.resync()
+        self._thread = threading.Thread(target=self._run, name="hue-eventstream", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Beendet den Stream-Thread."""
+        self._stop_event.set()
+        response = self._response
+        if response is not None:
+            # close() allein wartet, bis der blockierende Lesevorgang des Threads endet;
+            # shutdown() auf dem Socket beendet ihn sofort.
+            try:
+                with socket.socket(fileno=os.dup(response.raw.fileno())) as sock:
+                    sock.shutdown(socket.SHUT_RDWR)
+            except (OSError, ValueError):
+                pass
+            try:
+                response.close()
+            except Exception:
+                pass
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+        self._stream_connected = False
+
+    def is_streaming(self) -> bool:
+        """True, solange der Eventstream verbunden ist."""
+        return self._stream_connected
+
+    def is_synced(self) -> bool:
+        """True, solange der Spiegel einen vollständigen und aktuellen Datenbestand hält."""
+        if not self._synced:
+            return False
+        if self._stream_connected:
+            return True
+        # Ohne Stream gilt der Bestand nur bis zur nächsten fälligen Resynchronisierung.
+        return time.monotonic() - self._last_resync < self.resync_interval_s
+
+    def resync(self) -> bool:
+        """Lädt alle Ressourcen vollständig neu und ersetzt den Bestand."""
+        try:
+            resources = self._fetch_all()
+        except Exception as e:
+            self.logger.error(f"Vollständige Synchronisierung mit der Bridge fehlgeschlagen: {e}")
+            self._synced = False
+            return False
+        if resources is None:
+            self._synced = False
+            return False
+
+        index: Dict[str, Dict[str, Dict]] = {}
+        for resource in resources:
+            if resource and resource.get("type") and resource.get("id"):
+                index.setdefault(resource["type"], {})[resource["id"]] = resource
+        with self._lock:
+            self._resources = index
+        self._synced = True
+        self._last_resync = time.monotonic()
+        if self._listeners:
+            self._notify([(r["type"], copy.deepcopy(r), False) for bucket in index.values() for r in bucket.values()])
+        self.logger.debug(f"Bridge-Spiegel synchronisiert ({len(resources)} Ressourcen).")
+        return True
+
+    def apply_events(self, events: List[Dict]):
+        """Wendet eine Liste von Eventstream-Containern (add/update/delete) an."""
+        changes = []
+        with self._lock:
+            for event in events or []:
+                event_type = event.get("type")
+                for item in event.get("data", []):
+                    resource_type, resource_id = item.get("type"), item.get("id")
+                    if not resource_type or not resource_id:
+                        continue
+                    bucket = self._resources.setdefault(resource_type, {})
+                    if event_type == "delete":
+                        removed = bucket.pop(resource_id, None)
+                        changes.append((resource_type, copy.deepcopy(removed or item), True))
+                        continue
+                    if event_type == "add":
+                        bucket[resource_id] = copy.deepcopy(item)
+                    elif event_type == "update":
+                        existing = bucket.get(resource_id)
+                        if existing is None:
+                            bucket[resource_id] = copy.deepcopy(item)
+                        else:
+                            _deep_merge(existing, item)
+                    else:
+                        continue
+                    if self._listeners:
+                        changes.append((resource_type, copy.deepcopy(bucket[resource_id]), False))
+        if changes and self._listeners:
+            self._notify(changes)
+
+    def get(self, resource_type: str, resource_id: str) -> Optional[Dict]:
+        """Gibt eine Kopie einer einzelnen Ressource zurück."""
+        with self._lock:
+            resource = self._resources.get(resource_type, {}).get(resource_id)
+            return copy.deepcopy(resource) if resource is not None else None
+
+    def get_all(self, resource_type: str) -> List[Dict]:
+        """Gibt Kopien aller Ressourcen eines Typs zurück."""
+        with self._lock:
+            return copy.deepcopy(list(self._resources.get(resource_type, {}).values()))
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            if self._wait_available and not self._wait_available(self.retry_delay_s):
+                # Bridge gilt als nicht erreichbar; die Wiederverbindung läuft anderswo.
+                self._synced = False
+                continue
+            if time.monotonic() - self._last_resync >= self.resync_interval_s or not self._synced:
+                self.resync()
+            retry_delay_s = self.retry_delay_s
+            try:
+                self._consume_stream()
+            except requests.exceptions.ReadTimeout:
+                # Kein Event innerhalb des Lese-Timeouts: ohne Wartezeit neu verbinden.
+                retry_delay_s = 0
+            except Exception as e:
+                if self._stop_event.is_set():
+                    break
+                self.logger.warning(f"Eventstream der Bridge unterbrochen: {e}. Neuer Versuch in {self.retry_delay_s}s.")
+            finally:
+                self._stream_connected = False
+                self._response = None
+            if self._stop_event.wait(retry_delay_s):
+                break
+            # Während der Unterbrechung verpasste Events nachholen.
+            self.resync()
+
+    def _consume_stream(self):
+        with self._session.get(
+            self.stream_url,
+            headers=self.headers,
+            stream=True,
+            verify=self.verify,
+            timeout=(10, self.read_timeout_s),
+        ) as response:
+            response.raise_for_status()
+            self._response = response
+            self._stream_connected = True
+            self.logger.info("Eventstream der Bridge verbunden.")
+            response.encoding = "utf-8"
+            # chunk_size=1, damit einzelne Events nicht im Lesepuffer liegen bleiben.
+            lines = response.iter_lines(chunk_size=1, decode_unicode=True)
+            for event_id, data in _iter_sse_events(lines):
+                if self._stop_event.is_set():
+                    return
+                try:
+                    events = json.loads(data)
+                except ValueError:
+                    self.logger.debug(f"Ungültiges Event der Bridge ignoriert: {data[:200]}")
+                    continue
+                self.apply_events(events if isinstance(events, list) else [events])
+                if event_id:
+                    self.last_event_id = event_id
+
+
+def _hue_sat_to_xy(hue: int, sat: int) -> List[float]:
+    """
+    Rechnet Farbton (0..65535) und Sättigung (0..254) der v1 API in eine
+    CIE-xy-Farbe um (über sRGB bei voller Helligkeit, Wide-Gamut-Matrix von Philips).
+    """
+    rgb = colorsys.hsv_to_rgb((int(hue) % 65536) / 65536, max(0, min(254, int(sat))) / 254, 1.0)
+    r, g, b = (((c + 0.055) / 1.055) ** 2.4 if c > 0.04045 else c / 12.92 for c in rgb)
+    x = r * 0.664511 + g * 0.154324 + b * 0.162028
+    y = r * 0.283881 + g * 0.668433 + b * 0.047685
+    z = r * 0.000088 + g * 0.072310 + b * 0.986039
+    total = x + y + z
+    if total == 0:
+        return [0.3127, 0.329]
+    return [round(x / total, 4), round(y / total, 4)]
+
+
+def _to_v2_state(state: Dict) -> Dict:
+    """
+    Übersetzt einen Zustand im v1-Format (on, bri, ct, hue, sat, transitiontime),
+    wie ihn Scene.get_state() liefert, in das Format der v2 API. Farbton und
+    Sättigung werden zu einer xy-Farbe. Bereits v2-konforme Felder werden
+    unverändert übernommen.
+    """
+    payload = {}
+    for key, value in state.items():
+        if key == "on" and not isinstance(value, dict):
+            payload["on"] = {"on": bool(value)}
+        elif key == "bri":
+            payload["dimming"] = {"brightness": round(max(0, min(254, value)) / 254 * 100, 2)}
+        elif key == "ct":
+            payload["color_temperature"] = {"mirek": max(153, min(500, int(value)))}
+        elif key == "transitiontime":
+            payload["dynamics"] = {"duration": int(value) * 100}
+        elif key == "hue":
+            # Ohne Sättigung zeigt die v1 API den Farbton voll gesättigt.
+            x, y = _hue_sat_to_xy(value, state.get("sat", 254))
+            payload["color"] = {"xy": {"x": x, "y": y}}
+        elif key == "sat":
+            if "hue" not in state:
+                logging.getLogger(__name__).warning("Sättigung ohne Farbton kann nicht gesendet werden, wird ignoriert.")
+        else:
+            payload[key] = value
+    return payload
+
+
+class _PooledHTTPSAdapter(HTTPAdapter):
+    """HTTPAdapter, der allen Verbindungen einen gemeinsamen SSL-Kontext mitgibt."""
+
+    def __init__(self, ssl_context: ssl.SSLContext, **kwargs):
+        self._ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = self._ssl_context
+        return super().init_poolmanager(*args, **kwargs)
+
 
 class HueBridge:
-    def __init__(self, ip: str, app_key: str, logger: Optional[logging.Logger] = None):
+    """
+    Kapselt die v2 API der Bridge. Alle Aufrufe laufen über eine eigene
+    Keep-Alive-Session mit Verbindungspool, sodass der TLS-Handshake nur beim
+    Aufbau einer neuen Verbindung anfällt.
+    """
+
+    def __init__(
+        self,
+        ip: str,
+        app_key: str,
+        logger: Optional[logging.Logger] = None,
+        pool_size: int = 4,
+        timeout_s: float = 5.0,
+        connect_in_background: bool = False,
+    ):
         self.ip = ip
         self.app_key = app_key
         self.logger = logger or logging.getLogger(__name__)
-        self._hue: Optional[Hue] = None
-        self.connect()
+        self.pool_size = pool_size
+        self.timeout_s = timeout_s
+        self.base_url = f"https://{ip}/clip/v2/resource"
+        self._session = self._create_session()
+        self.health = ConnectionHealth(probe=self._probe, logger=self.logger)
+        self.metrics = MetricsRegistry()
+        self._mirror: Optional[BridgeStateMirror] = None
+        self._change_listeners: List[Callable[[str, Dict, bool], None]] = []
+        self._scheduler: Optional[CommandScheduler] = None
+        self._shadow = ShadowState()
+        self._topology = BridgeTopology()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # Ohne Eventstream werden Schattenzustände nach dieser Zeit neu gesendet.
+        self.shadow_max_age_s = 60.0
+        if connect_in_background:
+            self.connect_in_background()
+        else:
+            self.connect()
+
+    def _create_session(self) -> requests.Session:
+        # Ein gemeinsamer Kontext spart das Laden der Zertifikate pro Verbindung.
+        ssl_context = ssl.create_default_context()
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+        adapter = _PooledHTTPSAdapter(
+            ssl_context,
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            max_retries=0,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.headers.update({"hue-application-key": self.app_key or ""})
+        return session
 
-    def connect(self):
+    def _request(self, method: str, path: str, payload: Optional[Dict] = None, timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Führt eine Anfrage gegen /clip/v2/resource aus und gibt das 'data'-Feld zurück.
+        Ist der Circuit Breaker offen, wird sofort BridgeUnavailableError geworfen.
+        """
+        if not self.health.is_available():
+            raise BridgeUnavailableError(f"Bridge {self.ip} ist nicht erreichbar.")
+        endpoint = f"{method} /{path.strip('/').split('/')[0]}"
+        try:
+            with self.metrics.measure("bridge", endpoint):
+                data = self._send_request(method, path, payload, timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            self.health.record_failure(e)
+            raise
+        self.health.record_success()
+        return data
+
+    def _send_request(self, method: str, path: str, payload: Optional[Dict] = None, timeout: Optional[float] = None) -> List[Dict]:
+        response = self._session.request(
+            method,
+            f"{self.base_url}{path}",
+            json=payload,
+            timeout=timeout or self.timeout_s,
+            # Explizit pro Anfrage, da REQUESTS_CA_BUNDLE sonst session.verify überschreibt.
+            verify=False,
+        )
+        if response.status_code == 403:
+            raise ConnectionRefusedError("App-Key wurde von der Bridge abgelehnt.")
+        response.raise_for_status()
+        body = response.json()
+        if body.get("errors"):
+            raise ConnectionError(body["errors"])
+        return body.get("data", [])
+
+    def _probe(self):
+        self._send_request("GET", "/bridge")
+
+    def connect(self) -> bool:
+        """Prüft die Verbindung sofort (blockierend). Bei Fehlern läuft die Wiederverbindung im Hintergrund weiter."""
         if not self.ip or not self.app_key:
             self.logger.warning("IP-Adresse oder App-Key fehlen. Verbindung nicht möglich.")
-            self._hue = None
-            return
-        try:
-            self._hue = Hue(self.ip, self.app_key)
-            self.logger.info(f"Verbindung zur Bridge unter {self.ip} (v2 API) wird versucht...")
-            self._hue.bridge.get_bridge()
+            return False
+        self.logger.info(f"Verbindung zur Bridge unter {self.ip} (v2 API) wird versucht...")
+        if self.health.connect_now():
             self.logger.info("Verbindung zur Bridge erfolgreich hergestellt.")
-        except Exception as e:
-            self.logger.error(f"Fehler bei der Initialisierung der v2 Bridge: {e}", exc_info=True)
-            self._hue = None
+            return True
+        self.logger.error(f"Fehler bei der Initialisierung der v2 Bridge: {self.health.last_error}")
+        return False
+
+    def connect_in_background(self):
+        """Startet den Verbindungsaufbau, ohne auf das Ergebnis zu warten."""
+        if self.ip and self.app_key:
+            self.health.connect_in_background()
 
     def is_connected(self) -> bool:
-        return self._hue is not None
+        return self.health.is_available()
+
+    @property
+    def topology(self) -> BridgeTopology:
+        """Strukturindex der Bridge; wird beim ersten Zugriff aufgebaut."""
+        if not self._topology.is_built and self.is_connected():
+            self.refresh_topology()
+        return self._topology
+
+    def refresh_topology(self, api_data: Optional[Dict] = None):
+        """Baut den Strukturindex neu auf, bei Bedarf aus bereits geladenen Daten."""
+        if api_data is None:
+            api_data = self.get_full_api_data()
+        if api_data:
+            self._topology.rebuild(api_data)
+
+    @property
+    def topology_version(self) -> int:
+        """Zähler struktureller Änderungen, ohne den Index dafür aufzubauen."""
+        return self._topology.version
+
+    def start_event_stream(self, resync_interval_s: float = 300, blocking: bool = True):
+        """
+        Startet den Bridge-Spiegel. Lesezugriffe auf Ressourcen werden danach
+        aus dem Speicher bedient, solange der Spiegel synchron ist.
+        Mit blocking=False läuft die erste Synchronisierung im Hintergrund.
+        """
+        if not self.is_connected() or self._mirror is not None:
+            return
+        self._mirror = BridgeStateMirror(
+            fetch_all=self._fetch_all_resources,
+            stream_url=f"https://{self.ip}/eventstream/clip/v2",
+            logger=self.logger,
+            resync_interval_s=resync_interval_s,
+            session=self._session,
+            wait_available=self.health.wait_until_available,
+        )
+        self._mirror.add_listener(self._on_mirror_change)
+        self._mirror.start(blocking=blocking)
+
+    def has_live_events(self) -> bool:
+        """True, wenn Änderungen an der Bridge gerade über den Eventstream ankommen."""
+        return self._mirror is not None and self._mirror.is_streaming() and self._mirror.is_synced()
+
+    def add_change_listener(self, listener: Callable[[str, Dict, bool], None]):
+        """Registriert einen Beobachter für Änderungen aus dem Bridge-Spiegel."""
+        self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: Callable[[str, Dict, bool], None]):
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+
+    def _on_mirror_change(self, resource_type: str, resource: Dict, deleted: bool):
+        if self._topology.is_built:
+            self._topology.apply_change(resource_type, resource, deleted)
+        if resource_type == "grouped_light":
+            if deleted:
+                self._shadow.invalidate(resource["id"])
+            else:
+                self._shadow.observe(resource["id"], resource)
+        elif resource_type == "light" and not deleted and self._topology.is_built:
+            # Änderungen einzelner Lichter (z.B. Farbe aus der Hue-App) erreichen den Gruppenschatten nur so.
+            for group_id in self._topology.groups_for_light(resource["id"]):
+                grouped_light_id = self._topology.grouped_light_for_group(group_id)
+                if grouped_light_id:
+                    self._shadow.observe_member(grouped_light_id, resource)
+        for listener in list(self._change_listeners):
+            listener(resource_type, resource, deleted)
+
+    def start_command_scheduler(self, light_rate: float = 10.0, group_rate: float = 1.0):
+        """
+        Leitet Schaltbefehle ab jetzt über die ratenbegrenzte Warteschlange,
+        statt sie direkt an die Bridge zu senden.
+        """
+        if self._scheduler is not None:
+            return
+        self._scheduler = CommandScheduler(
+            send=self._send_command,
+            logger=self.logger,
+            light_rate=light_rate,
+            group_rate=group_rate,
+        )
+        self._scheduler.start()
+
+    def get_command_stats(self) -> Optional[Dict]:
+        """Warteschlangentiefe und Wartezeiten der Schaltbefehle, falls die Warteschlange aktiv ist."""
+        return self._scheduler.get_stats() if self._scheduler else None
+
+    def close(self):
+        """Sendet ausstehende Befehle, beendet den Eventstream und schließt den Verbindungspool."""
+        if self._scheduler is not None:
+            self._scheduler.stop()
+            self._scheduler = None
+        if self._mirror is not None:
+            self._mirror.stop()
+            self._mirror = None
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        self.health.stop()
+        self._session.close()
+
+    def _mirror_ready(self) -> bool:
+        return self._mirror is not None and self._mirror.is_synced()
+
+    def _fetch_all_resources(self) -> List[Dict]:
+        """Holt alle Ressourcen über den gebündelten Endpunkt /clip/v2/resource."""
+        return self._request("GET", "", timeout=max(self.timeout_s, 10))
 
     @staticmethod
     def create_app_key(ip: str, logger: Optional[logging.Logger] = None) -> Optional[str]:
@@ -45,55 +588,150 @@ class HueBridge:
             log.error(f"Fehler beim Erstellen des App-Keys: {e}", exc_info=True)
             return None
 
-    def get_full_api_data(self) -> Dict:
+    def get_full_api_data(self, resource_types: Optional[Iterable[str]] = None, allow_partial: bool = False) -> Dict:
+        """
+        Lädt die angefragten Ressourcentypen (Schlüssel aus API_DATA_TYPES, Standard: alle).
+        Die Abfragen laufen parallel über den Verbindungspool, die Dauer entspricht
+        also etwa einem Round-Trip. Bei aktivem Eventstream wird aus dem Speicher gelesen.
+
+        Schlägt ein Typ fehl, wird ohne allow_partial ein leeres Dict zurückgegeben.
+        Mit allow_partial fehlen nur die betroffenen Schlüssel, und unter 'errors'
+        steht je fehlgeschlagenem Schlüssel die Fehlermeldung; schlagen alle fehl,
+        ist das Ergebnis ebenfalls leer.
+        """
         if not self.is_connected(): return {}
-        try:
-            return {
-                "lights": self._hue.bridge.get_lights() or [],
-                "scenes": self._hue.bridge.get_scenes() or [],
-                "devices": self._hue.bridge.get_devices() or [],
-                "rooms": self._hue.bridge.get_rooms() or [],
-                "zones": self._hue.bridge.get_zones() or [],
-                "grouped_lights": self._hue.bridge.get_grouped_lights() or [],
-            }
-        except Exception as e:
-            self.logger.error(f"Fehler beim Abrufen der gesamten Bridge-Daten: {e}", exc_info=True)
-            return {}
+        keys = list(resource_types) if resource_types is not None else list(API_DATA_TYPES)
+        unknown = [key for key in keys if key not in API_DATA_TYPES]
+        if unknown:
+            raise ValueError(f"Unbekannte Ressourcentypen: {unknown}")
+
+        if self._mirror_ready():
+            return {key: self._mirror.get_all(API_DATA_TYPES[key]) for key in keys}
+
+        executor = self._get_executor()
+        futures = {key: executor.submit(self._request, "GET", f"/{API_DATA_TYPES[key]}") for key in keys}
+        result, errors = {}, {}
+        for key, future in futures.items():
+            try:
+                result[key] = future.result() or []
+            except Exception as e:
+                errors[key] = str(e)
+
+        if errors:
+            self.logger.error(f"Fehler beim Abrufen der Bridge-Daten für {', '.join(errors)}: {errors}")
+            if not allow_partial or not result:
+                return {}
+            result["errors"] = errors
+        return result
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="hue-fetch")
+            return self._executor
 
     def get_grouped_lights(self) -> List[Dict]:
         if not self.is_connected(): return []
-        return self._hue.bridge.get_grouped_lights() or []
+        if self._mirror_ready():
+            return self._mirror.get_all("grouped_light")
+        try:
+            grouped_lights = self._request("GET", "/grouped_light") or []
+            for grouped_light in grouped_lights:
+                self._shadow.observe(grouped_light["id"], grouped_light)
+            return grouped_lights
+        except Exception as e:
+            self.logger.error(f"Fehler beim Abrufen der Lichtgruppen: {e}")
+            return []
             
     def get_resource_by_id(self, resource_type: str, resource_id: str) -> Optional[Dict]:
         if not self.is_connected(): return None
+        if self._mirror_ready():
+            return self._mirror.get(resource_type, resource_id)
         try:
-            return self._hue.bridge._get_by_id(resource_type, resource_id)
+            data = self._request("GET", f"/{resource_type}/{resource_id}")
+            if data and resource_type == "grouped_light":
+                self._shadow.observe(resource_id, data[0])
+            return data[0] if data else None
         except Exception:
             return None
 
+    def get_device_by_id(self, device_id: str) -> Optional[Dict]:
+        return self.get_resource_by_id("device", device_id)
+
     def set_light_state(self, light_id: str, state: dict):
         if not self.is_connected(): return
+        if self._scheduler:
+            self._scheduler.submit("light", light_id, state)
+        else:
+            self._send_light_state(light_id, state)
+
+    def set_group_state(self, group_id: str, state: dict):
+        if not self.is_connected(): return
+        if self._scheduler:
+            grouped_light_id = self._find_grouped_light_id_for_group(group_id)
+            if (
+                grouped_light_id
+                and not self._scheduler.has_pending("group", group_id)
+                and not self._shadow.diff(grouped_light_id, state, self._shadow_max_age())
+            ):
+                self.logger.debug(f"Gruppe {group_id} ist bereits im Zielzustand, kein Befehl nötig.")
+                return
+            self._scheduler.submit("group", group_id, state)
+        else:
+            self._send_group_state(group_id, state)
+
+    def _shadow_max_age(self) -> Optional[float]:
+        # Solange der Eventstream läuft, hält er den Schatten aktuell.
+        return None if self._mirror_ready() else self.shadow_max_age_s
+
+    @staticmethod
+    def _is_rate_limited(error: Exception) -> bool:
+        response = getattr(error, "response", None)
+        return response is not None and response.status_code == 429
+
+    def _send_command(self, kind: str, target_id: str, state: dict) -> bool:
+        if kind == "group":
+            return self._send_group_state(target_id, state)
+        return self._send_light_state(target_id, state)
+
+    def _send_light_state(self, light_id: str, state: dict) -> bool:
         try:
-            self._hue.bridge.set_light(light_id_v2=light_id, data=state)
+            self._request("PUT", f"/light/{light_id}", _to_v2_state(state))
+            return True
         except Exception as e:
+            if self._is_rate_limited(e):
+                self.logger.warning(f"Ratenlimit der Bridge erreicht, Lampe {light_id} wird später gesetzt.")
+                return False
+            if isinstance(e, BridgeUnavailableError):
+                return False
             self.logger.error(f"Fehler beim Setzen des Zustands für Lampe {light_id}: {e}", exc_info=True)
+            return False
 
-    def set_group_state(self, group_id: str, state: dict):
-        if not self.is_connected(): return
+    def _send_group_state(self, group_id: str, state: dict) -> bool:
         try:
             grouped_light_id = self._find_grouped_light_id_for_group(group_id)
             if grouped_light_id:
-                self._hue.bridge.set_grouped_light_service(grouped_light_id, state)
+                changes = self._shadow.diff(grouped_light_id, state, self._shadow_max_age())
+                if changes:
+                    self._request("PUT", f"/grouped_light/{grouped_light_id}", _to_v2_state(changes))
+                    self._shadow.record_sent(grouped_light_id, state)
             else:
                 self.logger.warning(f"Kein 'grouped_light' Service für Gruppe {group_id} gefunden.")
+            # Ohne Lichtgruppe hilft auch eine Wiederholung nicht.
+            return True
         except Exception as e:
+            if self._is_rate_limited(e):
+                self.logger.warning(f"Ratenlimit der Bridge erreicht, Gruppe {group_id} wird später gesetzt.")
+                return False
+            if isinstance(e, BridgeUnavailableError):
+                return False
             self.logger.error(f"Fehler beim Setzen des Zustands für Gruppe {group_id}: {e}", exc_info=True)
+            return False
 
     def recall_scene(self, scene_id: str):
         if not self.is_connected(): return
         try:
-            scene = HueScene(self._hue.bridge, scene_id)
-            scene.recall(action='active')
+            self._request("PUT", f"/scene/{scene_id}", {"recall": {"action": "active"}})
         except Exception as e:
             self.logger.error(f"Fehler beim Aktivieren der Szene {scene_id}: {e}", exc_info=True)
 
@@ -106,15 +744,17 @@ class HueBridge:
         pass
 
     def _find_grouped_light_id_for_group(self, group_id: str) -> Optional[str]:
-        # ... (Methode bleibt unverändert)
-        pass
+        return self.topology.grouped_light_for_group(group_id)
         
     def update_resource_metadata(self, resource_type: str, resource_id: str, new_name: str):
         """Ändert den Namen einer Ressource (z.B. room, zone, light, device)."""
         if not self.is_connected(): return
         try:
             payload = {"metadata": {"name": new_name}}
-            self._hue.bridge.put(f"/{resource_type}/{resource_id}", payload)
+            self._request("PUT", f"/{resource_type}/{resource_id}", payload)
+            group = self._topology.group(resource_id)
+            if group:
+                self._topology.apply_change(group["type"], self._group_resource({**group, "name": new_name}, group["children"]))
             self.logger.info(f"Ressource '{resource_type}/{resource_id}' umbenannt in '{new_name}'.")
         except Exception as e:
             self.logger.error(f"Fehler beim Umbenennen von '{resource_type}/{resource_id}': {e}", exc_info=True)
@@ -123,38 +763,36 @@ class HueBridge:
         """Verschiebt ein Gerät (und damit dessen Lichter) in einen neuen Raum oder eine neue Zone."""
         if not self.is_connected(): return
 
-        all_groups = self.get_full_api_data().get('rooms', []) + self.get_full_api_data().get('zones', [])
-        old_group = None
-        
-        # 1. Finde die alte Gruppe, um das Gerät daraus zu entfernen
-        for group in all_groups:
-            if any(child.get('rid') == device_id for child in group.get('children', [])):
-                old_group = group
-                break
-
-        # 2. Entferne Gerät aus alter Gruppe (falls es in einer war)
-        if old_group:
-            old_children = [child for child in old_group.get('children', []) if child.get('rid') != device_id]
-            group_type = 'room' if 'archetype' in old_group.get('metadata', {}) else 'zone'
-            payload = {"children": old_children}
+        topology = self.topology
+        # 1. Entferne Gerät aus alter Gruppe (falls es in einer war)
+        old_group_id = topology.room_for_device(device_id)
+        old_group = topology.group(old_group_id) if old_group_id else None
+        if old_group and old_group_id != new_group_id:
+            old_children = [child for child in old_group["children"] if child.get("rid") != device_id]
             try:
-                self._hue.bridge.put(f"/{group_type}/{old_group['id']}", payload)
-                self.logger.info(f"Gerät {device_id} aus Gruppe {old_group['id']} entfernt.")
+                self._request("PUT", f"/{old_group['type']}/{old_group_id}", {"children": old_children})
+                topology.apply_change(old_group["type"], self._group_resource(old_group, old_children))
+                self.logger.info(f"Gerät {device_id} aus Gruppe {old_group_id} entfernt.")
             except Exception as e:
-                 self.logger.error(f"Fehler beim Entfernen von Gerät aus Gruppe {old_group['id']}: {e}", exc_info=True)
+                 self.logger.error(f"Fehler beim Entfernen von Gerät aus Gruppe {old_group_id}: {e}", exc_info=True)
 
-
-        # 3. Füge Gerät zur neuen Gruppe hinzu
-        new_group = next((g for g in all_groups if g['id'] == new_group_id), None)
+        # 2. Füge Gerät zur neuen Gruppe hinzu
+        new_group = topology.group(new_group_id)
         if new_group:
-            new_children = new_group.get('children', [])
-            if not any(child.get('rid') == device_id for child in new_children):
+            new_children = new_group["children"]
+            if not any(child.get("rid") == device_id for child in new_children):
                 new_children.append({"rid": device_id, "rtype": "device"})
-            
-            payload = {"children": new_children}
-            group_type = 'room' if 'archetype' in new_group.get('metadata', {}) else 'zone'
             try:
-                self._hue.bridge.put(f"/{group_type}/{new_group_id}", payload)
+                self._request("PUT", f"/{new_group['type']}/{new_group_id}", {"children": new_children})
+                topology.apply_change(new_group["type"], self._group_resource(new_group, new_children))
                 self.logger.info(f"Gerät {device_id} zu Gruppe {new_group_id} hinzugefügt.")
             except Exception as e:
-                 self.logger.error(f"Fehler beim Hinzufügen von Gerät zu Gruppe {new_group_id}: {e}", exc_info=True)
\ No newline at end of file
+                 self.logger.error(f"Fehler beim Hinzufügen von Gerät zu Gruppe {new_group_id}: {e}", exc_info=True)
+
+    def _group_resource(self, group: Dict, children: List[Dict]) -> Dict:
+        """Baut aus einem Topologie-Eintrag eine Ressource für BridgeTopology.apply_change."""
+        resource = {"id": group["id"], "type": group["type"], "metadata": {"name": group["name"]}, "children": children}
+        grouped_light_id = self._topology.grouped_light_for_group(group["id"])
+        if grouped_light_id:
+            resource["services"] = [{"rid": grouped_light_id, "rtype": "grouped_light"}]
+        return resource
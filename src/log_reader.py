@@ -0,0 +1,157 @@
+"""
+Liest die Log-Datei, ohne sie vollständig in den Speicher zu laden: die letzten
+Einträge werden blockweise vom Dateiende rückwärts gesucht, neue Einträge ab
+einem Byte-Offset (Cursor) vorwärts gelesen. Mehrzeilige Einträge (z.B.
+Tracebacks) werden ihrer Kopfzeile zugeordnet, damit Filter nach Level und
+Modul ganze Einträge liefern.
+"""
+import logging
+import re
+from typing import Iterable, List, Optional, Tuple
+
+# Kopfzeile im Textformat von AppLogger: "2026-01-01 12:00:00 - INFO - [core_logic.py:42] - ..."
+HEADER_PATTERN = re.compile(rb"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:,\d+)? - (\w+) - \[([\w.]+?)\.py:\d+\]")
+# JSON-Zeilen (log_format: json) mit fester Schlüsselreihenfolge, siehe src.logger.JsonFormatter.
+JSON_HEADER_PATTERN = re.compile(rb'^\{"time": "[^"]*", "level": "(\w+)", "module": "([\w.]+)"')
+
+BLOCK_SIZE = 64 * 1024
+
+
+class LogFilter:
+    """Mindest-Level (z.B. 'WARNING') und/oder erlaubte Module (ohne '.py')."""
+
+    def __init__(self, level: Optional[str] = None, modules: Optional[Iterable[str]] = None):
+        self.min_level = None
+        if level:
+            value = logging.getLevelName(level.upper())
+            if not isinstance(value, int):
+                raise ValueError(f"Unbekanntes Log-Level: {level}")
+            self.min_level = value
+        self.modules = {m.strip().removesuffix(".py") for m in modules or () if m.strip()} or None
+
+    @property
+    def active(self) -> bool:
+        return self.min_level is not None or self.modules is not None
+
+    def matches(self, header: Optional[re.Match]) -> bool:
+        """Zeilen ohne erkennbare Kopfzeile passen nur, wenn kein Filter gesetzt ist."""
+        if header is None:
+            return not self.active
+        if self.min_level is not None:
+            level = logging.getLevelName(header.group(1).decode("ascii"))
+            if not isinstance(level, int) or level < self.min_level:
+                return False
+        return self.modules is None or header.group(2).decode("ascii") in self.modules
+
+
+def _match_header(line: bytes) -> Optional[re.Match]:
+    return HEADER_PATTERN.match(line) or JSON_HEADER_PATTERN.match(line)
+
+
+def _decode(lines: List[bytes]) -> str:
+    return b"\n".join(lines).decode("utf-8", errors="replace")
+
+
+def read_tail(
+    log_file: str,
+    limit: int = 500,
+    before: Optional[int] = None,
+    log_filter: Optional[LogFilter] = None,
+    max_scan_bytes: int = 32 * 1024 * 1024,
+) -> Tuple[List[str], int, int]:
+    """
+    Die letzten `limit` passenden Einträge vor dem Offset `before` (Standard: Dateiende).
+    Liefert (Einträge in Dateireihenfolge, Offset des ältesten gelesenen Eintrags,
+    Dateigröße). Der zweite Wert dient als `before` für weiteres Zurückblättern,
+    der dritte als Cursor für read_since(). Nach max_scan_bytes wird abgebrochen.
+    """
+    log_filter = log_filter or LogFilter()
+    records: List[str] = []
+    continuation: List[bytes] = []
+    with open(log_file, "rb") as f:
+        size = f.seek(0, 2)
+        end = size if before is None else max(0, min(before, size))
+        pos = tail = start = end
+        buffer = b""
+
+        def take(line: bytes, line_start: int) -> bool:
+            nonlocal continuation, start
+            if not line:
+                return False
+            header = _match_header(line)
+            if header is None:
+                continuation.append(line)
+                return False
+            record, continuation = [line] + continuation[::-1], []
+            start = line_start
+            if log_filter.matches(header):
+                records.append(_decode(record))
+            return len(records) >= limit
+
+        done = False
+        while pos > 0 and not done and end - pos < max_scan_bytes:
+            read = min(BLOCK_SIZE, pos)
+            pos -= read
+            f.seek(pos)
+            buffer = f.read(read) + buffer
+            lines = buffer.split(b"\n")
+            buffer = lines.pop(0)
+            for line in reversed(lines):
+                line_start = tail - len(line)
+                tail = line_start - 1
+                if take(line, line_start):
+                    done = True
+                    break
+            else:
+                if not continuation:
+                    start = tail + 1
+        if not done and pos == 0:
+            take(buffer, 0)
+            start = 0
+            if continuation and not log_filter.active:
+                # Folgezeilen am Dateianfang, deren Kopfzeile fehlt (z.B. nach Rotation).
+                records.append(_decode(continuation[::-1]))
+    return records[::-1], start, size
+
+
+def read_since(
+    log_file: str,
+    offset: int,
+    log_filter: Optional[LogFilter] = None,
+    max_bytes: int = 1024 * 1024,
+) -> Tuple[List[str], int, bool]:
+    """
+    Vollständige Einträge ab Byte-Offset `offset`, höchstens max_bytes auf einmal.
+    Liefert (Einträge, neuer Cursor, zurückgesetzt). Ist die Datei kürzer als der
+    Cursor (Rotation/Kürzung), wird von vorn gelesen und 'zurückgesetzt' ist True.
+    Eine unvollständige letzte Zeile bleibt für den nächsten Aufruf stehen.
+    """
+    log_filter = log_filter or LogFilter()
+    with open(log_file, "rb") as f:
+        size = f.seek(0, 2)
+        reset = offset > size
+        if reset:
+            offset = 0
+        f.seek(offset)
+        data = f.read(min(size - offset, max_bytes))
+    complete = data.rfind(b"\n") + 1
+    if complete == 0 and len(data) < max_bytes:
+        return [], offset, reset
+    if complete:
+        data = data[:complete]
+
+    records: List[str] = []
+    current: List[bytes] = []
+    header = None
+    for line in data.rstrip(b"\n").split(b"\n"):
+        match = _match_header(line)
+        if match and current:
+            if log_filter.matches(header):
+                records.append(_decode(current))
+            current = []
+        if match or not current:
+            header = match
+        current.append(line)
+    if current and log_filter.matches(header):
+        records.append(_decode(current))
+    return records, offset + len(data), reset
@@ -1,25 +1,175 @@
 # src/logger.py
+import json
 import logging
-import sys
+import logging.handlers
+import multiprocessing.util
 import os
+import queue as queue_module
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+LOGGER_NAME = "HueRoutineAppLogger"
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - [%(module)s.py:%(lineno)d] - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class JsonFormatter(logging.Formatter):
+    """Ein JSON-Objekt pro Zeile; die Schlüsselreihenfolge ist fest (siehe src.log_reader)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "module": record.module,
+            "line": record.lineno,
+            "process": record.processName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class ModuleLevelFilter(logging.Filter):
+    """Mindest-Level je Modul (Dateiname ohne '.py'), sonst das Standard-Level."""
+
+    def __init__(self, default_level: int, module_levels: Optional[Dict[str, int]] = None):
+        super().__init__()
+        self.default_level = default_level
+        self.module_levels = module_levels or {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= self.module_levels.get(record.module, self.default_level)
+
+
+class RotatingLogFileHandler(logging.handlers.BaseRotatingHandler):
+    """
+    Rotiert bei Überschreiten von max_bytes und (falls daily) um Mitternacht.
+    Alte Dateien heißen app.log.<Zeitstempel>; es bleiben backup_count erhalten.
+    """
+
+    def __init__(self, filename: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                 daily: bool = True, encoding: str = "utf-8"):
+        super().__init__(filename, mode="a", encoding=encoding, delay=False)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.daily = daily
+        self.rollover_at = self._next_midnight()
+
+    @staticmethod
+    def _next_midnight() -> float:
+        tomorrow = datetime.now().date() + timedelta(days=1)
+        return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.daily and time.time() >= self.rollover_at:
+            return True
+        if self.max_bytes and self.stream is not None:
+            return self.stream.tell() + len(self.format(record)) + 1 >= self.max_bytes
+        return False
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")[:-3]
+        target, suffix = f"{self.baseFilename}.{stamp}", 1
+        while os.path.exists(target):
+            target, suffix = f"{self.baseFilename}.{stamp}.{suffix}", suffix + 1
+        if os.path.exists(self.baseFilename):
+            os.rename(self.baseFilename, target)
+        directory, base = os.path.split(self.baseFilename)
+        backups = sorted(name for name in os.listdir(directory or ".") if name.startswith(base + "."))
+        for name in backups[:max(0, len(backups) - self.backup_count)]:
+            os.remove(os.path.join(directory, name))
+        self.stream = self._open()
+        self.rollover_at = self._next_midnight()
+
+
+class _ForwardHandler(logging.Handler):
+    """Reicht bereits vorbereitete Einträge an die prozessübergreifende Queue weiter."""
+
+    def __init__(self, queue):
+        super().__init__()
+        self.queue = queue
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except Exception:
+            self.handleError(record)
+
+
+def _level(value, default: int = logging.INFO) -> int:
+    level = logging.getLevelName(str(value).upper()) if value is not None else default
+    return level if isinstance(level, int) else default
+
+
+def start_log_writer(queue, log_file: str = "data/app.log", settings: Optional[Dict] = None):
+    """
+    Startet den einzigen Schreiber für alle Prozesse: ein QueueListener liest die
+    Einträge aus der Queue und schreibt sie in die Log-Datei und auf stdout.
+    settings sind die globalen Einstellungen (log_format, log_max_bytes,
+    log_backup_count, log_rotate_daily). Beenden mit stop_log_writer().
+    """
+    settings = settings or {}
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+    text_formatter = logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
+
+    file_handler = RotatingLogFileHandler(
+        log_file,
+        max_bytes=settings.get("log_max_bytes", 10 * 1024 * 1024),
+        backup_count=settings.get("log_backup_count", 5),
+        daily=settings.get("log_rotate_daily", True),
+    )
+    file_handler.setFormatter(JsonFormatter() if settings.get("log_format") == "json" else text_formatter)
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(text_formatter)
+
+    listener = logging.handlers.QueueListener(queue, file_handler, console_handler)
+    listener.start()
+    return listener
+
+
+def stop_log_writer(listener):
+    """Reicht noch lokal gepufferte Einträge weiter und beendet dann den Schreiber."""
+    AppLogger._stop_forwarder()
+    listener.stop()
+
 
 class AppLogger:
     """
     Initialisiert und konfiguriert einen Logger, der sowohl in die Konsole
     als auch in eine Datei schreibt.
+    Mit queue schreibt der Logger nicht selbst, sondern legt die Einträge nur in
+    die Queue des gemeinsamen Schreibers (start_log_writer); der Aufruf kostet
+    dann nur wenige Mikrosekunden.
     """
 
-    def __init__(self, log_file="data/app.log", level=logging.INFO):
-        self.logger = logging.getLogger("HueRoutineAppLogger")
+    _forwarder = None
+    _forwarder_pid = None
+
+    @classmethod
+    def _stop_forwarder(cls):
+        """Leert die lokale Queue; ein vom Elternprozess geerbter Thread existiert hier nicht."""
+        if cls._forwarder is not None and cls._forwarder_pid == os.getpid():
+            cls._forwarder.stop()
+        cls._forwarder = None
+
+    def __init__(self, log_file="data/app.log", level=logging.INFO, queue=None, settings: Optional[Dict] = None):
+        self.logger = logging.getLogger(LOGGER_NAME)
+
+        if queue is not None:
+            self._attach_queue(queue, level, settings or {})
+            return
 
         if not self.logger.handlers:
             self.logger.setLevel(level)
             self.logger.propagate = False
 
-            formatter = logging.Formatter(
-                "%(asctime)s - %(levelname)s - [%(module)s.py:%(lineno)d] - %(message)s",
-                datefmt="%Y-%m-%d %H:%M:%S",
-            )
+            formatter = logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
 
             ch = logging.StreamHandler(sys.stdout)
             ch.setFormatter(formatter)
@@ -30,6 +180,29 @@ class AppLogger:
             fh.setFormatter(formatter)
             self.logger.addHandler(fh)
 
+    def _attach_queue(self, queue, level, settings: Dict):
+        """Ersetzt alle Handler (auch vom Elternprozess geerbte) durch einen QueueHandler."""
+        default_level = _level(settings.get("log_level"), level)
+        module_levels = {module: _level(value) for module, value in (settings.get("log_levels") or {}).items()}
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+        # Der Aufrufer legt nur in eine prozesslokale Queue; ein Hintergrund-Thread
+        # übernimmt das Weiterreichen an die Queue des Schreibers.
+        local_queue = queue_module.SimpleQueue()
+        AppLogger._stop_forwarder()
+        AppLogger._forwarder = logging.handlers.QueueListener(local_queue, _ForwardHandler(queue))
+        AppLogger._forwarder.start()
+        AppLogger._forwarder_pid = os.getpid()
+        # Läuft beim Prozessende vor dem Schließen der multiprocessing-Queues
+        # (Registrierungen werden in Kindprozessen verworfen, daher hier je Prozess).
+        multiprocessing.util.Finalize(None, AppLogger._stop_forwarder, exitpriority=100)
+        handler = logging.handlers.QueueHandler(local_queue)
+        # Nach Modul filtern, bevor der Eintrag die Queue erreicht.
+        handler.addFilter(ModuleLevelFilter(default_level, module_levels))
+        self.logger.addHandler(handler)
+        self.logger.setLevel(min([default_level, *module_levels.values()]))
+        self.logger.propagate = False
+
     def get_logger(self):
         """Gibt die konfigurierte Logger-Instanz zurück."""
         return self.logger
@@ -44,4 +217,5 @@ class AppLogger:
         self.logger.error(message, exc_info=exc_info)
 
     def debug(self, message):
-        self.logger.debug(message)
\ No newline at end of file
+        self.logger.debug(message)
+
@@ -0,0 +1,108 @@
+"""
+Laufzeitmessungen mit festem Speicherbedarf: Pro Messreihe werden nur die
+letzten N Dauern in einem Ringpuffer gehalten, dazu Zähler für Aufrufe und Fehler.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+
+OVERFLOW_KEY = "_weitere"
+
+
+class LatencyHistogram:
+    """Ringpuffer der letzten Dauern (ms) einer Messreihe."""
+
+    def __init__(self, window: int = 1024):
+        self._samples = deque(maxlen=window)
+        # Anzeigename der Messreihe (z.B. Name einer Automation), der Schlüssel bleibt die ID.
+        self.label: Optional[str] = None
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, duration_ms: float, error: bool = False):
+        self._samples.append(duration_ms)
+        self.calls += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        if error:
+            self.errors += 1
+
+    def snapshot(self) -> Dict:
+        samples = sorted(self._samples)
+
+        def percentile(p: float) -> float:
+            if not samples:
+                return 0.0
+            return round(samples[min(len(samples) - 1, int(len(samples) * p))], 2)
+
+        snapshot = {
+            "calls": self.calls,
+            "errors": self.errors,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(self.max_ms, 2),
+            "avg_ms": round(self.total_ms / self.calls, 2) if self.calls else 0.0,
+            "window": len(samples),
+        }
+        if self.label is not None:
+            snapshot["label"] = self.label
+        return snapshot
+
+
+class MetricsRegistry:
+    """
+    Messreihen gruppiert nach Art (z.B. 'automation', 'bridge') und Schlüssel.
+    Die Zahl der Messreihen je Gruppe ist begrenzt; weitere landen unter OVERFLOW_KEY.
+    """
+
+    def __init__(self, window: int = 1024, max_series: int = 256):
+        self.window = window
+        self.max_series = max_series
+        self._lock = threading.Lock()
+        self._groups: Dict[str, Dict[str, LatencyHistogram]] = {}
+
+    def record(self, group: str, key: str, duration_ms: float, error: bool = False, label: Optional[str] = None):
+        with self._lock:
+            series = self._groups.setdefault(group, {})
+            histogram = series.get(key)
+            if histogram is None:
+                if len(series) >= self.max_series:
+                    key = OVERFLOW_KEY
+                histogram = series.setdefault(key, LatencyHistogram(self.window))
+            if label is not None and key != OVERFLOW_KEY:
+                histogram.label = label
+            histogram.record(duration_ms, error)
+
+    @contextmanager
+    def measure(self, group: str, key: str, label: Optional[str] = None):
+        """Misst die Dauer des Blocks; Ausnahmen werden als Fehler gezählt und weitergereicht."""
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record(group, key, (time.perf_counter() - start) * 1000, error, label)
+
+    def remove(self, group: str, key: str):
+        with self._lock:
+            self._groups.get(group, {}).pop(key, None)
+
+    def retain(self, group: str, keys: Iterable[str]):
+        """Entfernt alle Messreihen der Gruppe außer den angegebenen."""
+        keep = set(keys)
+        with self._lock:
+            series = self._groups.get(group, {})
+            for key in [key for key in series if key not in keep]:
+                del series[key]
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict]]:
+        with self._lock:
+            return {group: {key: h.snapshot() for key, h in series.items()} for group, series in self._groups.items()}
@@ -2,7 +2,6 @@
 Repräsentiert einen Raum oder eine Zone der Hue Bridge
 und kapselt die Steuerungsbefehle für die zugehörige Lichtgruppe.
 """
-import time
 from src.hue_wrapper import HueBridge
 from src.logger import AppLogger
 
@@ -13,21 +12,23 @@ class Room:
         self.log = log
         self.name = name
         self.group_id = group_id
-        self.last_command_time = 0
 
-    def apply_state(self, state: dict, command_throttle_s: int = 1):
-        """Setzt den Zustand für die Lichtgruppe im Raum, mit einem Throttle."""
-        if not self.group_id or time.time() - self.last_command_time < command_throttle_s:
+    def apply_state(self, state: dict):
+        """
+        Setzt den Zustand für die Lichtgruppe im Raum. Die Ratenbegrenzung übernimmt
+        die Befehlswarteschlange der Bridge, die schnell aufeinanderfolgende Befehle
+        zusammenfasst, statt sie zu verwerfen.
+        """
+        if not self.group_id:
             return
         self.bridge.set_group_state(self.group_id, state)
-        self.last_command_time = time.time()
         self.log.debug(f"Raum '{self.name}' (Gruppe {self.group_id}) gesetzt auf: {state}")
 
     def _get_grouped_light_data(self) -> dict | None:
         """Holt die rohen Daten des zugehörigen GroupedLight-Services."""
         if not self.group_id: return None
-        all_gl = self.bridge.get_grouped_lights()
-        return next((gl for gl in all_gl if gl.get('owner', {}).get('rid') == self.group_id), None)
+        grouped_light_id = self.bridge.topology.grouped_light_for_group(self.group_id)
+        return self.bridge.get_resource_by_id('grouped_light', grouped_light_id) if grouped_light_id else None
 
     def is_any_light_on(self) -> bool | None:
         """Prüft, ob irgendein Licht in der Gruppe des Raumes an ist."""
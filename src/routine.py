@@ -6,6 +6,7 @@ konfigurierbaren Tageslicht-Routine für einen Raum.
 from datetime import datetime, time, timedelta
 from .daily_time_span import DailyTimeSpan
 from .logger import AppLogger
+from .runtime_cache import get_automation_id, config_fingerprint, encode_datetime, decode_datetime
 
 class Routine:
     """Verwaltet die Logik für eine einzelne Tageslicht-Routine."""
@@ -22,6 +23,8 @@ class Routine:
         self.log = log
         self.global_settings = global_settings
         self.enabled = config.get("enabled", True)
+        self.automation_id = get_automation_id(config)
+        self.config_fingerprint = config_fingerprint(config)
 
         daily_time_conf = config.get("daily_time", {})
         self.time_span = DailyTimeSpan(
@@ -35,6 +38,8 @@ class Routine:
         self.current_period = None
         self.is_in_motion_state = False
         self.last_motion_time = None
+        # Letzter gelesener Wert des Melders; die Wartezeit beginnt mit dem Ende der Bewegung.
+        self.motion_detected = False
         self.do_not_disturb_active = False
         self.last_scene_name = "N/A"
         self.last_trigger_check = None
@@ -54,35 +59,77 @@ class Routine:
             self.do_not_disturb_active = False
             if period_config and not period_config.get("motion_check"):
                 self._apply_scene(period_config.get("scene_name"))
-            return
-
-        if not period_config:
-            return
-
-        if self.sensor and period_config.get("motion_check"):
+        elif period_config and self.sensor and period_config.get("motion_check"):
             self._handle_motion(now, period_config)
 
-        if self.last_trigger_check is None or (now - self.last_trigger_check).total_seconds() > 60:
+        if period_config:
             self._check_triggers(now)
-            self.last_trigger_check = now
+        self.last_trigger_check = now
+
+    def next_deadline(self, now: datetime) -> datetime | None:
+        """
+        Nächster Zeitpunkt, zu dem run() etwas zu tun hat: Zeitraumwechsel,
+        Zeit-Trigger, Ablauf der Wartezeit nach Bewegung oder - ohne Eventstream -
+        die nächste Abfrage des Bewegungsmelders.
+        """
+        if not self.enabled:
+            return None
+
+        deadlines = [self.time_span.next_change(now)]
+        for trigger in self.config.get("triggers", []):
+            if trigger.get("type") != "time":
+                continue
+            trigger_time = self._get_trigger_time(trigger, now)
+            if trigger_time is None:
+                continue
+            if trigger_time <= now:
+                trigger_time += timedelta(days=(now - trigger_time).days + 1)
+            deadlines.append(trigger_time)
+
+        period_config = self.config.get(self.current_period) or {}
+        if self.sensor and period_config.get("motion_check"):
+            if self.is_in_motion_state and self.last_motion_time and not self.motion_detected:
+                deadlines.append(self.last_motion_time + timedelta(seconds=self._wait_seconds(period_config)))
+            if not self.sensor.is_event_driven():
+                deadlines.append(now + timedelta(seconds=self.global_settings.get("loop_interval_s", 1)))
+
+        return min(deadlines)
+
+    def watched_resources(self) -> set:
+        """Bridge-Ressourcen, deren Änderung diese Routine sofort fällig macht."""
+        if not self.sensor:
+            return set()
+        uses_motion = any(
+            isinstance(self.config.get(p), dict) and self.config[p].get("motion_check")
+            for p in ("morning", "day", "evening", "night")
+        )
+        motion_id = self.sensor.get_service_id("motion") if uses_motion else None
+        return {motion_id} if motion_id else set()
+
+    @staticmethod
+    def _wait_seconds(period_config: dict) -> int:
+        wait_time_conf = period_config.get("wait_time", {"min": 0, "sec": 5})
+        return wait_time_conf.get("min", 0) * 60 + wait_time_conf.get("sec", 5)
 
     def _handle_motion(self, now: datetime, period_config: dict):
         """Verarbeitet die Bewegungslogik."""
         has_motion = self.sensor.get_motion()
-        wait_time_conf = period_config.get("wait_time", {"min": 0, "sec": 5})
-        wait_seconds = wait_time_conf.get("min", 0) * 60 + wait_time_conf.get(
-            "sec", 5
-        )
+        wait_seconds = self._wait_seconds(period_config)
 
-        if has_motion:
+        if has_motion or self.motion_detected:
+            # Auch der Wechsel auf "keine Bewegung" zählt: Mit Eventstream läuft die
+            # Routine erst wieder, wenn die Bewegung endet, nicht bei jeder Abfrage.
             self.last_motion_time = now
+        self.motion_detected = has_motion
+
+        if has_motion:
             if not self.is_in_motion_state:
                 self.log.info(f"Routine '{self.name}': Bewegung erkannt.")
                 self.is_in_motion_state = True
                 self._apply_scene(period_config.get("x_scene_name"))
 
         elif self.is_in_motion_state and self.last_motion_time:
-            if now - self.last_motion_time > timedelta(seconds=wait_seconds):
+            if now - self.last_motion_time >= timedelta(seconds=wait_seconds):
                 self.log.info(
                     f"Routine '{self.name}': Wartezeit nach Bewegung abgelaufen."
                 )
@@ -99,26 +146,34 @@ class Routine:
             elif trigger.get("type") == "condition":
                 self._handle_conditional_trigger(trigger, now)
 
-    def _handle_time_trigger(self, trigger: dict, now: datetime):
-        """Verarbeitet einen Zeit-Trigger."""
-        trigger_time = None
+    def _get_trigger_time(self, trigger: dict, now: datetime) -> datetime | None:
+        """Zeitpunkt eines Zeit-Triggers am Tag von now."""
         t_time = trigger.get("time")
-        
         if isinstance(t_time, str) and ":" in t_time:
             try:
                 h, m = map(int, t_time.split(":"))
-                trigger_time = now.replace(hour=h, minute=m, second=0, microsecond=0)
+                return now.replace(hour=h, minute=m, second=0, microsecond=0)
             except ValueError:
                 self.log.warning(f"Ungültiges Zeitformat für Trigger: {t_time}")
-                return
-        
-        elif self.sun_times:
+                return None
+
+        if self.sun_times:
             event = trigger.get("event") # "sunrise" or "sunset"
             offset_minutes = trigger.get("offset_minutes", 0)
             if event in self.sun_times:
-                trigger_time = self.sun_times[event] + timedelta(minutes=offset_minutes)
+                return self.sun_times[event] + timedelta(minutes=offset_minutes)
+        return None
 
-        if trigger_time and trigger_time.hour == now.hour and trigger_time.minute == now.minute:
+    def _handle_time_trigger(self, trigger: dict, now: datetime):
+        """Führt einen Zeit-Trigger aus, wenn er seit dem letzten Durchlauf fällig wurde."""
+        trigger_time = self._get_trigger_time(trigger, now)
+        if trigger_time is None:
+            return
+        # Höchstens eine Minute zurückblicken, damit nach einem Neustart keine alten Trigger nachgeholt werden.
+        window_start = now - timedelta(minutes=1)
+        if self.last_trigger_check and self.last_trigger_check > window_start:
+            window_start = self.last_trigger_check
+        if window_start < trigger_time <= now:
             self.log.info(f"Routine '{self.name}': Zeit-Trigger '{trigger.get('name')}' wird ausgeführt.")
             self._apply_scene(trigger.get("scene_name"))
             
@@ -135,16 +190,35 @@ class Routine:
         scene_to_apply = self.scenes.get(scene_name)
         if scene_to_apply:
             self.log.info(f"Routine '{self.name}': Wende Szene '{scene_name}' an.")
-            throttle_s = self.global_settings.get("command_throttle_s", 1.0)
-            self.room.apply_state(
-                scene_to_apply.get_state(), command_throttle_s=throttle_s
-            )
+            self.room.apply_state(scene_to_apply.get_state())
             self.last_scene_name = scene_name
         else:
             self.log.warning(
                 f"Routine '{self.name}': Szene '{scene_name}' nicht gefunden."
             )
 
+    def export_state(self) -> dict:
+        """Laufzeitzustand für den Warmstart-Cache."""
+        return {
+            "current_period": self.current_period,
+            "is_in_motion_state": self.is_in_motion_state,
+            "last_motion_time": encode_datetime(self.last_motion_time),
+            "motion_detected": self.motion_detected,
+            "do_not_disturb_active": self.do_not_disturb_active,
+            "last_scene_name": self.last_scene_name,
+            "last_trigger_check": encode_datetime(self.last_trigger_check),
+        }
+
+    def restore_state(self, state: dict):
+        """Übernimmt einen Laufzeitzustand aus dem Warmstart-Cache."""
+        self.current_period = state.get("current_period")
+        self.is_in_motion_state = state.get("is_in_motion_state", False)
+        self.last_motion_time = decode_datetime(state.get("last_motion_time"))
+        self.motion_detected = state.get("motion_detected", False)
+        self.do_not_disturb_active = state.get("do_not_disturb_active", False)
+        self.last_scene_name = state.get("last_scene_name", "N/A")
+        self.last_trigger_check = decode_datetime(state.get("last_trigger_check"))
+
     def get_status(self) -> dict:
         """Gibt den aktuellen Status der Routine für die UI zurück."""
         motion_status = "Deaktiviert"
@@ -0,0 +1,113 @@
+"""
+Speichert einen versionierten Schnappschuss der Bridge-Topologie und des
+Laufzeitzustands aller Automationen auf der Festplatte, damit ein Neustart
+der Kernlogik ohne vollständigen Bridge-Abruf und ohne Zustandsverlust gelingt.
+"""
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+CACHE_VERSION = 1
+
+
+def get_automation_id(aut_conf: dict) -> str:
+    """Stabile ID einer Automation: das Feld 'id', sonst Typ und Name."""
+    if aut_conf.get("id"):
+        return str(aut_conf["id"])
+    return f"{aut_conf.get('type', 'routine')}:{aut_conf.get('name')}"
+
+
+def config_fingerprint(conf) -> str:
+    """Prüfsumme einer Konfiguration, um veraltete Laufzeitzustände zu erkennen."""
+    raw = json.dumps(conf, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def encode_datetime(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def decode_datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+class RuntimeCache:
+    """Liest und schreibt den Schnappschuss atomar als kompaktes JSON."""
+
+    def __init__(self, file_path: str, logger):
+        self.file_path = file_path
+        self.logger = logger
+        self._data: Dict = {}
+        self._last_written_states: Optional[str] = None
+        self._last_write = 0.0
+
+    def load(self) -> bool:
+        """Lädt den Schnappschuss; unbekannte Versionen und defekte Dateien werden verworfen."""
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (IOError, ValueError) as e:
+            self.logger.warning(f"Laufzeit-Cache konnte nicht gelesen werden: {e}")
+            return False
+        if data.get("version") != CACHE_VERSION:
+            self.logger.info("Laufzeit-Cache hat eine andere Version und wird ignoriert.")
+            return False
+        self._data = data
+        return True
+
+    def get_bridge_data(self, bridge_ip: str) -> Optional[Dict]:
+        """Zwischengespeicherte get_full_api_data()-Daten, sofern sie zu dieser Bridge gehören."""
+        bridge = self._data.get("bridge") or {}
+        if bridge.get("ip") != bridge_ip:
+            return None
+        return bridge.get("api_data") or None
+
+    def set_bridge_data(self, bridge_ip: str, api_data: Dict):
+        self._data["bridge"] = {"ip": bridge_ip, "api_data": api_data, "saved_at": datetime.now().isoformat()}
+        self._last_written_states = None
+
+    def get_automation_state(self, aut_id: str, fingerprint: str) -> Optional[Dict]:
+        """Laufzeitzustand einer Automation, falls ihre Konfiguration unverändert ist."""
+        entry = (self._data.get("automations") or {}).get(aut_id)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return None
+        return entry.get("state")
+
+    def save(self, automations, min_interval_s: float = 0, force: bool = False) -> bool:
+        """
+        Schreibt den Schnappschuss, wenn sich Laufzeitzustände geändert haben.
+        min_interval_s begrenzt die Schreibhäufigkeit (SD-Karten schonen).
+        """
+        if not force and time.monotonic() - self._last_write < min_interval_s:
+            return False
+        states = {
+            aut.automation_id: {"fingerprint": aut.config_fingerprint, "state": aut.export_state()}
+            for aut in automations
+            if getattr(aut, "automation_id", None)
+        }
+        serialized_states = json.dumps(states, sort_keys=True, default=str)
+        if not force and serialized_states == self._last_written_states:
+            return False
+
+        self._data.update({"version": CACHE_VERSION, "saved_at": datetime.now().isoformat(), "automations": states})
+        temp_file = self.file_path + ".tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, separators=(",", ":"), default=str)
+            os.replace(temp_file, self.file_path)
+        except (IOError, TypeError) as e:
+            self.logger.error(f"Fehler beim Schreiben des Laufzeit-Caches: {e}")
+            return False
+        self._last_written_states = serialized_states
+        self._last_write = time.monotonic()
+        return True
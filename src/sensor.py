@@ -11,29 +11,31 @@ class Sensor:
         self.bridge = bridge
         self.log = log
         self.device_id = device_id
-        self._device_data = None
-
-    def _get_device_data(self):
-        """Holt die Daten für das spezifische Gerät, falls noch nicht vorhanden."""
-        if not self._device_data:
-            if not self.bridge.is_connected():
-                return None
-            self._device_data = self.bridge.get_device_by_id(self.device_id)
-            if not self._device_data:
-                self.log.warning(f"Kein Gerät mit ID {self.device_id} gefunden.")
-        return self._device_data
+        self._missing_logged = False
 
     def _get_service_data(self, service_type: str):
         """Holt die vollen Daten eines spezifischen Services (z.B. motion) des Geräts."""
-        device = self._get_device_data()
-        if not device or 'services' not in device:
+        if not self.bridge.is_connected():
+            return None
+        topology = self.bridge.topology
+        if not topology.has_device(self.device_id):
+            if not self._missing_logged:
+                self.log.warning(f"Kein Gerät mit ID {self.device_id} gefunden.")
+                self._missing_logged = True
             return None
-        
-        service_ref = next((s for s in device['services'] if s.get('rtype') == service_type), None)
-        if not service_ref:
+
+        service_id = topology.service_id(self.device_id, service_type)
+        if not service_id:
             return None
-        
-        return self.bridge.get_resource_by_id(service_type, service_ref['rid'])
+        return self.bridge.get_resource_by_id(service_type, service_id)
+
+    def get_service_id(self, service_type: str) -> str | None:
+        """ID eines Services des Geräts (z.B. motion), um Änderungen zuzuordnen."""
+        return self.bridge.topology.service_id(self.device_id, service_type)
+
+    def is_event_driven(self) -> bool:
+        """True, solange Änderungen über den Eventstream gemeldet werden und kein Abfragen nötig ist."""
+        return self.bridge.has_live_events()
 
     def get_motion(self) -> bool:
         """Gibt True zurück, wenn eine Bewegung erkannt wird, sonst False."""
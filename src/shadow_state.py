@@ -0,0 +1,145 @@
+"""
+Hält den zuletzt bekannten Zustand jeder Lichtgruppe (grouped_light) und
+berechnet, welche Felder eines Zielzustands tatsächlich gesendet werden müssen.
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+# Felder im v1-Format, wie sie Scene.get_state() liefert.
+STATE_FIELDS = ("on", "bri", "ct", "hue", "sat")
+# Abweichungen, die durch die Umrechnung Prozent <-> 0..254 entstehen, ignorieren.
+BRI_TOLERANCE = 2
+
+
+def normalize_grouped_light(resource: Dict) -> Dict:
+    """Wandelt eine grouped_light-Ressource der v2 API in das v1-Format um."""
+    state = {}
+    if isinstance(resource.get("on"), dict) and "on" in resource["on"]:
+        state["on"] = bool(resource["on"]["on"])
+    brightness = (resource.get("dimming") or {}).get("brightness")
+    if brightness is not None:
+        state["bri"] = int(round(brightness / 100 * 254))
+    mirek = (resource.get("color_temperature") or {}).get("mirek")
+    if mirek is not None:
+        state["ct"] = int(mirek)
+    return state
+
+
+class ShadowState:
+    """Schattenkopie der Gruppenzustände, gespeist aus Bridge-Lesezugriffen, Events und gesendeten Befehlen."""
+
+    def __init__(self):
+        self._states: Dict[str, Dict] = {}
+        self._updated_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, grouped_light_id: str, resource: Dict):
+        """
+        Übernimmt einen von der Bridge gemeldeten (ggf. partiellen) Zustand.
+        Weicht er vom Schatten ab, wurde die Gruppe von außen geändert; Felder,
+        die die Bridge für Gruppen nicht meldet, gelten dann als unbekannt.
+        """
+        observed = normalize_grouped_light(resource)
+        if not observed:
+            return
+        with self._lock:
+            shadow = self._states.setdefault(grouped_light_id, {})
+            if any(not self._matches(field, shadow.get(field), value) for field, value in observed.items()):
+                for field in STATE_FIELDS:
+                    if field not in observed:
+                        shadow.pop(field, None)
+            shadow.update(observed)
+            self._updated_at[grouped_light_id] = time.monotonic()
+
+    def observe_member(self, grouped_light_id: str, light: Dict):
+        """
+        Übernimmt das Event eines einzelnen Lichts der Gruppe. Gruppen melden weder
+        Farbe noch Abweichungen einzelner Lichter; widerspricht das Licht dem
+        Schatten oder ist seine Farbe nicht prüfbar, wird der Schatten verworfen.
+        """
+        observed = normalize_grouped_light(light)
+        color_temperature = light.get("color_temperature") or {}
+        with self._lock:
+            shadow = self._states.get(grouped_light_id)
+            if not shadow:
+                return
+            color_mode = "hue" in shadow or "sat" in shadow
+            stale = (
+                any(field in shadow and not self._matches(field, shadow[field], value) for field, value in observed.items())
+                or ("ct" in observed and color_mode)
+                or ("ct" in shadow and color_temperature.get("mirek_valid") is False)
+                or ("color" in light and color_mode)
+            )
+            if stale:
+                self._states.pop(grouped_light_id, None)
+                self._updated_at.pop(grouped_light_id, None)
+
+    def record_sent(self, grouped_light_id: str, state: Dict):
+        """Übernimmt einen erfolgreich gesendeten Zustand."""
+        with self._lock:
+            shadow = self._states.setdefault(grouped_light_id, {})
+            for field in STATE_FIELDS:
+                if field in state:
+                    shadow[field] = state[field]
+            if "hue" in state:
+                shadow.pop("ct", None)
+            elif "ct" in state:
+                shadow.pop("hue", None)
+                shadow.pop("sat", None)
+            self._updated_at[grouped_light_id] = time.monotonic()
+
+    def invalidate(self, grouped_light_id: Optional[str] = None):
+        with self._lock:
+            if grouped_light_id is None:
+                self._states.clear()
+                self._updated_at.clear()
+            else:
+                self._states.pop(grouped_light_id, None)
+                self._updated_at.pop(grouped_light_id, None)
+
+    def get(self, grouped_light_id: str) -> Optional[Dict]:
+        with self._lock:
+            state = self._states.get(grouped_light_id)
+            return dict(state) if state is not None else None
+
+    def diff(self, grouped_light_id: str, desired: Dict, max_age_s: Optional[float] = None) -> Dict:
+        """
+        Gibt nur die Felder von 'desired' zurück, die vom Schatten abweichen.
+        Ein leeres Ergebnis bedeutet, dass nichts gesendet werden muss.
+        Übergangszeiten werden nur mitgesendet, wenn sich etwas ändert.
+        """
+        with self._lock:
+            shadow = self._states.get(grouped_light_id)
+            updated_at = self._updated_at.get(grouped_light_id, 0.0)
+            if shadow is not None and max_age_s is not None and time.monotonic() - updated_at > max_age_s:
+                shadow = None
+            shadow = dict(shadow) if shadow else {}
+
+        if desired.get("on") is False and shadow.get("on") is False:
+            return {}
+
+        changes = {}
+        for field in STATE_FIELDS:
+            if field in desired and not self._matches(field, shadow.get(field), desired[field]):
+                changes[field] = desired[field]
+        # Im ausgeschalteten Zustand meldet die Bridge Helligkeit und Farbe weiter;
+        # beim Einschalten wird deshalb immer der vollständige Zielzustand gesendet.
+        if changes.get("on") is True:
+            changes = {field: desired[field] for field in STATE_FIELDS if field in desired}
+        # Farbton und Sättigung ergeben zusammen eine xy-Farbe und werden nur gemeinsam gesendet.
+        if "hue" in changes or "sat" in changes:
+            changes.update({field: desired[field] for field in ("hue", "sat") if field in desired})
+        if changes:
+            for key, value in desired.items():
+                if key not in STATE_FIELDS:
+                    changes[key] = value
+        return changes
+
+    @staticmethod
+    def _matches(field: str, current, desired) -> bool:
+        if current is None:
+            return False
+        if field == "bri":
+            return abs(int(current) - int(desired)) <= BRI_TOLERANCE
+        return current == desired
@@ -2,14 +2,16 @@
 Repräsentiert eine zustandsbasierte Automation (Endlicher Automat).
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from .logger import AppLogger
+from .runtime_cache import get_automation_id, config_fingerprint, encode_datetime, decode_datetime
 
 class StateMachine:
     """Verwaltet die Logik für eine State-Machine-Automation."""
 
-    def __init__(self, name, config, log: AppLogger, bridge, sensors, rooms, scenes, **kwargs):
+    def __init__(self, name, config, log: AppLogger, bridge, sensors, rooms, scenes, global_settings=None, **kwargs):
         self.name = name
+        self.global_settings = global_settings or {}
         self.config = config
         self.log = log
         self.bridge = bridge
@@ -17,17 +19,23 @@ class StateMachine:
         self.rooms = rooms
         self.scenes = scenes
         self.enabled = config.get("enabled", True)
+        self.automation_id = get_automation_id(config)
+        self.config_fingerprint = config_fingerprint(config)
         self.current_state = config.get("initial_state")
         self.last_state_change = datetime.now()
-
-        # Initialen Zustand beim Start anwenden
-        self._apply_state_action(self.current_state)
+        # Der aktuelle Zustand wird beim ersten Durchlauf angewendet, damit ein
+        # aus dem Cache wiederhergestellter Zustand nicht zuerst überschrieben wird.
+        self._state_applied = False
 
     def run(self, now: datetime):
         """Führt einen Logik-Durchlauf des Automaten aus."""
         if not self.enabled:
             return
 
+        if not self._state_applied:
+            self._apply_state_action(self.current_state)
+            self._state_applied = True
+
         for transition in self.config.get("transitions", []):
             if transition.get("from") == self.current_state:
                 if self._check_conditions(transition.get("conditions", []), now):
@@ -38,6 +46,22 @@ class StateMachine:
                     # Wichtig: Nach einem erfolgreichen Übergang brechen wir ab.
                     break
 
+    def next_deadline(self, now: datetime) -> datetime | None:
+        """
+        Bedingungen von Übergängen aus dem aktuellen Zustand werden in festen
+        Abständen geprüft; ohne solche Übergänge wartet der Automat.
+        """
+        if not self.enabled:
+            return None
+        if not self._state_applied:
+            return now
+        if not any(t.get("from") == self.current_state for t in self.config.get("transitions", [])):
+            return None
+        return now + timedelta(seconds=self.global_settings.get("condition_interval_s", 10))
+
+    def watched_resources(self) -> set:
+        return set()
+
     def _check_conditions(self, conditions: list, now: datetime) -> bool:
         """Prüft, ob alle Bedingungen für einen Übergang erfüllt sind."""
         # Platzhalter für die Bedingungslogik
@@ -63,6 +87,17 @@ class StateMachine:
                 self.log.info(f"Automat '{self.name}': Wende Szene '{scene_name}' für Zustand '{state_name}' in Raum '{target_name}' an.")
                 room.apply_state(scene.get_state())
 
+    def export_state(self) -> dict:
+        """Laufzeitzustand für den Warmstart-Cache."""
+        return {"current_state": self.current_state, "last_state_change": encode_datetime(self.last_state_change)}
+
+    def restore_state(self, state: dict):
+        """Übernimmt einen Laufzeitzustand aus dem Warmstart-Cache."""
+        known_states = {s.get("name") for s in self.config.get("states", [])}
+        if state.get("current_state") in known_states:
+            self.current_state = state["current_state"]
+            self.last_state_change = decode_datetime(state.get("last_state_change")) or self.last_state_change
+
     def get_status(self) -> dict:
         """Gibt den aktuellen Status des Automaten für die UI zurück."""
         return {
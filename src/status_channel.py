@@ -0,0 +1,237 @@
+"""
+Überträgt den Status der Kernlogik über einen Unix-Socket an den Webserver.
+Die Kernlogik sendet nur Änderungen (versionierte Deltas); neue Verbindungen
+erhalten zuerst einen vollständigen Schnappschuss. Der Webserver hält den
+jeweils aktuellen Stand im Speicher.
+Nachrichten sind zeilenweise kompaktes JSON.
+"""
+import copy
+import json
+import os
+import queue
+import socket
+import threading
+import uuid
+import logging
+from typing import Callable, Dict, List, Optional
+
+
+def _encode(message: Dict) -> bytes:
+    return (json.dumps(message, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+
+class StatusPublisher:
+    """
+    Seite der Kernlogik: nimmt Verbindungen an und verteilt Deltas an alle Abonnenten.
+    Gesendet wird in einem eigenen Thread, damit ein langsamer Webserver die
+    Hauptschleife nicht aufhält; die Reihenfolge der Nachrichten bleibt erhalten.
+    """
+
+    def __init__(self, socket_path: str, logger: Optional[logging.Logger] = None):
+        self.socket_path = socket_path
+        self.logger = logger or logging.getLogger(__name__)
+        # Unterscheidet Versionen verschiedener Prozessläufe (z.B. für ETags).
+        self.epoch = uuid.uuid4().hex[:8]
+        self.version = 0
+        self._order: List[str] = []
+        self._automations: Dict[str, Dict] = {}
+        self._extras: Dict = {}
+        self._clients: List[socket.socket] = []
+        self._lock = threading.Lock()
+        self._server: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        # (neuer Abonnent oder None für alle, Daten); None beendet den Sende-Thread.
+        self._outbox: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._server is not None:
+            return
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+        try:
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(self.socket_path)
+            server.listen(8)
+        except OSError as e:
+            self.logger.error(f"Status-Socket konnte nicht geöffnet werden: {e}")
+            return
+        self._server = server
+        self._thread = threading.Thread(target=self._accept_loop, name="status-publisher", daemon=True)
+        self._thread.start()
+        self._writer = threading.Thread(target=self._write_loop, name="status-writer", daemon=True)
+        self._writer.start()
+
+    def stop(self):
+        server, self._server = self._server, None
+        if server:
+            server.close()
+        writer, self._writer = self._writer, None
+        if writer:
+            self._outbox.put(None)
+            writer.join(timeout=2)
+        with self._lock:
+            for client in self._clients:
+                client.close()
+            self._clients = []
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+    def publish(self, automations: Dict[str, Dict], extras: Dict) -> bool:
+        """
+        Übernimmt den aktuellen Status ({ID: get_status()} in Anzeigereihenfolge und
+        übrige Felder). Gesendet wird nur, was sich seit dem letzten Aufruf geändert hat.
+        """
+        order = list(automations)
+        changed = {aut_id: status for aut_id, status in automations.items() if self._automations.get(aut_id) != status}
+        removed = [aut_id for aut_id in self._automations if aut_id not in automations]
+        changed_extras = {key: value for key, value in extras.items() if self._extras.get(key) != value}
+        removed_extras = [key for key in self._extras if key not in extras]
+        if not changed and not removed and not changed_extras and not removed_extras and order == self._order:
+            return False
+
+        delta = {"type": "delta", "automations": changed, "removed": removed,
+                 "extras": changed_extras, "removed_extras": removed_extras}
+        if order != self._order:
+            delta["order"] = order
+        with self._lock:
+            self.version += 1
+            delta["version"] = self.version
+            self._automations = copy.deepcopy(automations)
+            self._extras = copy.deepcopy(extras)
+            self._order = order
+            if self._writer is not None:
+                self._outbox.put((None, _encode(delta)))
+        return True
+
+    def _snapshot_message(self) -> Dict:
+        return {"type": "snapshot", "epoch": self.epoch, "version": self.version, "order": self._order,
+                "automations": self._automations, "extras": self._extras}
+
+    def _write_loop(self):
+        """
+        Arbeitet die Nachrichten der Reihe nach ab. Neue Abonnenten erhalten ihren
+        Schnappschuss an der Stelle, an der er erstellt wurde, und danach nur die
+        späteren Deltas. Hängende Verbindungen werden getrennt.
+        """
+        while True:
+            item = self._outbox.get()
+            if item is None:
+                return
+            new_client, data = item
+            with self._lock:
+                targets = [new_client] if new_client else list(self._clients)
+            for client in targets:
+                try:
+                    client.sendall(data)
+                except OSError:
+                    client.close()
+                    with self._lock:
+                        if client in self._clients:
+                            self._clients.remove(client)
+                    continue
+                if client is new_client:
+                    with self._lock:
+                        self._clients.append(client)
+
+    def _accept_loop(self):
+        while self._server is not None:
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                return
+            client.settimeout(1.0)
+            with self._lock:
+                self._outbox.put((client, _encode(self._snapshot_message())))
+
+
+class StatusSubscriber:
+    """
+    Seite des Webservers: verbindet sich mit der Kernlogik, wendet Schnappschüsse
+    und Deltas an und stellt den aktuellen Stand aus dem Speicher bereit.
+    """
+
+    def __init__(self, socket_path: str, logger: Optional[logging.Logger] = None, retry_delay_s: float = 2.0):
+        self.socket_path = socket_path
+        self.logger = logger or logging.getLogger(__name__)
+        self.retry_delay_s = retry_delay_s
+        self.epoch = None
+        self.version = 0
+        self.connected = False
+        self._order: List[str] = []
+        self._automations: Dict[str, Dict] = {}
+        self._extras: Dict = {}
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[Dict], None]] = []
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "StatusSubscriber":
+        if not (self._thread and self._thread.is_alive()):
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="status-subscriber", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+
+    def add_listener(self, listener: Callable[[Dict], None]):
+        """Wird nach jeder angewendeten Nachricht mit dieser Nachricht aufgerufen."""
+        self._listeners.append(listener)
+
+    def get_status(self) -> Dict:
+        """Aktueller Status im Format der früheren status.json, ergänzt um 'version' (Lauf-Version)."""
+        with self._lock:
+            status = {"automations": [self._automations[a] for a in self._order if a in self._automations],
+                      "sun_times": {}}
+            status.update(self._extras)
+            status["version"] = f"{self.epoch}-{self.version}"
+            return status
+
+    def get_snapshot(self) -> Dict:
+        """Vollständiger Stand im Format der Socket-Nachrichten (Basis für weitergereichte Deltas)."""
+        with self._lock:
+            return copy.deepcopy({"epoch": self.epoch, "version": self.version, "order": self._order,
+                                  "automations": self._automations, "extras": self._extras})
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.connect(self.socket_path)
+                    self.connected = True
+                    with sock.makefile("r", encoding="utf-8") as stream:
+                        for line in stream:
+                            self._apply(json.loads(line))
+            except (OSError, ValueError):
+                pass
+            self.connected = False
+            self._stop_event.wait(self.retry_delay_s)
+
+    def _apply(self, message: Dict):
+        with self._lock:
+            if message.get("type") == "snapshot":
+                self.epoch = message.get("epoch")
+                self._order = message.get("order", [])
+                self._automations = message.get("automations", {})
+                self._extras = message.get("extras", {})
+            else:
+                self._automations.update(message.get("automations", {}))
+                for aut_id in message.get("removed", []):
+                    self._automations.pop(aut_id, None)
+                self._extras.update(message.get("extras", {}))
+                for key in message.get("removed_extras", []):
+                    self._extras.pop(key, None)
+                if "order" in message:
+                    self._order = message["order"]
+            self.version = message.get("version", self.version)
+        for listener in list(self._listeners):
+            try:
+                listener(message)
+            except Exception as e:
+                self.logger.error(f"Fehler in einem Status-Beobachter: {e}", exc_info=True)
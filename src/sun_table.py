@@ -0,0 +1,180 @@
+"""
+Vorberechnete Sonnenzeiten (Dämmerungsbeginn, Sonnenaufgang, Mittag,
+Sonnenuntergang, Dämmerungsende) für ein ganzes Jahr und einen Standort.
+Die Tabelle wird auf der Festplatte zwischengespeichert; Abfragen erfolgen
+per Datum in konstanter Zeit.
+"""
+import json
+import os
+import threading
+from collections.abc import Mapping
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from astral import LocationInfo
+from astral import sun as astral_sun
+
+SUN_EVENTS = ("dawn", "sunrise", "noon", "sunset", "dusk")
+TABLE_VERSION = 2
+
+
+def system_timezone() -> str:
+    """Name der Systemzeitzone (TZ, /etc/timezone oder /etc/localtime), sonst 'UTC'."""
+    candidates = [os.environ.get("TZ", "").lstrip(":")]
+    try:
+        with open("/etc/timezone", "r", encoding="utf-8") as f:
+            candidates.append(f.read().strip())
+    except OSError:
+        pass
+    if os.path.islink("/etc/localtime"):
+        candidates.append(os.path.realpath("/etc/localtime").partition("zoneinfo/")[2])
+    for name in candidates:
+        if not name:
+            continue
+        try:
+            ZoneInfo(name)
+            return name
+        except (ZoneInfoNotFoundError, ValueError):
+            continue
+    return "UTC"
+
+
+class SunTable:
+    """
+    Sonnenzeiten je Kalendertag; ein neues Jahr wird bei Bedarf berechnet.
+    Ohne Angabe gilt die Zeitzone des Systems, wie im Rest der Hauptschleife.
+    """
+
+    def __init__(self, latitude: float, longitude: float, timezone: Optional[str] = None,
+                 cache_file: Optional[str] = None, logger=None):
+        self.location = LocationInfo("Home", "", timezone or system_timezone(), latitude, longitude)
+        self.cache_file = cache_file
+        self.logger = logger
+        self._years: Dict[int, Dict[date, Dict[str, Optional[datetime]]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, day: date) -> Dict[str, Optional[datetime]]:
+        """Sonnenzeiten eines Tages; Ereignisse ohne Zeitpunkt (Polartag/-nacht) sind None."""
+        year = self._years.get(day.year)
+        if year is None:
+            with self._lock:
+                year = self._years.get(day.year) or self._load_year(day.year)
+        return year.get(day, {})
+
+    def _load_year(self, year: int) -> Dict[date, Dict[str, Optional[datetime]]]:
+        table = self._read_cache(year)
+        if table is None:
+            table = self._compute_year(year)
+            self._write_cache(year, table)
+        # Höchstens das angefragte und das vorherige Jahr im Speicher halten.
+        self._years = {y: t for y, t in self._years.items() if y == year - 1}
+        self._years[year] = table
+        return table
+
+    def _compute_year(self, year: int) -> Dict[date, Dict[str, Optional[datetime]]]:
+        """Berechnet alle Tage des Jahres in einem Durchlauf."""
+        observer, tz = self.location.observer, self.location.timezone
+        table = {}
+        day = date(year, 1, 1)
+        while day.year == year:
+            try:
+                table[day] = astral_sun.sun(observer, date=day, tzinfo=tz)
+            except ValueError:
+                # Kein Sonnenauf- oder -untergang an diesem Tag: einzeln berechnen, was existiert.
+                table[day] = self._compute_day_partial(day)
+            day += timedelta(days=1)
+        return {d: {event: times.get(event) for event in SUN_EVENTS} for d, times in table.items()}
+
+    def _compute_day_partial(self, day: date) -> Dict[str, Optional[datetime]]:
+        times = {}
+        for event in SUN_EVENTS:
+            try:
+                times[event] = getattr(astral_sun, event)(self.location.observer, date=day, tzinfo=self.location.timezone)
+            except ValueError:
+                times[event] = None
+        return times
+
+    def _cache_key(self) -> Dict:
+        return {
+            "version": TABLE_VERSION, "timezone": self.location.timezone,
+            "latitude": self.location.latitude, "longitude": self.location.longitude,
+        }
+
+    def _read_years(self) -> Dict[str, Dict]:
+        """Zwischengespeicherte Jahre (Jahr -> Tage), sofern sie zu Standort und Format passen."""
+        if not self.cache_file:
+            return {}
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("key") != self._cache_key():
+            return {}
+        return data.get("years") or {}
+
+    def _read_cache(self, year: int) -> Optional[Dict[date, Dict[str, Optional[datetime]]]]:
+        days = self._read_years().get(str(year))
+        if not days:
+            return None
+        try:
+            return {
+                date.fromisoformat(day): {
+                    event: datetime.fromisoformat(value) if value else None
+                    for event, value in zip(SUN_EVENTS, values)
+                }
+                for day, values in days.items()
+            }
+        except (AttributeError, ValueError, TypeError):
+            return None
+
+    def _write_cache(self, year: int, table: Dict[date, Dict[str, Optional[datetime]]]):
+        """
+        Ergänzt das Jahr in der Cache-Datei. Benachbarte Jahre bleiben erhalten, damit
+        der Blick auf das nächste Jahr (z.B. am 31.12.) das laufende nicht verdrängt.
+        """
+        if not self.cache_file:
+            return
+        years = {y: days for y, days in self._read_years().items() if y.isdigit() and abs(int(y) - year) <= 1}
+        years[str(year)] = {
+            day.isoformat(): [times[e].isoformat() if times.get(e) else None for e in SUN_EVENTS]
+            for day, times in table.items()
+        }
+        data = {"key": self._cache_key(), "events": list(SUN_EVENTS), "years": years}
+        try:
+            with open(self.cache_file + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(self.cache_file + ".tmp", self.cache_file)
+        except IOError as e:
+            if self.logger:
+                self.logger.warning(f"Sonnenzeiten-Tabelle konnte nicht gespeichert werden: {e}")
+
+
+class DailySunTimes(Mapping):
+    """
+    Sonnenzeiten des jeweils aktuellen Tages als Mapping ('sunrise', 'sunset', ...).
+    Jeder Zugriff liest den heutigen Eintrag der Tabelle, daher wechseln die Werte
+    um Mitternacht ohne Neuberechnung.
+    """
+
+    def __init__(self, table: SunTable):
+        self.table = table
+
+    def for_date(self, day: date) -> Dict[str, Optional[datetime]]:
+        return self.table.get(day)
+
+    def _today(self) -> Dict[str, Optional[datetime]]:
+        return self.table.get(date.today())
+
+    def __getitem__(self, event: str) -> datetime:
+        value = self._today().get(event)
+        if value is None:
+            raise KeyError(event)
+        return value
+
+    def __iter__(self):
+        return (event for event, value in self._today().items() if value is not None)
+
+    def __len__(self) -> int:
+        return sum(1 for value in self._today().values() if value is not None)
@@ -0,0 +1,352 @@
+"""
+Zeichnet Sensordaten (Helligkeit, Temperatur, Bewegung) in der Tabelle
+'measurements' auf. Messwerte werden im Speicher gepuffert und von einem
+eigenen Thread gebündelt in einer Transaktion geschrieben, damit die
+Automationen nie auf die Datenbank warten.
+In derselben Transaktion werden die Verdichtungstabellen (5 Minuten, Stunde,
+Tag) fortgeschrieben, und zwar nur mit tatsächlich neu eingefügten Zeilen;
+alte Rohdaten werden regelmäßig gelöscht.
+"""
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+INSERT_SQL = "INSERT OR IGNORE INTO measurements (timestamp, sensor_id, measurement_type, value) VALUES (?, ?, ?, ?)"
+
+# Verdichtungsstufen: Tabelle -> Länge des Zeitfensters in Sekunden. Die Fenster
+# werden als ISO-Zeitstempel ihres Beginns gespeichert (z.B. '2026-03-01T14:05:00').
+ROLLUPS = {
+    "measurements_5min": 300,
+    "measurements_hourly": 3600,
+    "measurements_daily": 86400,
+}
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS measurements (
+        timestamp TEXT NOT NULL, sensor_id TEXT NOT NULL,
+        measurement_type TEXT NOT NULL, value REAL NOT NULL,
+        PRIMARY KEY (timestamp, sensor_id, measurement_type)
+    )
+    """,
+    # Verlaufsabfragen filtern nach Sensor und Messart und dann nach Zeitraum.
+    """
+    CREATE INDEX IF NOT EXISTS idx_measurements_sensor_type_time
+        ON measurements (sensor_id, measurement_type, timestamp)
+    """,
+) + tuple(
+    f"""
+    CREATE TABLE IF NOT EXISTS {table} (
+        bucket TEXT NOT NULL, sensor_id TEXT NOT NULL, measurement_type TEXT NOT NULL,
+        min REAL NOT NULL, max REAL NOT NULL, sum REAL NOT NULL, count INTEGER NOT NULL,
+        PRIMARY KEY (sensor_id, measurement_type, bucket)
+    ) WITHOUT ROWID
+    """
+    for table in ROLLUPS
+)
+
+ROLLUP_UPSERT_SQL = {
+    table: f"""
+    INSERT INTO {table} (bucket, sensor_id, measurement_type, min, max, sum, count)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (sensor_id, measurement_type, bucket) DO UPDATE SET
+        min = min({table}.min, excluded.min), max = max({table}.max, excluded.max),
+        sum = {table}.sum + excluded.sum, count = {table}.count + excluded.count
+    """
+    for table in ROLLUPS
+}
+
+# Standard-Aufbewahrung in Tagen; None = unbegrenzt.
+DEFAULT_RETENTION_DAYS = {
+    "measurements": 30,
+    "measurements_5min": 180,
+    "measurements_hourly": 730,
+    "measurements_daily": None,
+}
+
+# WAL erlaubt gleichzeitiges Lesen durch den Webserver; NORMAL genügt mit WAL für Konsistenz.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+def connect(db_file: str) -> sqlite3.Connection:
+    """Öffnet eine Verbindung mit den für die Messdaten abgestimmten Einstellungen."""
+    con = sqlite3.connect(db_file, timeout=5, check_same_thread=False)
+    for pragma in PRAGMAS:
+        con.execute(pragma)
+    return con
+
+
+def timestamp_now() -> str:
+    return datetime.now().isoformat(timespec="milliseconds")
+
+
+def bucket_start(timestamp: str, seconds: int) -> str:
+    """Beginn des Zeitfensters, in das ein ISO-Zeitstempel fällt (ohne Datumsumrechnung)."""
+    if seconds >= 86400:
+        return timestamp[:10] + "T00:00:00"
+    if seconds >= 3600:
+        return timestamp[:13] + ":00:00"
+    minute = int(timestamp[14:16]) // (seconds // 60) * (seconds // 60)
+    return f"{timestamp[:14]}{minute:02d}:00"
+
+
+def _bucket_sql(seconds: int) -> str:
+    """SQL-Gegenstück zu bucket_start() für die Spalte 'timestamp'."""
+    if seconds >= 86400:
+        return "substr(timestamp, 1, 10) || 'T00:00:00'"
+    if seconds >= 3600:
+        return "substr(timestamp, 1, 13) || ':00:00'"
+    step = seconds // 60
+    return f"substr(timestamp, 1, 14) || printf('%02d', CAST(substr(timestamp, 15, 2) AS INTEGER) / {step} * {step}) || ':00'"
+
+
+def aggregate(batch: Iterable[Tuple[str, str, str, float]], seconds: int) -> List[Tuple]:
+    """Fasst Zeilen je (Fenster, Sensor, Messart) zu (min, max, Summe, Anzahl) zusammen."""
+    groups: Dict[Tuple[str, str, str], List] = {}
+    for timestamp, sensor_id, kind, value in batch:
+        key = (bucket_start(timestamp, seconds), sensor_id, kind)
+        group = groups.get(key)
+        if group is None:
+            groups[key] = [value, value, value, 1]
+        else:
+            if value < group[0]:
+                group[0] = value
+            if value > group[1]:
+                group[1] = value
+            group[2] += value
+            group[3] += 1
+    return [key + tuple(group) for key, group in groups.items()]
+
+
+def init_schema(con: sqlite3.Connection, logger: Optional[logging.Logger] = None):
+    """
+    Legt Roh- und Verdichtungstabellen an, stellt auf inkrementelles Vacuum um und
+    füllt leere Verdichtungstabellen einmalig aus den vorhandenen Rohdaten.
+    """
+    logger = logger or logging.getLogger(__name__)
+    if con.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        # Wirkt bei einer bestehenden Datei erst nach einem vollständigen VACUUM (einmalig).
+        con.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        if con.execute("SELECT 1 FROM sqlite_master WHERE name = 'measurements'").fetchone():
+            logger.info("Stelle Messdaten-Datenbank auf inkrementelles Vacuum um...")
+            con.execute("VACUUM")
+    with con:
+        for statement in SCHEMA:
+            con.execute(statement)
+        for table, seconds in ROLLUPS.items():
+            if con.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+                continue
+            con.execute(
+                f"""
+                INSERT INTO {table} (bucket, sensor_id, measurement_type, min, max, sum, count)
+                SELECT {_bucket_sql(seconds)} AS b, sensor_id, measurement_type, min(value), max(value), sum(value), count(*)
+                FROM measurements GROUP BY b, sensor_id, measurement_type
+                """
+            )
+
+
+class TelemetryRecorder:
+    """
+    record() legt Zeilen nur in einen Puffer. Der Schreib-Thread leert ihn, sobald
+    batch_size Zeilen vorliegen oder spätestens nach flush_interval_s. Läuft der
+    Puffer über max_buffer, werden die ältesten Zeilen verworfen und gezählt.
+    Etwa alle maintenance_interval_s löscht der Thread Daten, die älter als die
+    Aufbewahrungsdauer ihrer Tabelle sind, und gibt freie Seiten zurück.
+    """
+
+    DELETE_CHUNK = 5000
+
+    def __init__(
+        self,
+        db_file: str,
+        logger: Optional[logging.Logger] = None,
+        batch_size: int = 1000,
+        flush_interval_s: float = 5.0,
+        max_buffer: int = 100_000,
+        maintenance_interval_s: float = 3600.0,
+    ):
+        self.db_file = db_file
+        self.logger = logger or logging.getLogger(__name__)
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.maintenance_interval_s = maintenance_interval_s
+        self.retention_days = dict(DEFAULT_RETENTION_DAYS)
+        self._buffer = deque(maxlen=max_buffer)
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+        self.rows_deleted = 0
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout_s: float = 5.0):
+        """Schreibt den restlichen Puffer und beendet den Schreib-Thread."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=timeout_s)
+            self._thread = None
+
+    def set_retention(self, retention_days: Dict[str, Optional[float]]):
+        """Übernimmt Aufbewahrungsdauern je Tabelle (Tage, None = unbegrenzt)."""
+        self.retention_days.update({t: d for t, d in retention_days.items() if t in DEFAULT_RETENTION_DAYS})
+
+    def record(self, sensor_id: str, measurement_type: str, value: float, timestamp: Optional[str] = None):
+        self.record_many([(timestamp or timestamp_now(), sensor_id, measurement_type, value)])
+
+    def record_many(self, rows: Iterable[Tuple[str, str, str, float]]):
+        """Nimmt Zeilen (timestamp, sensor_id, measurement_type, value) entgegen, ohne zu blockieren."""
+        with self._cond:
+            for row in rows:
+                if len(self._buffer) == self._buffer.maxlen:
+                    self.rows_dropped += 1
+                self._buffer.append(row)
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+
+    def get_stats(self) -> Dict:
+        with self._cond:
+            pending = len(self._buffer)
+        return {
+            "pending": pending, "written": self.rows_written, "dropped": self.rows_dropped,
+            "flushes": self.flushes, "last_flush_ms": round(self.last_flush_ms, 2),
+            "deleted": self.rows_deleted,
+        }
+
+    def _run(self):
+        try:
+            con = connect(self.db_file)
+        except sqlite3.Error as e:
+            self.logger.error(f"Messdaten-Datenbank konnte nicht geöffnet werden: {e}")
+            return
+        next_maintenance = time.monotonic() + 60
+        try:
+            while True:
+                with self._cond:
+                    deadline = time.monotonic() + self.flush_interval_s
+                    while not self._stopping and len(self._buffer) < self.batch_size:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    batch = list(self._buffer)
+                    self._buffer.clear()
+                    stopping = self._stopping
+                if batch:
+                    self._flush(con, batch)
+                if not stopping and time.monotonic() >= next_maintenance:
+                    self._maintain(con)
+                    next_maintenance = time.monotonic() + self.maintenance_interval_s
+                if stopping:
+                    return
+        finally:
+            con.close()
+
+    def _flush(self, con: sqlite3.Connection, batch):
+        start = time.perf_counter()
+        try:
+            with con:
+                # Bereits vorhandene Zeilen (gleicher Zeitstempel, Sensor, Messart) werden
+                # übersprungen und dürfen auch nicht in die Verdichtung eingehen.
+                cursor = con.cursor()
+                inserted = [row for row in batch if cursor.execute(INSERT_SQL, row).rowcount]
+                for table, seconds in ROLLUPS.items():
+                    con.executemany(ROLLUP_UPSERT_SQL[table], aggregate(inserted, seconds))
+        except sqlite3.Error as e:
+            self.logger.error(f"Fehler beim Schreiben von {len(batch)} Messwerten: {e}")
+            return
+        self.rows_written += len(inserted)
+        self.flushes += 1
+        self.last_flush_ms = (time.perf_counter() - start) * 1000
+
+    def _maintain(self, con: sqlite3.Connection):
+        """Löscht abgelaufene Zeilen in kleinen Transaktionen und gibt den Platz frei."""
+        deleted = 0
+        try:
+            for table, days in self.retention_days.items():
+                if not days:
+                    continue
+                cutoff = (datetime.now() - timedelta(days=days)).isoformat(timespec="milliseconds")
+                if table == "measurements":
+                    # Rohdaten in Blöcken löschen, damit der Webserver nicht lange blockiert wird.
+                    sql = (f"DELETE FROM measurements WHERE rowid IN "
+                           f"(SELECT rowid FROM measurements WHERE timestamp < ? LIMIT {self.DELETE_CHUNK})")
+                else:
+                    sql = f"DELETE FROM {table} WHERE bucket < ?"
+                while True:
+                    with con:
+                        count = con.execute(sql, (cutoff,)).rowcount
+                    deleted += count
+                    if table != "measurements" or count < self.DELETE_CHUNK:
+                        break
+            if deleted:
+                con.execute("PRAGMA incremental_vacuum")
+                self.logger.info(f"{deleted} abgelaufene Messwerte gelöscht.")
+        except sqlite3.Error as e:
+            self.logger.error(f"Fehler beim Aufräumen der Messdaten: {e}")
+        self.rows_deleted += deleted
+
+
+class SensorSampler:
+    """Liest in festen Abständen alle Bewegungsmelder aus und übergibt die Werte dem Recorder."""
+
+    def __init__(self, sensors: Dict, recorder: TelemetryRecorder, interval_s: float = 60.0,
+                 logger: Optional[logging.Logger] = None):
+        self.sensors = sensors
+        self.recorder = recorder
+        self.interval_s = interval_s
+        self.logger = logger or logging.getLogger(__name__)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="sensor-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def sample(self):
+        timestamp = timestamp_now()
+        rows = []
+        for sensor_id, sensor in list(self.sensors.items()):
+            readings = (
+                ("brightness", sensor.get_brightness()),
+                ("temperature", sensor.get_temperature()),
+                ("motion", sensor.get_motion()),
+            )
+            rows.extend((timestamp, sensor_id, kind, float(value)) for kind, value in readings if value is not None)
+        self.recorder.record_many(rows)
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_s):
+            try:
+                self.sample()
+            except Exception as e:
+                self.logger.error(f"Fehler beim Auslesen der Sensoren: {e}", exc_info=True)
@@ -3,6 +3,7 @@ Repräsentiert eine Timer-basierte Automation.
 """
 from datetime import datetime, timedelta
 from .logger import AppLogger
+from .runtime_cache import get_automation_id, config_fingerprint, encode_datetime, decode_datetime
 
 class Timer:
     """Verwaltet die Logik für eine Timer-Automation."""
@@ -15,6 +16,8 @@ class Timer:
         self.rooms = rooms
         self.scenes = scenes
         self.enabled = config.get("enabled", True)
+        self.automation_id = get_automation_id(config)
+        self.config_fingerprint = config_fingerprint(config)
         self.is_active = False
         self.end_time = None
 
@@ -36,6 +39,15 @@ class Timer:
             self.is_active = False
             self.end_time = None
 
+    def next_deadline(self, now: datetime) -> datetime | None:
+        """Ablaufzeitpunkt des laufenden Timers."""
+        if not self.enabled or not self.is_active:
+            return None
+        return self.end_time
+
+    def watched_resources(self) -> set:
+        return set()
+
     def _check_triggers(self) -> bool:
         """Prüft die Startbedingungen des Timers."""
         # Platzhalter für die Trigger-Logik
@@ -57,6 +69,15 @@ class Timer:
                 self.log.info(f"Timer '{self.name}': Zeit abgelaufen. Führe Aktion für Raum '{target_name}' aus.")
                 room.apply_state(scene.get_state())
 
+    def export_state(self) -> dict:
+        """Laufzeitzustand für den Warmstart-Cache."""
+        return {"is_active": self.is_active, "end_time": encode_datetime(self.end_time)}
+
+    def restore_state(self, state: dict):
+        """Übernimmt einen Laufzeitzustand aus dem Warmstart-Cache."""
+        self.end_time = decode_datetime(state.get("end_time"))
+        self.is_active = bool(state.get("is_active")) and self.end_time is not None
+
     def get_status(self) -> dict:
         """Gibt den aktuellen Status des Timers für die UI zurück."""
         return {
@@ -0,0 +1,194 @@
+"""
+Index über die Struktur der Bridge (Räume, Zonen, Geräte und ihre Services),
+damit Zuordnungen wie Raum -> grouped_light ohne Suche über Listen gelingen.
+"""
+import threading
+from typing import Dict, List, Optional
+
+GROUP_TYPES = ("room", "zone")
+
+
+class BridgeTopology:
+    """
+    Wird einmal aus get_full_api_data() aufgebaut und danach über
+    apply_change() inkrementell aktualisiert (z.B. aus dem Eventstream).
+    version zählt strukturelle Änderungen, damit Kopien des Index (z.B. im
+    Webserver) erkennen, wann sie neu aufgebaut werden müssen.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.is_built = False
+        self.version = 0
+        self._clear()
+
+    def _clear(self):
+        self._groups: Dict[str, Dict] = {}
+        self._group_by_name: Dict[str, str] = {}
+        self._grouped_light_by_group: Dict[str, str] = {}
+        self._device_services: Dict[str, List[Dict]] = {}
+        self._service_owner: Dict[str, str] = {}
+        self._device_room: Dict[str, str] = {}
+        self._light_zones: Dict[str, set] = {}
+
+    @classmethod
+    def from_api_data(cls, api_data: Dict) -> "BridgeTopology":
+        topology = cls()
+        topology.rebuild(api_data)
+        return topology
+
+    def rebuild(self, api_data: Dict):
+        """Baut den Index vollständig aus einem get_full_api_data()-Ergebnis neu auf."""
+        with self._lock:
+            self._clear()
+            for device in api_data.get("devices", []):
+                self._index_device(device)
+            for group in api_data.get("rooms", []) + api_data.get("zones", []):
+                self._index_group(group)
+            for grouped_light in api_data.get("grouped_lights", []):
+                self._index_grouped_light(grouped_light)
+            self.is_built = True
+            self.version += 1
+
+    def invalidate(self):
+        """Markiert den Index als veraltet; er wird beim nächsten Zugriff neu aufgebaut."""
+        self.is_built = False
+
+    def apply_change(self, resource_type: str, resource: Dict, deleted: bool = False):
+        """Übernimmt eine einzelne geänderte Ressource in den Index."""
+        resource_id = resource.get("id") if resource else None
+        if not resource_id:
+            return
+        with self._lock:
+            if resource_type in GROUP_TYPES:
+                self._unindex_group(resource_id)
+                if deleted:
+                    self._grouped_light_by_group.pop(resource_id, None)
+                else:
+                    self._index_group(resource)
+                self.version += 1
+            elif resource_type == "device":
+                self._unindex_device(resource_id)
+                if not deleted:
+                    self._index_device(resource)
+                self.version += 1
+            elif resource_type == "grouped_light":
+                # Zustandsmeldungen (an/aus, Helligkeit) ändern die Struktur nicht.
+                before = dict(self._grouped_light_by_group)
+                if deleted:
+                    for group_id, gl_id in list(self._grouped_light_by_group.items()):
+                        if gl_id == resource_id:
+                            del self._grouped_light_by_group[group_id]
+                else:
+                    self._index_grouped_light(resource)
+                if self._grouped_light_by_group != before:
+                    self.version += 1
+
+    # --- Abfragen ---
+
+    def grouped_light_for_group(self, group_id: str) -> Optional[str]:
+        return self._grouped_light_by_group.get(group_id)
+
+    def group_id_by_name(self, name: str) -> Optional[str]:
+        return self._group_by_name.get(name)
+
+    def group_names(self) -> Dict[str, str]:
+        """Alle Räume und Zonen als {Name: ID}."""
+        with self._lock:
+            return dict(self._group_by_name)
+
+    def group(self, group_id: str) -> Optional[Dict]:
+        """Gibt {id, type, name, children} einer Gruppe zurück."""
+        with self._lock:
+            group = self._groups.get(group_id)
+            return {**group, "children": list(group["children"])} if group else None
+
+    def group_type(self, group_id: str) -> Optional[str]:
+        group = self._groups.get(group_id)
+        return group["type"] if group else None
+
+    def device_services(self, device_id: str, rtype: Optional[str] = None) -> List[str]:
+        services = self._device_services.get(device_id, [])
+        return [s["rid"] for s in services if rtype is None or s.get("rtype") == rtype]
+
+    def service_id(self, device_id: str, rtype: str) -> Optional[str]:
+        services = self.device_services(device_id, rtype)
+        return services[0] if services else None
+
+    def has_device(self, device_id: str) -> bool:
+        return device_id in self._device_services
+
+    def owner_of(self, service_id: str) -> Optional[str]:
+        """Gerät, zu dem ein Service (z.B. light, motion) gehört."""
+        return self._service_owner.get(service_id)
+
+    def room_for_device(self, device_id: str) -> Optional[str]:
+        return self._device_room.get(device_id)
+
+    def room_for_light(self, light_id: str) -> Optional[str]:
+        device_id = self._service_owner.get(light_id)
+        return self._device_room.get(device_id) if device_id else None
+
+    def groups_for_light(self, light_id: str) -> List[str]:
+        """Raum und Zonen, zu denen ein Licht gehört."""
+        with self._lock:
+            room_id = self.room_for_light(light_id)
+            return ([room_id] if room_id else []) + sorted(self._light_zones.get(light_id, ()))
+
+    # --- Indexpflege ---
+
+    def _index_group(self, group: Dict):
+        group_id = group.get("id")
+        group_type = group.get("type")
+        if not group_id or group_type not in GROUP_TYPES:
+            return
+        name = group.get("metadata", {}).get("name")
+        children = [c for c in group.get("children", []) if c and c.get("rid")]
+        self._groups[group_id] = {"id": group_id, "type": group_type, "name": name, "children": children}
+        if name:
+            self._group_by_name[name] = group_id
+        for service in group.get("services", []):
+            if service.get("rtype") == "grouped_light" and service.get("rid"):
+                self._grouped_light_by_group[group_id] = service["rid"]
+        if group_type == "room":
+            for child in children:
+                if child.get("rtype") == "device":
+                    self._device_room[child["rid"]] = group_id
+        else:
+            for child in children:
+                if child.get("rtype") == "light":
+                    self._light_zones.setdefault(child["rid"], set()).add(group_id)
+
+    def _unindex_group(self, group_id: str):
+        group = self._groups.pop(group_id, None)
+        if not group:
+            return
+        if group["name"] and self._group_by_name.get(group["name"]) == group_id:
+            del self._group_by_name[group["name"]]
+        for child in group["children"]:
+            if self._device_room.get(child["rid"]) == group_id:
+                del self._device_room[child["rid"]]
+            zones = self._light_zones.get(child["rid"])
+            if zones is not None:
+                zones.discard(group_id)
+                if not zones:
+                    del self._light_zones[child["rid"]]
+
+    def _index_grouped_light(self, grouped_light: Dict):
+        owner = grouped_light.get("owner", {})
+        if owner.get("rtype") in GROUP_TYPES and owner.get("rid") and grouped_light.get("id"):
+            self._grouped_light_by_group[owner["rid"]] = grouped_light["id"]
+
+    def _index_device(self, device: Dict):
+        device_id = device.get("id")
+        if not device_id:
+            return
+        services = [s for s in device.get("services", []) if s and s.get("rid")]
+        self._device_services[device_id] = services
+        for service in services:
+            self._service_owner[service["rid"]] = device_id
+
+    def _unindex_device(self, device_id: str):
+        for service in self._device_services.pop(device_id, []):
+            if self._service_owner.get(service["rid"]) == device_id:
+                del self._service_owner[service["rid"]]
@@ -0,0 +1,29 @@
+import time
+
+import pytest
+
+from src.bridge_simulator import BridgeSimulator
+
+
+@pytest.fixture
+def wait_for():
+    """Wartet, bis die Bedingung erfüllt ist (für Tests mit Hintergrund-Threads)."""
+
+    def wait(condition, timeout: float = 5.0, interval: float = 0.02) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if condition():
+                return True
+            time.sleep(interval)
+        return condition()
+
+    return wait
+
+
+@pytest.fixture
+def simulator():
+    """Lokale Bridge (v2 API) mit zwei Räumen und zwei Bewegungsmeldern."""
+    sim = BridgeSimulator(rooms=2, lights_per_room=2, zones=0, sensors=2, heartbeat_s=10)
+    sim.start()
+    yield sim
+    sim.stop()
@@ -0,0 +1,92 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.automation_runner import AutomationRunner
+from src.metrics import MetricsRegistry
+
+NOW = datetime(2026, 3, 1, 12, 0).astimezone()
+
+
+class RecordingScheduler:
+    def __init__(self):
+        self.scheduled = {}
+        self.woken = []
+        self.lock = threading.Lock()
+
+    def schedule(self, key, when):
+        with self.lock:
+            self.scheduled[key] = when
+
+    def wake(self, key=None):
+        self.woken.append(key)
+
+
+class FakeAutomation:
+    def __init__(self, name, room="Flur", delay_s=0.0, error=None):
+        self.name = name
+        self.config = {"target_room": room}
+        self.delay_s = delay_s
+        self.error = error
+        self.runs = 0
+
+    def run(self, now):
+        self.runs += 1
+        time.sleep(self.delay_s)
+        if self.error:
+            raise self.error
+
+    def next_deadline(self, now):
+        return now + timedelta(minutes=1)
+
+
+@pytest.fixture
+def make_runner():
+    runners = []
+
+    def create(**kwargs):
+        scheduler = RecordingScheduler()
+        runner = AutomationRunner(scheduler, MetricsRegistry(), logging.getLogger(__name__), **kwargs)
+        runners.append(runner)
+        return runner, scheduler
+
+    yield create
+    for runner in runners:
+        runner.shutdown()
+
+
+def test_failing_automation_and_its_group_are_rescheduled(make_runner):
+    runner, scheduler = make_runner()
+    group = [("a", FakeAutomation("A")), ("b", FakeAutomation("B", error=RuntimeError("kaputt"))),
+             ("c", FakeAutomation("C"))]
+    with pytest.raises(RuntimeError, match="kaputt"):
+        runner.run(group, NOW)
+    assert group[2][1].runs == 1
+    assert scheduler.scheduled == {key: NOW + timedelta(minutes=1) for key in "abc"}
+
+
+def test_deadline_errors_fall_back_to_retry_delay(make_runner):
+    runner, scheduler = make_runner()
+    automation = FakeAutomation("A")
+    automation.next_deadline = lambda now: 1 / 0
+    runner.run([("a", automation)], NOW)
+    assert scheduler.scheduled == {"a": NOW + timedelta(seconds=AutomationRunner.RETRY_DELAY_S)}
+
+
+def test_group_over_budget_is_rescheduled_when_it_finishes(make_runner, wait_for):
+    runner, scheduler = make_runner(budget_s=0.1)
+    group = [("slow", FakeAutomation("Langsam", delay_s=0.3, error=RuntimeError("spät"))),
+             ("next", FakeAutomation("Danach"))]
+    started = time.monotonic()
+    runner.run(group, NOW)
+    assert time.monotonic() - started < 0.25
+    assert runner.overruns == 1
+
+    # Während die Gruppe noch läuft, wird die Automation übersprungen und danach geweckt.
+    runner.run([("next", group[1][1])], NOW)
+    assert wait_for(lambda: set(scheduler.scheduled) == {"slow", "next"})
+    assert wait_for(lambda: scheduler.woken == ["next"])
+    assert group[1][1].runs == 1
@@ -0,0 +1,224 @@
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from src.bridge_gateway import BridgeClient, BridgeGateway
+from src.connection_health import BridgeUnavailableError
+from src.topology import BridgeTopology
+
+
+class FakeBridge:
+    def __init__(self):
+        self.calls = []
+        self.topology_version = 0
+        self.rooms = [_room("r1", "Küche")]
+
+    def is_connected(self):
+        return True
+
+    def set_light_state(self, light_id, state):
+        self.calls.append(("set_light_state", light_id, state))
+        return True
+
+    def get_resource_by_id(self, resource_type, resource_id):
+        if resource_type not in ("light", "room"):
+            raise ValueError(f"Unbekannter Typ: {resource_type}")
+        return {"id": resource_id, "type": resource_type}
+
+    def get_full_api_data(self, resource_types=None, allow_partial=False):
+        self.calls.append(("get_full_api_data",))
+        return {"rooms": list(self.rooms)}
+
+
+def _room(room_id, name):
+    return {"id": room_id, "type": "room", "metadata": {"name": name}, "children": []}
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "bridge.sock")
+
+
+@pytest.fixture
+def gateway(socket_path):
+    gateway = BridgeGateway(socket_path)
+    gateway.start()
+    yield gateway
+    gateway.stop()
+
+
+@pytest.fixture
+def client(socket_path):
+    client = BridgeClient(socket_path, timeout_s=2)
+    yield client
+    client.close()
+
+
+def test_round_trip_reuses_pooled_connection(gateway, client):
+    bridge = FakeBridge()
+    gateway.set_bridge(bridge)
+    assert client.is_connected()
+    assert client.set_light_state("l1", {"on": True}) is True
+    assert client.get_resource_by_id("light", "l1") == {"id": "l1", "type": "light"}
+    assert bridge.calls == [("set_light_state", "l1", {"on": True})]
+    assert len(client._idle) == 1
+
+
+def test_errors_are_mapped_to_exceptions(gateway, client):
+    gateway.set_bridge(FakeBridge())
+    with pytest.raises(ValueError, match="Unbekannter Typ"):
+        client.get_resource_by_id("sensor", "s1")
+    with pytest.raises(ValueError, match="Unbekannte Operation"):
+        client._call("close")
+    gateway.set_bridge(None)
+    with pytest.raises(BridgeUnavailableError):
+        client.set_light_state("l1", {"on": True})
+    assert not client.is_connected()
+
+
+def test_missing_gateway_raises_unavailable(client):
+    with pytest.raises(BridgeUnavailableError):
+        client.get_resource_by_id("light", "l1")
+
+
+class ScriptedServer:
+    """Antwortet auf die erste Anfrage einer Verbindung und verhält sich danach wie vorgegeben."""
+
+    def __init__(self, path, after_reply):
+        self.requests = []
+        self.after_reply = after_reply
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen(4)
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        with conn, conn.makefile("rb") as stream:
+            for index, line in enumerate(stream):
+                request = json.loads(line)
+                self.requests.append(request["op"])
+                reply = (json.dumps({"i": request["i"], "r": True}) + "\n").encode()
+                if index > 0 and self.after_reply == "drop":
+                    return
+                if index > 0 and self.after_reply == "partial":
+                    conn.sendall(reply[:5])
+                    return
+                if index > 0 and self.after_reply == "hang":
+                    time.sleep(1)
+                    return
+                conn.sendall(reply)
+                if self.after_reply == "close":
+                    return
+
+    def close(self):
+        self.server.close()
+
+
+def test_dead_pooled_connection_is_replaced(socket_path, client, wait_for):
+    server = ScriptedServer(socket_path, after_reply="close")
+    try:
+        assert client.set_light_state("l1", {"on": True}) is True
+        # Der Server hat die gepoolte Verbindung geschlossen: sendall scheitert, die Anfrage wird neu gesendet.
+        assert wait_for(lambda: _peer_closed(client._idle[0]))
+        assert client.set_light_state("l1", {"on": False}) is True
+        assert server.requests == ["set_light_state", "set_light_state"]
+    finally:
+        server.close()
+
+
+def test_connection_closed_before_reply_is_retried_once(socket_path, client):
+    server = ScriptedServer(socket_path, after_reply="drop")
+    try:
+        assert client.set_light_state("l1", {"on": True}) is True
+        # Wie nach einem Neustart der Kernlogik: sendall gelingt, gelesen wird nur das Verbindungsende.
+        assert client.set_light_state("l1", {"on": False}) is True
+        assert server.requests == ["set_light_state", "set_light_state", "set_light_state"]
+    finally:
+        server.close()
+
+
+@pytest.mark.parametrize("after_reply", ["partial", "hang"])
+def test_lost_reply_is_not_retried(socket_path, after_reply):
+    server = ScriptedServer(socket_path, after_reply=after_reply)
+    client = BridgeClient(socket_path, timeout_s=0.3)
+    try:
+        assert client.set_light_state("l1", {"on": True}) is True
+        # Die Anfrage hat das Gateway erreicht, die Antwort bricht ab oder bleibt aus: kein zweiter Versuch.
+        with pytest.raises(BridgeUnavailableError):
+            client.create_scene("Abend", "g1", "room", [])
+        assert server.requests == ["set_light_state", "create_scene"]
+    finally:
+        client.close()
+        server.close()
+
+
+def test_topology_follows_gateway_generation(gateway, client):
+    bridge = FakeBridge()
+    gateway.set_bridge(bridge)
+    assert client.topology.group_id_by_name("Küche") == "r1"
+    assert client.topology.group_id_by_name("Küche") == "r1"
+    assert bridge.calls.count(("get_full_api_data",)) == 1
+
+    # Strukturänderung in der Kernlogik: der lokale Index wird bei der nächsten Antwort verworfen.
+    bridge.rooms = [_room("r1", "Wohnküche")]
+    bridge.topology_version += 1
+    assert client.is_connected()
+    assert client.topology.group_id_by_name("Wohnküche") == "r1"
+
+    # Neue Bridge (z.B. nach Neustart der Kernlogik) mit anderer Struktur.
+    replacement = FakeBridge()
+    replacement.rooms = [_room("r2", "Bad")]
+    gateway.set_bridge(replacement)
+    assert client.is_connected()
+    assert client.topology.group_id_by_name("Bad") == "r2"
+
+
+def test_topology_version_counts_only_structural_changes():
+    topology = BridgeTopology.from_api_data({
+        "rooms": [{**_room("r1", "Küche"), "services": [{"rid": "gl1", "rtype": "grouped_light"}]}],
+    })
+    version = topology.version
+    topology.apply_change("grouped_light", {"id": "gl1", "on": {"on": True}})
+    topology.apply_change("light", {"id": "l1", "dimming": {"brightness": 50}})
+    assert topology.version == version
+    topology.apply_change("room", _room("r1", "Wohnküche"))
+    assert topology.version == version + 1
+    topology.apply_change("grouped_light", {"id": "gl1"}, deleted=True)
+    assert topology.version == version + 2
+
+
+def test_topology_is_dropped_when_gateway_is_unreachable(socket_path, gateway, client):
+    bridge = FakeBridge()
+    gateway.set_bridge(bridge)
+    assert client.topology.is_built
+    gateway.stop()
+    client.close()
+    assert not client.is_connected()
+    assert not client.topology.is_built
+
+    restarted = BridgeGateway(socket_path)
+    restarted.start()
+    try:
+        restarted.set_bridge(bridge)
+        assert client.topology.is_built
+        assert bridge.calls.count(("get_full_api_data",)) == 2
+    finally:
+        restarted.stop()
+
+
+def _peer_closed(sock):
+    try:
+        return sock.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) == b""
+    except BlockingIOError:
+        return False
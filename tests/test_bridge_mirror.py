@@ -0,0 +1,129 @@
+import requests
+import pytest
+
+from src.bridge_simulator import DEFAULT_APP_KEY
+from src.hue_wrapper import BridgeStateMirror, _iter_sse_events
+
+HEADERS = {"hue-application-key": DEFAULT_APP_KEY}
+
+
+def test_iter_sse_events_joins_data_lines_and_skips_comments():
+    lines = [
+        ": hi", "",
+        "id: 1:1", "data: [1,", "data: 2]", "",
+        "event: update", "data:{\"a\": 1}", "",
+        "id: 1:3", ": keep-alive", "data: x",
+    ]
+    assert list(_iter_sse_events(lines)) == [("1:1", "[1,\n2]"), (None, '{"a": 1}'), ("1:3", "x")]
+
+
+def test_iter_sse_events_ignores_blocks_without_data():
+    assert list(_iter_sse_events(["id: 7", "", "", None])) == []
+
+
+def _mirror(resources, **kwargs):
+    mirror = BridgeStateMirror(fetch_all=lambda: resources, stream_url="https://unused", **kwargs)
+    assert mirror.resync()
+    return mirror
+
+
+def test_apply_events_deep_merges_updates_and_handles_add_delete():
+    mirror = _mirror([{
+        "id": "l1", "type": "light", "on": {"on": False},
+        "dimming": {"brightness": 50.0, "min_dim_level": 2.0}, "metadata": {"name": "Decke"},
+    }])
+    changes = []
+    mirror.add_listener(lambda *change: changes.append(change))
+
+    mirror.apply_events([
+        {"type": "update", "data": [{"id": "l1", "type": "light", "dimming": {"brightness": 80.0}}]},
+        {"type": "add", "data": [{"id": "l2", "type": "light", "on": {"on": True}}]},
+        {"type": "delete", "data": [{"id": "l2", "type": "light"}]},
+        {"type": "update", "data": [{"id": "m1", "type": "motion", "motion": {"motion": True}}]},
+    ])
+
+    light = mirror.get("light", "l1")
+    assert light["dimming"] == {"brightness": 80.0, "min_dim_level": 2.0}
+    assert light["metadata"] == {"name": "Decke"} and light["on"] == {"on": False}
+    assert mirror.get("light", "l2") is None
+    assert mirror.get("motion", "m1") == {"id": "m1", "type": "motion", "motion": {"motion": True}}
+    assert [(t, r["id"], deleted) for t, r, deleted in changes] == [
+        ("light", "l1", False), ("light", "l2", False), ("light", "l2", True), ("motion", "m1", False),
+    ]
+
+
+def test_get_returns_copies():
+    mirror = _mirror([{"id": "l1", "type": "light", "on": {"on": False}}])
+    mirror.get("light", "l1")["on"]["on"] = True
+    assert mirror.get("light", "l1")["on"] == {"on": False}
+
+
+@pytest.fixture
+def stream_mirror(simulator):
+    def fetch_all():
+        response = requests.get(f"https://{simulator.address}/clip/v2/resource", headers=HEADERS, verify=False, timeout=5)
+        return response.json()["data"]
+
+    mirrors = []
+
+    def create(**kwargs):
+        mirror = BridgeStateMirror(
+            fetch_all=fetch_all, stream_url=f"https://{simulator.address}/eventstream/clip/v2",
+            headers=HEADERS, retry_delay_s=0.05, **kwargs,
+        )
+        mirrors.append(mirror)
+        mirror.start(blocking=True)
+        return mirror
+
+    yield create
+    for mirror in mirrors:
+        mirror.stop()
+
+
+def _motion(mirror, motion_id):
+    return (mirror.get("motion", motion_id) or {}).get("motion", {}).get("motion")
+
+
+def test_mirror_follows_event_stream(simulator, stream_mirror, wait_for):
+    mirror = stream_mirror()
+    assert wait_for(mirror.is_streaming)
+    motion_id = simulator.state.ids("motion")[0]
+    assert _motion(mirror, motion_id) is False
+
+    simulator.trigger_motion(0, True)
+    assert wait_for(lambda: _motion(mirror, motion_id) is True)
+    assert mirror.last_event_id is not None
+
+
+def test_mirror_resyncs_after_dropped_stream(simulator, stream_mirror, wait_for):
+    mirror = stream_mirror()
+    assert wait_for(mirror.is_streaming)
+    motion_id = simulator.state.ids("motion")[1]
+    # Änderung ohne Event: nur die Resynchronisierung nach dem Abbruch kann sie liefern.
+    simulator.state.set_motion(motion_id, True)
+    with simulator._subscribers_lock:
+        for subscriber in simulator._subscribers:
+            subscriber.put(None)
+
+    assert wait_for(lambda: _motion(mirror, motion_id) is True)
+    assert wait_for(mirror.is_streaming)
+
+
+def test_mirror_resyncs_after_read_timeout(wait_for):
+    fetches = []
+
+    def fetch_all():
+        fetches.append(1)
+        return []
+
+    def timeout():
+        raise requests.exceptions.ReadTimeout()
+
+    # Lange Wartezeit nach Fehlern: nur der Timeout-Pfad kann schnell neu synchronisieren.
+    mirror = BridgeStateMirror(fetch_all=fetch_all, stream_url="https://unused", retry_delay_s=10)
+    mirror._consume_stream = timeout
+    mirror.start(blocking=True)
+    try:
+        assert wait_for(lambda: len(fetches) >= 3, timeout=2)
+    finally:
+        mirror.stop()
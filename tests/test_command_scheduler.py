@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from src.command_scheduler import CommandScheduler, merge_states
+
+
+class Recorder:
+    def __init__(self, results=()):
+        self.sent = []
+        self.results = list(results)
+        self.lock = threading.Lock()
+
+    def __call__(self, kind, target_id, state):
+        with self.lock:
+            self.sent.append((time.monotonic(), kind, target_id, dict(state)))
+            return self.results.pop(0) if self.results else True
+
+
+@pytest.fixture
+def make_scheduler():
+    schedulers = []
+
+    def create(send, **kwargs):
+        scheduler = CommandScheduler(send, **kwargs)
+        schedulers.append(scheduler)
+        scheduler.start()
+        return scheduler
+
+    yield create
+    for scheduler in schedulers:
+        scheduler.stop(drain_timeout_s=1)
+
+
+def test_merge_states_keeps_earlier_fields_and_drops_exclusive_ones():
+    assert merge_states({"bri": 100, "transitiontime": 4}, {"ct": 300}) == {"bri": 100, "transitiontime": 4, "ct": 300}
+    assert merge_states({"bri": 100, "ct": 300}, {"hue": 1000, "sat": 200}) == {"bri": 100, "hue": 1000, "sat": 200}
+    assert merge_states({"hue": 1000, "sat": 200}, {"ct": 300, "bri": 50}) == {"ct": 300, "bri": 50}
+
+
+def test_pending_commands_for_same_target_are_merged(make_scheduler, wait_for):
+    send = Recorder()
+    scheduler = make_scheduler(send, group_rate=10)
+    scheduler.submit("group", "g1", {"on": True})
+    assert wait_for(lambda: len(send.sent) == 1)
+    # Der nächste Slot liegt 100 ms in der Zukunft: beide Befehle warten und werden vereint.
+    scheduler.submit("group", "g1", {"bri": 200})
+    scheduler.submit("group", "g1", {"ct": 300})
+    assert wait_for(lambda: len(send.sent) == 2)
+    assert send.sent[1][3] == {"bri": 200, "ct": 300}
+    assert scheduler.get_stats()["coalesced"] == 1
+
+
+def test_commands_are_paced_per_kind(make_scheduler, wait_for):
+    send = Recorder()
+    scheduler = make_scheduler(send, light_rate=20, group_rate=5)
+    for index in range(5):
+        scheduler.submit("light", f"l{index}", {"bri": index})
+    scheduler.submit("group", "g1", {"on": True})
+    scheduler.submit("group", "g2", {"on": True})
+    assert wait_for(lambda: len(send.sent) == 7)
+
+    lights = [t for t, kind, _, _ in send.sent if kind == "light"]
+    groups = [t for t, kind, _, _ in send.sent if kind == "group"]
+    assert [target for _, kind, target, _ in send.sent if kind == "light"] == [f"l{i}" for i in range(5)]
+    assert all(b - a >= 0.045 for a, b in zip(lights, lights[1:]))
+    assert groups[1] - groups[0] >= 0.19
+    # Gruppenbefehle warten nicht auf die Lichtbefehle.
+    assert groups[0] < lights[-1]
+
+
+def test_failed_command_is_retried(make_scheduler, wait_for, monkeypatch):
+    monkeypatch.setattr(CommandScheduler, "RETRY_DELAY_S", 0.05)
+    send = Recorder(results=[False])
+    scheduler = make_scheduler(send, light_rate=50)
+    scheduler.submit("light", "l1", {"bri": 10})
+    assert wait_for(lambda: len(send.sent) == 2)
+    assert send.sent[1][3] == {"bri": 10}
+    assert scheduler.get_stats()["sent"] == 1
+
+
+def test_stop_drains_pending_commands():
+    send = Recorder()
+    scheduler = CommandScheduler(send, group_rate=20)
+    scheduler.start()
+    for index in range(3):
+        scheduler.submit("group", f"g{index}", {"on": True})
+    scheduler.stop(drain_timeout_s=2)
+    assert [target for _, _, target, _ in send.sent] == ["g0", "g1", "g2"]
@@ -0,0 +1,67 @@
+import copy
+import logging
+
+import pytest
+from flask import Flask
+
+from web.api import config_api
+from web.api.config_api import ConfigAPI
+
+
+class MemoryConfigManager:
+    """Hält die geschriebenen Dateien im Speicher, wie ConfigManager sie zusammenführt."""
+
+    def __init__(self, automations):
+        self.files = {config_api.AUTOMATION_FILE: {"automations": automations, "scenes": {}}}
+
+    def safe_write(self, file_path, data):
+        self.files[file_path] = copy.deepcopy(data)
+        return True
+
+    def get_full_config(self):
+        config = {}
+        for content in self.files.values():
+            config.update(copy.deepcopy(content))
+        return config
+
+
+@pytest.fixture
+def make_client():
+    def create(automations):
+        app = Flask(__name__)
+        app.register_blueprint(ConfigAPI, url_prefix="/api/config")
+        app.config_manager = MemoryConfigManager(automations)
+        app.logger_instance = logging.getLogger(__name__)
+        return app, app.test_client()
+
+    return create
+
+
+def _stored_ids(app):
+    return [a["id"] for a in app.config_manager.files[config_api.AUTOMATION_FILE]["automations"]]
+
+
+def test_ids_are_stable_across_saves_without_client_ids(make_client):
+    legacy = [{"type": "routine", "name": "Flur"}, {"type": "timer", "name": "Flur"}, {"name": "Bad"}]
+    app, client = make_client(copy.deepcopy(legacy))
+
+    first = client.post("/api/config/", json={"automations": copy.deepcopy(legacy)})
+    assert first.status_code == 200
+    ids = first.get_json()["automation_ids"]
+    assert len(set(ids)) == 3 and _stored_ids(app) == ids
+
+    # Der Client hat die IDs nicht übernommen und sendet wieder ohne.
+    second = client.post("/api/config/", json={"automations": copy.deepcopy(legacy)})
+    assert second.get_json()["automation_ids"] == ids
+    assert _stored_ids(app) == ids
+
+
+def test_known_ids_are_kept_and_new_automations_get_fresh_ones(make_client):
+    app, client = make_client([{"id": "a1", "name": "Flur"}])
+    response = client.post("/api/config/", json={"automations": [
+        {"id": "a1", "name": "Flur umbenannt"}, {"name": "Flur"}, {"name": "Flur"},
+    ]})
+    ids = response.get_json()["automation_ids"]
+    assert ids[0] == "a1"
+    # Die gespeicherte ID ist bereits vergeben: die Kopien erhalten eigene.
+    assert len(set(ids)) == 3
@@ -0,0 +1,79 @@
+import os
+import threading
+
+import pytest
+
+from src import config_watcher
+from src.config_watcher import ConfigWatcher
+
+
+class Calls:
+    def __init__(self):
+        self.changes = []
+        self.lock = threading.Lock()
+
+    def __call__(self, changed):
+        with self.lock:
+            self.changes.append(set(changed))
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = [str(tmp_path / name) for name in ("settings.yaml", "automation.yaml")]
+    for path in paths:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("a: 1\n")
+    return paths
+
+
+@pytest.fixture
+def make_watcher():
+    watchers = []
+
+    def create(paths, **kwargs):
+        calls = Calls()
+        watcher = ConfigWatcher(paths, calls, debounce_s=0.1, max_delay_s=1.0, poll_interval_s=0.05, **kwargs)
+        watchers.append(watcher)
+        watcher.start()
+        return watcher, calls
+
+    yield create
+    for watcher in watchers:
+        watcher.stop()
+
+
+def _edit(path, text="a: 2\n"):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_inotify_reports_edit_and_atomic_replace(files, make_watcher, wait_for):
+    watcher, calls = make_watcher(files)
+    if watcher.mode != "inotify":
+        pytest.skip("inotify nicht verfügbar")
+    _edit(files[0])
+    assert wait_for(lambda: calls.changes == [{files[0]}])
+
+    # safe_write schreibt in eine temporäre Datei und ersetzt dann atomar.
+    _edit(files[1] + ".tmp")
+    os.replace(files[1] + ".tmp", files[1])
+    assert wait_for(lambda: len(calls.changes) == 2)
+    assert calls.changes[1] == {files[1]}
+
+
+def test_burst_of_writes_is_reported_once(files, make_watcher, wait_for):
+    watcher, calls = make_watcher(files)
+    for path in files:
+        _edit(path)
+    _edit(os.path.join(os.path.dirname(files[0]), "other.txt"))
+    assert wait_for(lambda: calls.changes)
+    assert not wait_for(lambda: len(calls.changes) > 1, timeout=0.3)
+    assert calls.changes == [set(files)]
+
+
+def test_falls_back_to_polling_without_inotify(files, make_watcher, wait_for, monkeypatch):
+    monkeypatch.setattr(config_watcher, "_open_inotify", lambda directories: None)
+    watcher, calls = make_watcher(files)
+    assert watcher.mode == "polling"
+    _edit(files[0], "a: 3, b: 4\n")
+    assert wait_for(lambda: calls.changes == [{files[0]}])
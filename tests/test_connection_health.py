@@ -0,0 +1,19 @@
+import time
+
+from src.connection_health import OPEN, ConnectionHealth
+
+
+def test_snapshot_is_stable_while_waiting_for_reconnect():
+    def probe():
+        raise ConnectionError("weg")
+
+    health = ConnectionHealth(probe, base_delay_s=30, max_delay_s=30)
+    try:
+        assert not health.connect_now()
+        first = health.snapshot()
+        time.sleep(0.05)
+        assert health.state == OPEN
+        assert health.snapshot() == first
+        assert first["next_attempt_at"] is not None
+    finally:
+        health.stop()
@@ -0,0 +1,39 @@
+import logging
+import time as time_module
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from src.daily_time_span import DailyTimeSpan
+
+
+@pytest.fixture
+def berlin(monkeypatch):
+    monkeypatch.setenv("TZ", "Europe/Berlin")
+    time_module.tzset()
+    yield
+    monkeypatch.undo()
+    time_module.tzset()
+
+
+def _span():
+    return DailyTimeSpan(time(6, 30), time(23, 0), None, logging.getLogger(__name__))
+
+
+def test_periods_with_fallback_sun_times():
+    span = _span()
+    assert span.get_current_period(datetime(2026, 3, 1, 6, 45)) == "day"
+    assert span.get_current_period(datetime(2026, 3, 1, 22, 0)) == "evening"
+    assert span.get_current_period(datetime(2026, 3, 1, 23, 30)) == "night"
+
+
+def test_next_change_after_end_of_dst_uses_winter_offset(berlin):
+    now = datetime(2026, 10, 24, 23, 30).astimezone()
+    assert now.utcoffset() == timedelta(hours=2)
+    change = _span().next_change(now)
+    assert (change.hour, change.minute, change.day) == (6, 30, 25)
+    assert change.utcoffset() == timedelta(hours=1)
+
+
+def test_next_change_with_naive_time():
+    assert _span().next_change(datetime(2026, 3, 1, 21, 30)) == datetime(2026, 3, 1, 23, 0)
@@ -0,0 +1,77 @@
+from datetime import datetime
+
+import pytest
+
+from src.history import choose_resolution, fill_gaps, iter_measurements, query_history
+from src.telemetry import TelemetryRecorder, connect, init_schema
+
+START = datetime(2026, 3, 1)
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    path = str(tmp_path / "sensor_data.db")
+    con = connect(path)
+    init_schema(con)
+    con.close()
+    recorder = TelemetryRecorder(path, flush_interval_s=0.01)
+    recorder.start()
+    recorder.record_many([
+        ("2026-03-01T00:01:00.000", "s1", "brightness", 10.0),
+        ("2026-03-01T00:20:00.000", "s1", "brightness", 30.0),
+        ("2026-03-01T02:10:00.000", "s1", "brightness", 50.0),
+        ("2026-03-01T00:05:00.000", "s1", "temperature", 20.0),
+        ("2026-03-01T01:30:00.000", "s2", "brightness", 7.0),
+    ])
+    recorder.stop()
+    return path
+
+
+@pytest.fixture
+def con(db_file):
+    con = connect(db_file)
+    yield con
+    con.close()
+
+
+def test_choose_resolution_by_span():
+    assert choose_resolution(START, datetime(2026, 3, 2)) == "5min"
+    assert choose_resolution(START, datetime(2026, 4, 1)) == "hour"
+    assert choose_resolution(START, datetime(2026, 6, 1)) == "day"
+
+
+def test_fill_gaps_interpolates_inner_gaps_only():
+    assert fill_gaps([None, 10.0, None, None, 40.0, None]) == [None, 10.0, 20.0, 30.0, 40.0, None]
+
+
+def test_hourly_buckets_come_from_rollup_with_null_gaps(con):
+    result = query_history(con, ["s1", "s2"], START, datetime(2026, 3, 1, 4), bucket_s=3600)
+    assert result["source"] == "measurements_hourly"
+    assert result["labels"] == [f"2026-03-01T0{hour}:00:00" for hour in range(4)]
+    assert result["series"]["s1"]["brightness"] == [20.0, None, 50.0, None]
+    assert result["series"]["s1"]["temperature"] == [20.0, None, None, None]
+    assert result["series"]["s2"]["brightness"] == [None, 7.0, None, None]
+
+
+def test_fill_interpolates_between_buckets(con):
+    result = query_history(con, ["s1"], START, datetime(2026, 3, 1, 4), bucket_s=3600, fill=True)
+    assert result["series"]["s1"]["brightness"] == [20.0, 35.0, 50.0, None]
+
+
+def test_odd_bucket_size_reads_raw_rows(con):
+    result = query_history(con, ["s1"], START, datetime(2026, 3, 1, 1), bucket_s=240, measurement_types=["brightness"])
+    assert result["source"] == "measurements"
+    values = result["series"]["s1"]["brightness"]
+    assert len(values) == 15 and (values[0], values[5]) == (10.0, 30.0)
+    assert values.count(None) == 13
+
+
+def test_too_many_points_are_rejected(con):
+    with pytest.raises(ValueError):
+        query_history(con, ["s1"], START, datetime(2026, 4, 1), bucket_s=300)
+
+
+def test_iter_measurements_streams_in_chunks(db_file):
+    chunks = list(iter_measurements(db_file, sensor_ids=["s1"], chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2]
+    assert [row[2] for chunk in chunks for row in chunk] == ["brightness"] * 3 + ["temperature"]
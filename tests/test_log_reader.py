@@ -0,0 +1,78 @@
+import pytest
+
+from src import log_reader
+from src.log_reader import LogFilter, read_since, read_tail
+
+
+def _line(second, level, module, message):
+    return f"2026-01-01 12:00:{second:02d} - {level} - [{module}.py:42] - {message}\n"
+
+
+ENTRIES = [
+    _line(0, "INFO", "core_logic", "Start"),
+    _line(1, "ERROR", "hue_wrapper", "Fehler") + "Traceback (most recent call last):\n  File \"x.py\"\nValueError: kaputt\n",
+    _line(2, "INFO", "hue_wrapper", "Verbunden"),
+    '{"time": "2026-01-01T12:00:03", "level": "WARNING", "module": "core_logic", "message": "Langsam"}\n',
+    _line(4, "DEBUG", "timer", "Tick"),
+]
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("".join(ENTRIES), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture(params=[64 * 1024, 16], ids=["one-block", "small-blocks"])
+def block_size(request, monkeypatch):
+    monkeypatch.setattr(log_reader, "BLOCK_SIZE", request.param)
+    return request.param
+
+
+def test_read_tail_keeps_multiline_entries_together(log_file, block_size):
+    records, start, size = read_tail(log_file, limit=3)
+    assert records == [ENTRIES[2].rstrip("\n"), ENTRIES[3].rstrip("\n"), ENTRIES[4].rstrip("\n")]
+    assert start == len("".join(ENTRIES[:2]).encode())
+    assert size == len("".join(ENTRIES).encode())
+
+    older, start, _ = read_tail(log_file, limit=3, before=start)
+    assert older == [ENTRIES[0].rstrip("\n"), ENTRIES[1].rstrip("\n")]
+    assert older[1].endswith("ValueError: kaputt")
+    assert start == 0
+
+
+def test_read_tail_filters_whole_entries(log_file, block_size):
+    records, _, _ = read_tail(log_file, log_filter=LogFilter(level="warning"))
+    assert [r.splitlines()[0] for r in records] == [ENTRIES[1].splitlines()[0], ENTRIES[3].rstrip("\n")]
+    records, _, _ = read_tail(log_file, log_filter=LogFilter(modules=["hue_wrapper.py"]))
+    assert len(records) == 2 and records[0].endswith("ValueError: kaputt")
+
+
+def test_read_since_follows_appends_and_holds_back_partial_lines(log_file):
+    _, _, cursor = read_tail(log_file, limit=1)
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write(_line(5, "INFO", "core_logic", "Neu") + "  Fortsetzung\n" + "2026-01-01 12:00:06 - INF")
+    records, cursor, reset = read_since(log_file, cursor)
+    assert records == [_line(5, "INFO", "core_logic", "Neu") + "  Fortsetzung"]
+    assert not reset
+
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write("O - [timer.py:1] - Rest\n")
+    records, cursor, _ = read_since(log_file, cursor, log_filter=LogFilter(modules=["timer"]))
+    assert records == ["2026-01-01 12:00:06 - INFO - [timer.py:1] - Rest"]
+    assert read_since(log_file, cursor) == ([], cursor, False)
+
+
+def test_read_since_restarts_after_rotation(log_file):
+    cursor = len("".join(ENTRIES).encode())
+    with open(log_file, "w", encoding="utf-8") as f:
+        f.write(ENTRIES[0])
+    records, new_cursor, reset = read_since(log_file, cursor)
+    assert reset and records == [ENTRIES[0].rstrip("\n")]
+    assert new_cursor == len(ENTRIES[0].encode())
+
+
+def test_unknown_level_is_rejected():
+    with pytest.raises(ValueError):
+        LogFilter(level="loud")
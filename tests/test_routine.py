@@ -0,0 +1,81 @@
+import logging
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.routine import Routine
+from src.scene import Scene
+
+T0 = datetime(2026, 3, 1, 12, 0)
+
+
+class FakeSensor:
+    def __init__(self):
+        self.motion = False
+
+    def get_motion(self):
+        return self.motion
+
+    def is_event_driven(self):
+        return True
+
+    def get_service_id(self, service_type):
+        return "motion-1"
+
+
+class FakeRoom:
+    def __init__(self):
+        self.applied = []
+
+    def apply_state(self, state):
+        self.applied.append(state["on"])
+
+
+@pytest.fixture
+def routine():
+    period = {"motion_check": True, "wait_time": {"min": 1, "sec": 0}, "scene_name": "aus", "x_scene_name": "an"}
+    config = {"daily_time": {"H1": 0, "M1": 0, "H2": 23, "M2": 59},
+              **{name: dict(period) for name in ("morning", "day", "evening", "night")}}
+    scenes = {"an": Scene(status=True, bri=200, ct=300), "aus": Scene(status=False, bri=0)}
+    routine = Routine("Flur", FakeRoom(), FakeSensor(), config, scenes, None, logging.getLogger(__name__), {})
+    routine.run(T0)
+    return routine
+
+
+def test_wait_time_starts_when_motion_ends(routine):
+    routine.sensor.motion = True
+    routine.run(T0 + timedelta(seconds=1))
+    assert routine.room.applied == [True]
+    # Mit Eventstream kommt der nächste Lauf erst mit dem Ende der Bewegung.
+    routine.sensor.motion = False
+    ended = T0 + timedelta(seconds=61)
+    routine.run(ended)
+    assert routine.room.applied == [True]
+    assert routine.next_deadline(ended) == ended + timedelta(minutes=1)
+
+    routine.run(ended + timedelta(seconds=59))
+    assert routine.room.applied == [True]
+    routine.run(ended + timedelta(minutes=1))
+    assert routine.room.applied == [True, False]
+
+
+def test_no_wait_deadline_while_motion_continues(routine):
+    routine.sensor.motion = True
+    routine.run(T0 + timedelta(seconds=1))
+    assert routine.next_deadline(T0 + timedelta(seconds=1)) == routine.time_span.next_change(T0 + timedelta(seconds=1))
+
+
+def test_motion_state_survives_restore(routine):
+    routine.sensor.motion = True
+    routine.run(T0 + timedelta(seconds=1))
+    state = routine.export_state()
+
+    restored = Routine("Flur", FakeRoom(), routine.sensor, routine.config, routine.scenes, None,
+                       logging.getLogger(__name__), {})
+    restored.restore_state(state)
+    routine.sensor.motion = False
+    restored.run(T0 + timedelta(seconds=90))
+    restored.run(T0 + timedelta(seconds=149))
+    assert restored.room.applied == []
+    restored.run(T0 + timedelta(seconds=150))
+    assert restored.room.applied == [False]
@@ -0,0 +1,126 @@
+import json
+import logging
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.routine import Routine
+from src.runtime_cache import CACHE_VERSION, RuntimeCache
+from src.scene import Scene
+
+T0 = datetime(2026, 3, 1, 12, 0)
+LOG = logging.getLogger(__name__)
+
+
+class FakeRoom:
+    def __init__(self):
+        self.applied = []
+
+    def apply_state(self, state):
+        self.applied.append(state)
+
+
+class FakeSensor:
+    motion = True
+
+    def get_motion(self):
+        return self.motion
+
+    def is_event_driven(self):
+        return True
+
+    def get_service_id(self, service_type):
+        return "motion-1"
+
+
+def _routine(config=None):
+    config = config or {
+        "id": "r1", "name": "Flur", "daily_time": {"H1": 0, "M1": 0, "H2": 23, "M2": 59},
+        **{p: {"scene_name": "hell", "motion_check": p == "night"} for p in ("morning", "day", "evening")},
+        "night": {"motion_check": True, "scene_name": "aus", "x_scene_name": "hell", "wait_time": {"min": 5, "sec": 0}},
+    }
+    scenes = {"hell": Scene(status=True, bri=254, ct=300), "aus": Scene(status=False, bri=0)}
+    return Routine(config["name"], FakeRoom(), FakeSensor(), config, scenes, None, LOG, {})
+
+
+def _restore(cache_file, routine):
+    cache = RuntimeCache(cache_file, LOG)
+    cache.load()
+    state = cache.get_automation_state(routine.automation_id, routine.config_fingerprint)
+    if state:
+        routine.restore_state(state)
+    return state
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return str(tmp_path / "runtime_cache.json")
+
+
+def test_restart_restores_state_and_does_not_reapply_scene(cache_file):
+    before = _routine()
+    before.run(T0)
+    assert len(before.room.applied) == 1
+    assert RuntimeCache(cache_file, LOG).save([before])
+
+    after = _routine()
+    assert _restore(cache_file, after)
+    after.run(T0 + timedelta(minutes=1))
+    assert after.room.applied == []
+    assert (after.current_period, after.last_scene_name) == ("day", "hell")
+
+
+def test_restart_restores_motion_timer(cache_file):
+    night = datetime(2026, 3, 1, 23, 59, 30)
+    before = _routine()
+    before.run(night - timedelta(seconds=1))
+    before.run(night)
+    assert before.is_in_motion_state
+    RuntimeCache(cache_file, LOG).save([before])
+
+    after = _routine()
+    _restore(cache_file, after)
+    assert after.last_motion_time == before.last_motion_time
+    assert after.next_deadline(night) == before.next_deadline(night)
+
+
+def test_changed_config_discards_cached_state(cache_file):
+    before = _routine()
+    before.run(T0)
+    RuntimeCache(cache_file, LOG).save([before])
+
+    config = dict(before.config, day={"scene_name": "aus"})
+    after = _routine(config)
+    assert _restore(cache_file, after) is None
+    after.run(T0)
+    assert after.room.applied == [Scene(status=False, bri=0).get_state()]
+
+
+@pytest.mark.parametrize("content", ["{nicht json", json.dumps({"version": CACHE_VERSION + 1, "automations": {}})])
+def test_corrupt_or_foreign_cache_is_ignored(cache_file, content):
+    with open(cache_file, "w", encoding="utf-8") as f:
+        f.write(content)
+    cache = RuntimeCache(cache_file, LOG)
+    assert not cache.load()
+    assert cache.get_automation_state("r1", "x") is None
+    assert cache.get_bridge_data("192.168.0.2") is None
+
+
+def test_bridge_data_belongs_to_its_bridge(cache_file):
+    cache = RuntimeCache(cache_file, LOG)
+    cache.set_bridge_data("192.168.0.2", {"rooms": []})
+    cache.save([], force=True)
+    reloaded = RuntimeCache(cache_file, LOG)
+    assert reloaded.load()
+    assert reloaded.get_bridge_data("192.168.0.2") == {"rooms": []}
+    assert reloaded.get_bridge_data("192.168.0.3") is None
+
+
+def test_unchanged_state_is_not_rewritten(cache_file):
+    routine = _routine()
+    routine.run(T0)
+    cache = RuntimeCache(cache_file, LOG)
+    assert cache.save([routine])
+    assert not cache.save([routine])
+    routine.run(T0.replace(hour=23, minute=59, second=30))
+    assert cache.save([routine])
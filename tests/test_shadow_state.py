@@ -0,0 +1,77 @@
+import requests
+
+from src.bridge_simulator import DEFAULT_APP_KEY
+from src.hue_wrapper import HueBridge
+from src.shadow_state import ShadowState
+
+HEADERS = {"hue-application-key": DEFAULT_APP_KEY}
+
+
+def _shadow(state):
+    shadow = ShadowState()
+    shadow.record_sent("gl1", state)
+    return shadow
+
+
+def test_diff_sends_only_changed_fields():
+    shadow = _shadow({"on": True, "bri": 200, "ct": 300, "transitiontime": 4})
+    assert shadow.diff("gl1", {"on": True, "bri": 201, "ct": 300, "transitiontime": 4}) == {}
+    assert shadow.diff("gl1", {"on": True, "bri": 100, "ct": 300, "transitiontime": 4}) == {"bri": 100, "transitiontime": 4}
+
+
+def test_matching_light_event_keeps_shadow():
+    shadow = _shadow({"on": True, "bri": 254, "ct": 300})
+    shadow.observe_member("gl1", {"id": "l1", "type": "light", "on": {"on": True},
+                                  "dimming": {"brightness": 100.0}, "color_temperature": {"mirek": 300}})
+    assert shadow.get("gl1") == {"on": True, "bri": 254, "ct": 300}
+
+
+def test_deviating_light_event_invalidates_shadow():
+    for light in (
+        {"color_temperature": {"mirek": 200, "mirek_valid": True}},
+        {"color_temperature": {"mirek": None, "mirek_valid": False}, "color": {"xy": {"x": 0.6, "y": 0.3}}},
+        {"on": {"on": False}},
+    ):
+        shadow = _shadow({"on": True, "bri": 254, "ct": 300})
+        shadow.observe_member("gl1", {"id": "l1", "type": "light", **light})
+        assert shadow.get("gl1") is None, light
+
+
+def test_colour_change_cannot_be_verified_for_hue_shadow():
+    shadow = _shadow({"on": True, "bri": 254, "hue": 1000, "sat": 200})
+    shadow.observe_member("gl1", {"id": "l1", "type": "light", "color": {"xy": {"x": 0.3, "y": 0.3}}})
+    assert shadow.get("gl1") is None
+
+
+def test_external_light_change_reapplies_scene(simulator, wait_for):
+    bridge = HueBridge(simulator.address, DEFAULT_APP_KEY)
+    try:
+        bridge.start_event_stream(blocking=True)
+        bridge.start_command_scheduler(group_rate=50)
+        assert wait_for(bridge.has_live_events)
+        room_id = simulator.state.ids("room")[0]
+        grouped_light_id = bridge.topology.grouped_light_for_group(room_id)
+        light_id = next(
+            light["id"] for light in simulator.state.get_all("light")
+            if bridge.topology.room_for_light(light["id"]) == room_id
+        )
+        scene = {"on": True, "bri": 254, "ct": 300}
+
+        def group_puts():
+            return sum(1 for entry in simulator.command_log if entry["type"] == "grouped_light")
+
+        bridge.set_group_state(room_id, scene)
+        assert wait_for(lambda: group_puts() == 1)
+        assert wait_for(lambda: (bridge.get_resource_by_id("light", light_id) or {})
+                        .get("color_temperature", {}).get("mirek") == 300)
+        bridge.set_group_state(room_id, scene)
+        assert group_puts() == 1
+
+        # Farbtemperatur einer Lampe von außen ändern (z.B. Hue-App).
+        requests.put(f"https://{simulator.address}/clip/v2/resource/light/{light_id}",
+                     json={"color_temperature": {"mirek": 200}}, headers=HEADERS, verify=False, timeout=5)
+        assert wait_for(lambda: bridge._shadow.get(grouped_light_id) is None)
+        bridge.set_group_state(room_id, scene)
+        assert wait_for(lambda: group_puts() == 2)
+    finally:
+        bridge.close()
@@ -0,0 +1,78 @@
+import socket
+import time
+
+import pytest
+
+from src.status_channel import StatusPublisher, StatusSubscriber
+
+
+@pytest.fixture
+def channel(tmp_path):
+    path = str(tmp_path / "status.sock")
+    publisher = StatusPublisher(path)
+    publisher.start()
+    subscribers = []
+
+    def subscribe():
+        subscriber = StatusSubscriber(path, retry_delay_s=0.05).start()
+        subscribers.append(subscriber)
+        return subscriber
+
+    yield publisher, subscribe
+    for subscriber in subscribers:
+        subscriber.stop()
+    publisher.stop()
+
+
+def _status(name, state="aktiv"):
+    return {"name": name, "state": state}
+
+
+def test_subscriber_gets_snapshot_and_applies_deltas(channel, wait_for):
+    publisher, subscribe = channel
+    publisher.publish({"a": _status("A"), "b": _status("B")}, {"telemetry": {"written": 1}})
+    subscriber = subscribe()
+    messages = []
+    subscriber.add_listener(messages.append)
+    assert wait_for(lambda: subscriber.version == publisher.version)
+    assert [a["name"] for a in subscriber.get_status()["automations"]] == ["A", "B"]
+
+    publisher.publish({"b": _status("B", "aus"), "c": _status("C")}, {})
+    assert wait_for(lambda: subscriber.version == publisher.version)
+
+    delta = messages[-1]
+    assert delta["type"] == "delta"
+    assert delta["automations"] == {"b": _status("B", "aus"), "c": _status("C")}
+    assert delta["removed"] == ["a"] and delta["removed_extras"] == ["telemetry"]
+    assert delta["order"] == ["b", "c"]
+    status = subscriber.get_status()
+    assert status["automations"] == [_status("B", "aus"), _status("C")]
+    assert "telemetry" not in status
+    assert status["version"] == f"{publisher.epoch}-{publisher.version}"
+
+
+def test_unchanged_status_is_not_published(channel):
+    publisher, _ = channel
+    assert publisher.publish({"a": _status("A")}, {"sun_times": {}})
+    version = publisher.version
+    assert not publisher.publish({"a": _status("A")}, {"sun_times": {}})
+    assert publisher.version == version
+
+
+def test_stalled_subscriber_does_not_block_publish(channel, wait_for):
+    publisher, subscribe = channel
+    subscriber = subscribe()
+    assert wait_for(lambda: subscriber.connected)
+    stalled = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stalled.connect(publisher.socket_path)
+    try:
+        payload = "x" * 200_000
+        started = time.monotonic()
+        for index in range(20):
+            publisher.publish({"a": _status("A", f"{index}{payload}")}, {})
+        # Senden läuft im eigenen Thread: der hängende Abonnent hält die Aufrufer nicht auf.
+        assert time.monotonic() - started < 0.5
+        assert wait_for(lambda: subscriber.version == publisher.version)
+        assert subscriber.get_status()["automations"][0]["state"].startswith("19")
+    finally:
+        stalled.close()
@@ -0,0 +1,95 @@
+import pytest
+
+from src.telemetry import TelemetryRecorder, aggregate, bucket_start, connect, init_schema
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    path = str(tmp_path / "sensor_data.db")
+    con = connect(path)
+    init_schema(con)
+    con.close()
+    return path
+
+
+def _write(db_file, rows):
+    recorder = TelemetryRecorder(db_file, flush_interval_s=0.01)
+    recorder.start()
+    recorder.record_many(rows)
+    recorder.stop()
+    return recorder
+
+
+def _rollup(db_file, table):
+    con = connect(db_file)
+    try:
+        return con.execute(f"SELECT bucket, sensor_id, measurement_type, min, max, sum, count FROM {table} "
+                           f"ORDER BY sensor_id, measurement_type, bucket").fetchall()
+    finally:
+        con.close()
+
+
+def test_bucket_start_aligns_to_window():
+    assert bucket_start("2026-03-01T14:07:59.123", 300) == "2026-03-01T14:05:00"
+    assert bucket_start("2026-03-01T14:07:59.123", 3600) == "2026-03-01T14:00:00"
+    assert bucket_start("2026-03-01T14:07:59.123", 86400) == "2026-03-01T00:00:00"
+
+
+def test_aggregate_groups_per_window_sensor_and_type():
+    rows = [
+        ("2026-03-01T14:01:00.000", "s1", "brightness", 10.0),
+        ("2026-03-01T14:04:00.000", "s1", "brightness", 30.0),
+        ("2026-03-01T14:06:00.000", "s1", "brightness", 5.0),
+        ("2026-03-01T14:01:00.000", "s2", "brightness", 7.0),
+    ]
+    assert sorted(aggregate(rows, 300)) == [
+        ("2026-03-01T14:00:00", "s1", "brightness", 10.0, 30.0, 40.0, 2),
+        ("2026-03-01T14:00:00", "s2", "brightness", 7.0, 7.0, 7.0, 1),
+        ("2026-03-01T14:05:00", "s1", "brightness", 5.0, 5.0, 5.0, 1),
+    ]
+
+
+def test_flushes_accumulate_into_rollups(db_file):
+    _write(db_file, [("2026-03-01T14:01:00.000", "s1", "temperature", 20.0)])
+    recorder = _write(db_file, [("2026-03-01T14:31:00.000", "s1", "temperature", 22.0)])
+    assert recorder.rows_written == 1
+    assert _rollup(db_file, "measurements_hourly") == [
+        ("2026-03-01T14:00:00", "s1", "temperature", 20.0, 22.0, 42.0, 2),
+    ]
+    assert len(_rollup(db_file, "measurements_5min")) == 2
+
+
+def test_duplicate_rows_are_not_counted_twice(db_file):
+    row = ("2026-03-01T14:01:00.000", "s1", "temperature", 20.0)
+    _write(db_file, [row])
+    recorder = _write(db_file, [row, ("2026-03-01T14:01:00.000", "s1", "temperature", 99.0),
+                                ("2026-03-01T14:02:00.000", "s1", "temperature", 21.0)])
+    assert recorder.rows_written == 1
+    assert _rollup(db_file, "measurements_daily") == [
+        ("2026-03-01T00:00:00", "s1", "temperature", 20.0, 21.0, 41.0, 2),
+    ]
+    con = connect(db_file)
+    try:
+        assert con.execute("SELECT count(*), sum(value) FROM measurements").fetchone() == (2, 41.0)
+    finally:
+        con.close()
+
+
+def test_init_schema_backfills_empty_rollups(tmp_path):
+    path = str(tmp_path / "old.db")
+    con = connect(path)
+    con.execute("CREATE TABLE measurements (timestamp TEXT NOT NULL, sensor_id TEXT NOT NULL, "
+                "measurement_type TEXT NOT NULL, value REAL NOT NULL, "
+                "PRIMARY KEY (timestamp, sensor_id, measurement_type))")
+    con.executemany("INSERT INTO measurements VALUES (?, ?, ?, ?)", [
+        ("2026-03-01T14:01:00.000", "s1", "brightness", 10.0),
+        ("2026-03-01T14:12:00.000", "s1", "brightness", 20.0),
+    ])
+    con.commit()
+    init_schema(con)
+    con.close()
+    assert _rollup(path, "measurements_5min") == [
+        ("2026-03-01T14:00:00", "s1", "brightness", 10.0, 10.0, 10.0, 1),
+        ("2026-03-01T14:10:00", "s1", "brightness", 20.0, 20.0, 20.0, 1),
+    ]
+    assert _rollup(path, "measurements_hourly")[0][3:] == (10.0, 20.0, 30.0, 2)
@@ -1,7 +1,9 @@
 import os
 from flask import Flask, render_template, send_from_directory
 from flask_cors import CORS
-from src.hue_wrapper import HueBridge
+from src.bridge_gateway import BridgeClient
+from src.event_hub import EventHub, LogFollower
+from src.status_channel import StatusSubscriber
 
 from .api.bridge import BridgeAPI
 from .api.config_api import ConfigAPI
@@ -10,6 +12,11 @@ from .api.floorplan_api import FloorplanAPI
 from .api.setup import SetupAPI
 from .api.system import SystemAPI
 
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+STATUS_SOCKET = os.path.join(BASE_DIR, "data", "status.sock")
+BRIDGE_SOCKET = os.path.join(BASE_DIR, "data", "bridge.sock")
+LOG_FILE = os.path.join(BASE_DIR, "data", "app.log")
+
 def create_app(config_manager=None, logger_instance=None, app_config=None):
     """
     Erstellt und konfiguriert die Flask-Anwendung (Application Factory).
@@ -17,21 +24,31 @@ def create_app(config_manager=None, logger_instance=None, app_config=None):
     app = Flask(__name__, template_folder='templates', static_folder='static')
     CORS(app)
 
-    # Bridge-Instanz für den Webserver erstellen und im App-Kontext speichern
-    if app_config and app_config.get("bridge_ip"):
-        bridge = HueBridge(
-            ip=app_config.get("bridge_ip"),
-            app_key=app_config.get("app_key"),
-            logger=logger_instance
-        )
-        app.bridge_instance = bridge
-    else:
-        app.bridge_instance = None
-        if logger_instance:
-            logger_instance.warning("Keine Bridge-Konfiguration für den Webserver gefunden.")
+    # Die Bridge gehört der Kernlogik; der Webserver nutzt deren Verbindung, Spiegel
+    # und Befehlswarteschlange über den Socket (siehe src/bridge_gateway.py).
+    app.bridge_instance = BridgeClient(BRIDGE_SOCKET, logger_instance)
+    if logger_instance and not (app_config and app_config.get("bridge_ip")):
+        logger_instance.warning("Keine Bridge-Konfiguration für den Webserver gefunden.")
 
     app.config_manager = config_manager
     app.logger_instance = logger_instance
+    # Status der Kernlogik wird über den Unix-Socket empfangen und im Speicher gehalten.
+    app.status_subscriber = StatusSubscriber(STATUS_SOCKET, logger_instance)
+    # Ein gemeinsamer Hub versorgt alle SSE-Verbindungen (/api/data/stream).
+    app.event_hub = EventHub()
+
+    def forward_status(message):
+        if message.get("type") == "snapshot":
+            app.event_hub.publish("snapshot", app.status_subscriber.get_snapshot())
+        else:
+            app.event_hub.publish("delta", message)
+
+    app.status_subscriber.add_listener(forward_status)
+    app.status_subscriber.start()
+    app.log_follower = LogFollower(
+        LOG_FILE, lambda lines, offset: app.event_hub.publish("log", {"lines": lines, "offset": offset}),
+        logger=logger_instance,
+    ).start()
 
     # API-Endpunkte (Blueprints) registrieren
     app.register_blueprint(BridgeAPI, url_prefix='/api/bridge')
@@ -3,36 +3,31 @@ API-Endpunkte für die direkte Kommunikation mit der Philips Hue Bridge (v2 API)
 """
 import json
 from flask import Blueprint, jsonify, request, current_app, Response
-from src.hue_wrapper import HueBridge
-from typing import List
+from src.bridge_gateway import BridgeClient
+from src.connection_health import BridgeUnavailableError
 
 BridgeAPI = Blueprint("bridge_api", __name__)
 
-def get_bridge_instance() -> HueBridge | None:
+def get_bridge_instance() -> BridgeClient | None:
     """
-    Holt die Bridge-Instanz aus dem App-Kontext oder initialisiert sie,
-    falls sie bei App-Start noch nicht konfiguriert war (Lazy Initialization).
+    Zugang zur Bridge der Kernlogik über das Bridge-Gateway. Ist die Bridge
+    (oder die Kernlogik) nicht erreichbar, werfen die Aufrufe sofort
+    BridgeUnavailableError (-> 503); die Wiederverbindung läuft in der
+    Kernlogik im Hintergrund.
     """
-    bridge = getattr(current_app, 'bridge_instance', None)
-    
-    if not bridge:
-        config = current_app.config_manager.get_full_config()
-        bridge_ip = config.get("bridge_ip")
-        app_key = config.get("app_key")
-        
-        if bridge_ip and app_key:
-            bridge = HueBridge(
-                ip=bridge_ip, app_key=app_key, logger=current_app.logger_instance
-            )
-            current_app.bridge_instance = bridge
-        else:
-            current_app.logger_instance.error("JIT-Initialisierung fehlgeschlagen: Bridge-IP/App-Key fehlen.")
-            return None
-
-    if not bridge.is_connected():
-        bridge.connect()
-    
-    return bridge if bridge.is_connected() else None
+    return getattr(current_app, 'bridge_instance', None)
+
+@BridgeAPI.errorhandler(BridgeUnavailableError)
+def handle_bridge_unavailable(e):
+    return jsonify({"error": "Bridge nicht erreichbar"}), 503
+
+@BridgeAPI.route("/health")
+def get_bridge_health():
+    """Zustand der Bridge-Verbindung der Kernlogik inkl. der letzten Zustandswechsel."""
+    try:
+        return jsonify(current_app.bridge_instance.health.snapshot())
+    except BridgeUnavailableError:
+        return jsonify({"state": "unconfigured", "transitions": []})
 
 @BridgeAPI.route("/all_grouped_lights")
 def get_all_grouped_lights():
@@ -47,19 +42,14 @@ def get_all_bridge_items():
         return jsonify({"error": "Bridge nicht erreichbar oder konfiguriert"}), 503
     
     try:
-        bridge_data = bridge.get_full_api_data()
-        all_devices = bridge_data.get("devices", [])
-
-        # --- MAXIMAL ROBUSTE DATENVERARBEITUNG ---
-        def get_light_ids_from_devices(device_ids: List[str]) -> List[str]:
-            light_ids = []
-            if not device_ids: return []
-            for device in all_devices:
-                if device and device.get('id') in device_ids:
-                    for service in device.get('services', []):
-                        if service and service.get('rtype') == 'light' and service.get('rid'):
-                            light_ids.append(service.get('rid'))
-            return light_ids
+        bridge_data = bridge.get_full_api_data(
+            resource_types=("lights", "scenes", "devices", "rooms", "zones"), allow_partial=True
+        )
+        if not bridge_data:
+            return jsonify({"error": "Bridge-Daten konnten nicht geladen werden."}), 503
+        if not bridge_data.get("errors"):
+            bridge.refresh_topology(bridge_data)
+        topology = bridge.topology
 
         rooms = []
         for r in bridge_data.get("rooms", []):
@@ -68,7 +58,7 @@ def get_all_bridge_items():
                 rooms.append({
                     "id": r.get('id'),
                     "name": r.get('metadata', {}).get('name', 'Unbenannter Raum'),
-                    "lights": get_light_ids_from_devices(device_ids)
+                    "lights": [light_id for device_id in device_ids for light_id in topology.device_services(device_id, 'light')]
                 })
         
         zones = []
@@ -86,7 +76,7 @@ def get_all_bridge_items():
             {
                 "id": dev.get('id'),
                 "name": dev.get('metadata', {}).get('name', 'Unbenannter Sensor')
-            } for dev in all_devices if dev and any(s and s.get('rtype') == 'motion' for s in dev.get('services', []))
+            } for dev in bridge_data.get("devices", []) if dev and topology.service_id(dev.get('id'), 'motion')
         ]
 
         response_data = {
@@ -94,10 +84,13 @@ def get_all_bridge_items():
             "zones": zones,
             "sensors": sensors,
             "lights": bridge_data.get("lights", []),
-            "scenes": bridge_data.get("scenes", [])
+            "scenes": bridge_data.get("scenes", []),
+            "errors": bridge_data.get("errors", {})
         }
         return Response(json.dumps(response_data), mimetype='application/json')
 
+    except BridgeUnavailableError:
+        raise
     except Exception as e:
         current_app.logger_instance.error(f"Fehler beim Verarbeiten der Bridge-Daten: {e}", exc_info=True)
         return jsonify({"error": "Fehler beim Verarbeiten der Bridge-Daten."}), 500
@@ -135,7 +128,7 @@ def create_scene():
     bridge = get_bridge_instance()
     if not bridge: return jsonify({"error": "Bridge nicht erreichbar"}), 503
     data = request.get_json()
-    group_type = 'room' if bridge.get_resource_by_id('room', data.get("group_id")) else 'zone'
+    group_type = bridge.topology.group_type(data.get("group_id")) or 'zone'
     response = bridge.create_scene(
         name=data.get("name"), group_id=data.get("group_id"),
         group_type=group_type, actions=data.get("actions")
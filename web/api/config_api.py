@@ -3,7 +3,9 @@ API-Endpunkte für das Management der Konfigurationsdateien.
 """
 import os
 import shutil
+import uuid
 from flask import Blueprint, jsonify, request, current_app
+from src.runtime_cache import get_automation_id
 
 ConfigAPI = Blueprint("config_api", __name__)
 
@@ -17,6 +19,29 @@ AUTOMATION_BACKUP_FILE = os.path.join(DATA_DIR, "automation.backup.yaml")
 HOME_BACKUP_FILE = os.path.join(DATA_DIR, "home.backup.yaml")
 
 
+def _assign_automation_ids(automations: list, stored: list) -> list:
+    """
+    Vergibt fehlende IDs. Eine bereits gespeicherte Automation mit gleichem Typ und
+    Namen behält ihre ID, auch wenn der Client sie (noch) nicht kennt; nur neue
+    Automationen erhalten eine neue. Liefert die IDs in der Reihenfolge der Liste.
+    """
+    known = {}
+    for automation in stored or []:
+        if isinstance(automation, dict) and automation.get("id"):
+            known.setdefault(get_automation_id({**automation, "id": None}), automation["id"])
+    taken = {a.get("id") for a in automations if isinstance(a, dict) and a.get("id")}
+    ids = []
+    for automation in automations:
+        if not isinstance(automation, dict):
+            ids.append(None)
+            continue
+        if not automation.get("id"):
+            stored_id = known.pop(get_automation_id(automation), None)
+            automation["id"] = stored_id if stored_id and stored_id not in taken else uuid.uuid4().hex
+            taken.add(automation["id"])
+        ids.append(automation["id"])
+    return ids
+
 @ConfigAPI.route("/", methods=["GET"])
 def get_config():
     """Gibt die gesamte Konfiguration zurück."""
@@ -36,6 +61,10 @@ def save_config():
         "global_settings": data.get("global_settings"),
         "location": data.get("location")
     }
+    # Stabile IDs, damit die Kernlogik Laufzeitzustände über Umbenennungen hinweg zuordnen kann.
+    stored = (current_app.config_manager.get_full_config() or {}).get("automations")
+    automation_ids = _assign_automation_ids(data.get("automations") or [], stored)
+
     automation_data = {
         "automations": data.get("automations"),
         "scenes": data.get("scenes")
@@ -48,7 +77,7 @@ def save_config():
        current_app.config_manager.safe_write(AUTOMATION_FILE, automation_data) and \
        current_app.config_manager.safe_write(HOME_FILE, home_data):
         current_app.logger_instance.info("Konfiguration wurde über die API gespeichert.")
-        return jsonify({"message": "Konfiguration erfolgreich gespeichert."})
+        return jsonify({"message": "Konfiguration erfolgreich gespeichert.", "automation_ids": automation_ids})
     
     return jsonify({"error": "Speichern der Konfiguration fehlgeschlagen."}), 500
 
@@ -1,71 +1,176 @@
 """
 API-Endpunkte für den Zugriff auf Laufzeit- und historische Daten.
 """
+import csv
+import io
+import json
 import os
 import sqlite3
-import json
+import zlib
 from datetime import datetime, timedelta
-import pandas as pd
-from flask import Blueprint, jsonify, request, Response, current_app
+from flask import Blueprint, jsonify, request, Response, current_app, stream_with_context
+
+from src.history import RESOLUTIONS, iter_measurements, query_history
+from src.log_reader import LogFilter, read_since, read_tail
 
 DataAPI = Blueprint("data_api", __name__)
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 DB_FILE = os.path.join(BASE_DIR, "sensor_data.db")
 LOG_FILE = os.path.join(BASE_DIR, "data", "app.log")
-STATUS_FILE = os.path.join(BASE_DIR, "data", "status.json")
 
 @DataAPI.route("/history")
 def get_data_history():
-    """Gibt historische Sensordaten aus der Datenbank zurück."""
+    """
+    Gibt historische Sensordaten zurück. Parameter:
+    sensor_id (mehrfach oder kommagetrennt), Zeitraum per 'date' (ein Tag) oder
+    'start'/'end', Fenstergröße per 'bucket' (Sekunden) oder 'resolution'
+    (sonst aus dem Zeitraum gewählt), 'fill=1' füllt Lücken linear.
+    """
     try:
-        sensor_id = request.args.get("sensor_id")
-        if not sensor_id:
+        sensor_ids = [s for value in request.args.getlist("sensor_id") for s in value.split(",") if s]
+        if not sensor_ids:
             return jsonify({"labels": [], "brightness": [], "temperature": []})
 
-        date_str = request.args.get("date")
-        start_date = datetime.fromisoformat(date_str)
-        end_date = start_date + timedelta(days=1)
-        
-        with sqlite3.connect(DB_FILE) as con:
-            query = "SELECT timestamp, measurement_type, value FROM measurements WHERE sensor_id = ? AND timestamp >= ? AND timestamp < ?"
-            df = pd.read_sql_query(query, con, params=(sensor_id, start_date.isoformat(), end_date.isoformat()))
+        if request.args.get("start"):
+            start_date = datetime.fromisoformat(request.args["start"])
+            end_date = datetime.fromisoformat(request.args["end"]) if request.args.get("end") else datetime.now()
+        else:
+            start_date = datetime.fromisoformat(request.args.get("date"))
+            end_date = start_date + timedelta(days=1)
+        resolution = request.args.get("resolution")
+        if resolution and resolution not in RESOLUTIONS:
+            return jsonify({"error": f"Unbekannte Auflösung: {resolution}"}), 400
+        bucket_s = request.args.get("bucket", type=int) or RESOLUTIONS.get(resolution)
+        fill = request.args.get("fill", "0").lower() in ("1", "true", "yes")
 
-        if df.empty:
-            return jsonify({"labels": [], "brightness": [], "temperature": []})
-        
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df_pivot = df.pivot(index="timestamp", columns="measurement_type", values="value").resample("5min").mean().interpolate(method="time")
-        
-        if "brightness" not in df_pivot.columns:
-            df_pivot["brightness"] = None
-        if "temperature" not in df_pivot.columns:
-            df_pivot["temperature"] = None
-
-        return jsonify({
-            "labels": df_pivot.index.strftime('%Y-%m-%dT%H:%M:%S').tolist(),
-            "brightness": df_pivot["brightness"].round(2).where(pd.notna(df_pivot["brightness"]), None).tolist(),
-            "temperature": df_pivot["temperature"].round(2).where(pd.notna(df_pivot["temperature"]), None).tolist(),
-        })
-    except (sqlite3.Error, ValueError, KeyError) as e:
+        with sqlite3.connect(DB_FILE, timeout=5) as con:
+            result = query_history(con, sensor_ids, start_date, end_date, bucket_s, fill=fill)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except (sqlite3.Error, TypeError) as e:
         current_app.logger_instance.error(f"Fehler bei der Abfrage der Datenhistorie: {e}")
         return jsonify({"error": f"Datenbank- oder Datenfehler: {e}"}), 500
+    if len(sensor_ids) == 1:
+        # Bisheriges Format für einen einzelnen Sensor beibehalten.
+        result.update(result["series"][sensor_ids[0]])
+    return jsonify(result)
+
+def _encode_csv(chunks):
+    yield "timestamp,sensor_id,measurement_type,value\r\n".encode("utf-8")
+    for rows in chunks:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _encode_ndjson(chunks):
+    for rows in chunks:
+        yield "".join(
+            json.dumps({"timestamp": t, "sensor_id": s, "measurement_type": m, "value": v}) + "\n"
+            for t, s, m, v in rows
+        ).encode("utf-8")
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@DataAPI.route("/export")
+def export_data():
+    """
+    Exportiert Rohdaten als Datei-Download im Stream. Parameter: format (csv|ndjson),
+    gzip=1, sensor_id und type (mehrfach oder kommagetrennt), start/end (ISO).
+    """
+    fmt = request.args.get("format", "csv").lower()
+    if fmt not in ("csv", "ndjson"):
+        return jsonify({"error": f"Unbekanntes Format: {fmt}"}), 400
+    try:
+        start = datetime.fromisoformat(request.args["start"]) if request.args.get("start") else None
+        end = datetime.fromisoformat(request.args["end"]) if request.args.get("end") else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    sensor_ids = [s for value in request.args.getlist("sensor_id") for s in value.split(",") if s]
+    types = [t for value in request.args.getlist("type") for t in value.split(",") if t]
+    compress = request.args.get("gzip", "0").lower() in ("1", "true", "yes")
+
+    def generate():
+        try:
+            chunks = iter_measurements(DB_FILE, sensor_ids, types, start, end)
+            body = _encode_csv(chunks) if fmt == "csv" else _encode_ndjson(chunks)
+            yield from _gzip(body) if compress else body
+        except sqlite3.Error as e:
+            # Kopfzeilen sind bereits gesendet; der Abbruch wird nur protokolliert.
+            current_app.logger_instance.error(f"Fehler beim Export der Messdaten: {e}")
+
+    filename = f"measurements.{fmt}" + (".gz" if compress else "")
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    if compress:
+        mimetype = "application/gzip"
+    return Response(
+        stream_with_context(generate()), mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 @DataAPI.route("/log")
 def get_log():
-    """Gibt die letzten 500 Zeilen der Log-Datei zurück."""
+    """
+    Gibt Einträge der Log-Datei zurück, ohne die ganze Datei zu lesen. Parameter:
+    lines (Standard 500), before (Offset zum Zurückblättern) oder cursor (nur neue
+    Einträge ab diesem Offset), level (Mindest-Level), module (kommagetrennt),
+    format=json. Im Textformat stehen die Offsets in X-Log-Cursor/X-Log-Start.
+    """
     try:
-        with open(LOG_FILE, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-        return Response("".join(lines[-500:]), mimetype="text/plain")
+        limit = min(max(request.args.get("lines", 500, type=int), 1), 5000)
+        log_filter = LogFilter(request.args.get("level"), request.args.get("module", "").split(","))
+        cursor = request.args.get("cursor", type=int)
+        if cursor is not None:
+            entries, cursor, reset = read_since(LOG_FILE, cursor, log_filter)
+            start = None
+        else:
+            entries, start, cursor = read_tail(LOG_FILE, limit, request.args.get("before", type=int), log_filter)
+            reset = False
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except IOError:
         return "Log-Datei nicht gefunden.", 404
 
+    if request.args.get("format") == "json":
+        return jsonify({"lines": entries, "cursor": cursor, "start": start, "reset": reset})
+    headers = {"X-Log-Cursor": str(cursor)}
+    if start is not None:
+        headers["X-Log-Start"] = str(start)
+    return Response("\n".join(entries) + ("\n" if entries else ""), mimetype="text/plain", headers=headers)
+
+@DataAPI.route("/stream")
+def stream_events():
+    """
+    Server-Sent Events: 'snapshot' (vollständiger Status), 'delta' (Status-Änderungen)
+    und 'log' (neue Log-Zeilen). Wiederaufnahme über den Header Last-Event-ID.
+    """
+    hub = current_app.event_hub
+    subscriber = current_app.status_subscriber
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    return Response(
+        hub.stream(last_event_id, lambda: ("snapshot", subscriber.get_snapshot())),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @DataAPI.route("/status")
 def get_status():
-    """Gibt den aktuellen Status der Routinen zurück."""
-    try:
-        with open(STATUS_FILE, "r", encoding="utf-8") as f:
-            return Response(f.read(), mimetype="application/json")
-    except (FileNotFoundError, json.JSONDecodeError):
-        return jsonify({"routines": [], "sun_times": None})
\ No newline at end of file
+    """Gibt den aktuellen Status der Routinen aus dem Speicher zurück (ETag = Statusversion)."""
+    subscriber = current_app.status_subscriber
+    if not subscriber.epoch:
+        return jsonify({"routines": [], "sun_times": None})
+    status = subscriber.get_status()
+    if status["version"] in request.if_none_match:
+        return Response(status=304, headers={"ETag": status["version"]})
+    response = jsonify(status)
+    response.set_etag(status["version"])
+    return response
\ No newline at end of file
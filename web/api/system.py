@@ -2,13 +2,17 @@
 API-Endpunkte für Systemaktionen wie Neustart und Update.
 """
 import os
+import json
 import subprocess
-from flask import Blueprint, jsonify, current_app
+from flask import Blueprint, Response, jsonify, request, current_app
 
 SystemAPI = Blueprint("system_api", __name__)
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 RESTART_FLAG_FILE = os.path.join(BASE_DIR, "data", "restart.flag")
+METRICS_FILE = os.path.join(BASE_DIR, "data", "metrics.json")
+PROFILE_REQUEST_FILE = os.path.join(BASE_DIR, "data", "profile.request")
+PROFILE_FILE = os.path.join(BASE_DIR, "data", "profile.txt")
 
 @SystemAPI.route("/restart", methods=["POST"])
 def restart_app():
@@ -72,4 +76,44 @@ def add_default_scenes():
             
     except Exception as e:
         current_app.logger_instance.error(f"Fehler beim Hinzufügen der Standard-Szenen: {e}", exc_info=True)
-        return jsonify({"error": "Ein interner Fehler ist aufgetreten."}), 500
\ No newline at end of file
+        return jsonify({"error": "Ein interner Fehler ist aufgetreten."}), 500
+
+@SystemAPI.route("/metrics")
+def get_metrics():
+    """Laufzeiten und Fehler der Kernlogik (pro Automation, Bridge-Endpunkt und Gateway-Anfrage) sowie des Webservers."""
+    try:
+        with open(METRICS_FILE, "r", encoding="utf-8") as f:
+            core_metrics = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        core_metrics = None
+    bridge = current_app.bridge_instance
+    web_metrics = {"gateway": bridge.metrics.snapshot().get("gateway", {}) if bridge else {}}
+    return jsonify({"core": core_metrics, "web": web_metrics})
+
+@SystemAPI.route("/profile", methods=["POST"])
+def request_profile():
+    """Fordert eine cProfile-Aufnahme der nächsten N Durchläufe der Kernlogik an."""
+    data = request.get_json(silent=True) or {}
+    try:
+        ticks = int(data.get("ticks", 50))
+    except (TypeError, ValueError):
+        return jsonify({"error": "'ticks' muss eine Zahl sein."}), 400
+    if not 1 <= ticks <= 10000:
+        return jsonify({"error": "'ticks' muss zwischen 1 und 10000 liegen."}), 400
+    try:
+        # Atomar ersetzen: die Kernlogik liest die Datei, sobald ihr Watcher sie meldet.
+        with open(PROFILE_REQUEST_FILE + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"ticks": ticks}, f)
+        os.replace(PROFILE_REQUEST_FILE + ".tmp", PROFILE_REQUEST_FILE)
+        return jsonify({"message": f"Profiling der nächsten {ticks} Durchläufe angefordert."})
+    except IOError as e:
+        return jsonify({"error": f"Profiling konnte nicht angefordert werden: {e}"}), 500
+
+@SystemAPI.route("/profile", methods=["GET"])
+def get_profile():
+    """Gibt das Ergebnis der letzten Profiling-Aufnahme als Text zurück."""
+    try:
+        with open(PROFILE_FILE, "r", encoding="utf-8") as f:
+            return Response(f.read(), mimetype="text/plain")
+    except FileNotFoundError:
+        return jsonify({"error": "Noch keine Profiling-Aufnahme vorhanden."}), 404
@@ -74,17 +74,22 @@ export const setLightState = (lightId, state) =>
   });
 
 // --- Status & Logs ---
-export async function updateStatus() {
-  const [statusData, logText] = await Promise.all([
-    fetchAPI("/api/data/status"),
-    fetchAPI("/api/data/log"),
-  ]);
-  return { statusData, logText };
+export const loadLog = () => fetchAPI("/api/data/log");
+
+// Live-Ereignisse per Server-Sent Events; der Browser verbindet sich selbstständig
+// neu und setzt über Last-Event-ID fort.
+export function openEventStream({ onSnapshot, onDelta, onLog } = {}) {
+  const source = new EventSource("/api/data/stream");
+  const handle = (handler) => (e) => handler?.(JSON.parse(e.data));
+  source.addEventListener("snapshot", handle(onSnapshot));
+  source.addEventListener("delta", handle(onDelta));
+  source.addEventListener("log", handle(onLog));
+  return source;
 }
 
 // --- Analyse ---
 export const loadChartData = (sensorId, date) =>
-  fetchAPI(`/api/data/history?sensor_id=${sensorId}&date=${date}`);
+  fetchAPI(`/api/data/history?sensor_id=${sensorId}&date=${date}&fill=1`);
 
 // --- System ---
 export const addDefaultScenes = () =>
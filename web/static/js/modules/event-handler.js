@@ -3,6 +3,7 @@ import * as uiShared from "./ui/shared.js";
 import * as uiHome from "./ui/home.js";
 import * as uiModals from "./ui/modals.js";
 import * as uiAutomations from "./ui/automations.js";
+import * as uiStatus from "./ui/status.js";
 import {
   initFsmEditor,
   setFsmAppState,
@@ -85,7 +86,14 @@ const autosave = async () => {
   statusEl.classList.add("bg-gray-900");
 
   try {
-    await api.saveFullConfig(appState.config);
+    // Gesendete Objekte merken: Während der Anfrage kann sich die Liste ändern.
+    const sentAutomations = [...(appState.config.automations || [])];
+    const result = await api.saveFullConfig(appState.config);
+    // Vom Server vergebene IDs übernehmen, damit die nächste Speicherung dieselben sendet.
+    (result?.automation_ids || []).forEach((id, index) => {
+      const automation = sentAutomations[index];
+      if (automation && id && !automation.id) automation.id = id;
+    });
     statusEl.innerHTML = '<i class="fas fa-check mr-2"></i>Gespeichert';
     statusEl.classList.add("bg-green-600");
 
@@ -350,7 +358,9 @@ async function handleGlobalClick(e) {
         );
         return;
       }
-      let newAutomation = { name, enabled: true, type };
+      const id =
+        Date.now().toString(36) + Math.random().toString(36).slice(2, 8);
+      let newAutomation = { id, name, enabled: true, type };
 
       if (type === "routine") {
         const [groupId, groupName] = document
@@ -457,6 +467,39 @@ const stopStatusUpdates = () => {
   appState.statusInterval = null;
 };
 
+const isVisible = (id) =>
+  !document.getElementById(id)?.classList.contains("hidden");
+
+// Bewegung oder Szenenwechsel sofort auf der Startseite zeigen, statt auf das nächste Intervall zu warten.
+const refreshHomeSoon = debounce(() => {
+  if (appState.statusInterval && isVisible("content-zuhause")) updateHomeStatus();
+}, 300);
+
+const startEventStream = () => {
+  appState.eventStream?.close();
+  appState.eventStream = api.openEventStream({
+    onSnapshot: (snapshot) => {
+      uiStatus.applySnapshot(snapshot);
+      if (isVisible("content-status")) uiStatus.renderStatus();
+    },
+    onDelta: (delta) => {
+      uiStatus.applyDelta(delta);
+      if (isVisible("content-status")) uiStatus.renderStatus();
+      if (Object.keys(delta.automations || {}).length) refreshHomeSoon();
+    },
+    onLog: ({ lines }) => uiStatus.appendLog(lines),
+  });
+};
+
+const showStatusTab = async () => {
+  uiStatus.renderStatus();
+  try {
+    uiStatus.setLog(await api.loadLog());
+  } catch (e) {
+    console.error("Fehler beim Laden des Logs:", e);
+  }
+};
+
 function handleTabClick(e) {
   const button = e.currentTarget;
   document.querySelectorAll('nav button[id^="tab-"]').forEach((btn) => {
@@ -476,6 +519,8 @@ function handleTabClick(e) {
     document.getElementById("home-container").classList.remove("hidden");
     document.getElementById("room-detail-container").classList.add("hidden");
     startStatusUpdates(updateHomeStatus);
+  } else if (contentId === "content-status") {
+    showStatusTab();
   }
 }
 
@@ -488,6 +533,14 @@ export function initializeEventHandlers(initialState) {
     button.addEventListener("click", handleTabClick);
   });
 
+  startEventStream();
+  document
+    .getElementById("btn-refresh-status")
+    ?.addEventListener("click", () => {
+      startEventStream();
+      showStatusTab();
+    });
+
   document
     .getElementById("btn-new-automation")
     ?.addEventListener("click", () => {
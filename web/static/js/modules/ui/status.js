@@ -0,0 +1,71 @@
+import { periodNames } from "./shared.js";
+
+const MAX_LOG_LINES = 500;
+
+// Stand wie von der Kernlogik gesendet: Reihenfolge, Status je Automation, Zusatzfelder.
+const state = { order: [], automations: {}, extras: {} };
+
+export function applySnapshot(snapshot) {
+  state.order = snapshot.order || [];
+  state.automations = snapshot.automations || {};
+  state.extras = snapshot.extras || {};
+}
+
+export function applyDelta(delta) {
+  Object.assign(state.automations, delta.automations || {});
+  (delta.removed || []).forEach((id) => delete state.automations[id]);
+  Object.assign(state.extras, delta.extras || {});
+  (delta.removed_extras || []).forEach((key) => delete state.extras[key]);
+  if (delta.order) state.order = delta.order;
+}
+
+const escapeHtml = (text) =>
+  String(text ?? "").replace(
+    /[&<>"']/g,
+    (c) => ({ "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;" })[c]
+  );
+
+export function renderStatus() {
+  const container = document.getElementById("status-container");
+  if (!container) return;
+  const automations = state.order
+    .map((id) => state.automations[id])
+    .filter(Boolean);
+  if (automations.length === 0) {
+    container.innerHTML = `<p class="text-gray-400">Keine aktiven Automationen.</p>`;
+    return;
+  }
+  container.innerHTML = automations
+    .map(
+      (aut) => `
+        <div class="bg-gray-800 rounded-lg shadow-md p-4 flex flex-wrap justify-between gap-2">
+            <h3 class="text-lg font-bold">${escapeHtml(aut.name)}</h3>
+            <div class="text-sm text-gray-300 flex flex-wrap gap-4">
+                ${aut.period ? `<span>${escapeHtml(periodNames[aut.period] || aut.period)}</span>` : ""}
+                ${aut.currentState ? `<span>Zustand: ${escapeHtml(aut.currentState)}</span>` : ""}
+                ${aut.type === "timer" ? `<span>${aut.isActive ? "Timer läuft" : "Timer inaktiv"}</span>` : ""}
+                ${aut.motion_status ? `<span>${escapeHtml(aut.motion_status)}</span>` : ""}
+                ${aut.last_scene ? `<span>Szene: ${escapeHtml(aut.last_scene)}</span>` : ""}
+                ${aut.enabled === false ? `<span class="text-red-400">Deaktiviert</span>` : ""}
+            </div>
+        </div>`
+    )
+    .join("");
+}
+
+export function setLog(text) {
+  const container = document.getElementById("log-container");
+  if (!container) return;
+  container.textContent = text.split("\n").slice(-MAX_LOG_LINES).join("\n");
+  container.scrollTop = container.scrollHeight;
+}
+
+export function appendLog(lines) {
+  const container = document.getElementById("log-container");
+  if (!container || lines.length === 0) return;
+  const atBottom =
+    container.scrollHeight - container.scrollTop - container.clientHeight < 20;
+  const current = container.textContent ? container.textContent.split("\n") : [];
+  container.textContent = current.concat(lines).slice(-MAX_LOG_LINES).join("\n");
+  if (atBottom) container.scrollTop = container.scrollHeight;
+}